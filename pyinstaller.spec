@@ -13,6 +13,7 @@ added_files = [
     (os.path.join(project_root, 'src/slidemob/config_gui.json'), 'slidemob'),
     (os.path.join(project_root, 'src/slidemob/config_languages.json'), 'slidemob'),
     (os.path.join(project_root, 'src/slidemob/utils/reasoning_model_list.json'), 'slidemob/utils'),
+    (os.path.join(project_root, 'src/slidemob/utils/model_pricing.json'), 'slidemob/utils'),
     (os.path.join(project_root, 'src/slidemob/images'), 'slidemob/images'),
     (os.path.join(project_root, 'src/slidemob/gui/assets'), 'slidemob/gui/assets'),
 ]
@@ -39,6 +39,44 @@ def main():
     parser.add_argument(
         "--language", type=str, default="English", help="Target language"
     )
+    parser.add_argument(
+        "--serve", action="store_true", help="Run the local job service"
+    )
+    parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Job service host"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Job service port")
+    parser.add_argument(
+        "--workers", type=int, default=2, help="Job service worker threads"
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PPTX",
+        help="Translate decks offline through the batch API",
+    )
+    parser.add_argument(
+        "--batch-local",
+        type=str,
+        metavar="FOLDER",
+        help="Use a file-based batch endpoint in FOLDER instead of the API",
+    )
+    parser.add_argument(
+        "--output", type=str, help="Output folder of batch translations"
+    )
+    parser.add_argument(
+        "--import-memory",
+        nargs="+",
+        metavar="PPTX",
+        help="Load source and translated deck pairs (or folder pairs) into "
+        "the translation memory",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Estimate requests, tokens, cost and time of translating --input "
+        "without any API call",
+    )
     args = parser.parse_args()
 
     if args.testing:
@@ -61,6 +99,48 @@ def main():
                 print("Translation failed!")
         except Exception as e:
             print(f"Error in pipeline: {e!s}")
+    elif args.batch:
+        from slidemob.pipelines.batch_pipeline import BatchTranslationPipeline
+
+        pipeline = BatchTranslationPipeline(
+            args.batch,
+            target_language=args.language,
+            output_folder=args.output,
+            local_batch_folder=args.batch_local,
+        )
+        if pipeline.run():
+            print("Batch translation completed successfully!")
+        else:
+            print("Batch translation failed!")
+    elif args.import_memory:
+        from slidemob.pipelines.memory_import_pipeline import (
+            MemoryImportPipeline,
+            find_deck_pairs,
+        )
+
+        try:
+            deck_pairs = find_deck_pairs(args.import_memory)
+        except ValueError as e:
+            parser.error(str(e))
+        if not deck_pairs:
+            print("No deck pairs found!")
+        elif MemoryImportPipeline(deck_pairs, args.language).run():
+            print("Translation memory import completed successfully!")
+        else:
+            print("Translation memory import failed!")
+    elif args.dry_run:
+        from slidemob.pipelines.translator_pipeline import PowerPointTranslator
+
+        if not args.input:
+            parser.error("--dry-run requires --input")
+        PowerPointTranslator(
+            pipeline_config=create_config(PathManager(args.input), args.language),
+            dry_run=True,
+        ).translate_presentation()
+    elif args.serve:
+        from slidemob.service import serve
+
+        serve(host=args.host, port=args.port, workers=args.workers)
     else:
         try:
             root = tk.Tk()
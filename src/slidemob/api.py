@@ -0,0 +1,82 @@
+"""Library API that works on PPTX bytes and streams instead of files.
+
+    settings = ModelSettings(
+        gui_config={"translation_method": "OpenAI", "translation_model": "gpt-4o"},
+        api_keys={"OPENAI_API_KEY": "..."},
+    )
+    translated = process_pptx(pptx_bytes, settings, target_language="German")
+
+No temp, extract or output folders are used and, with explicit gui_config
+and api_keys, neither config_gui.json nor .env is read, so many decks can be
+processed concurrently in one process. Recording and the translation memory
+still use their configured paths when they are enabled.
+"""
+from io import BytesIO
+from typing import BinaryIO
+
+from .core_functions.compression import resolve_compression_threads
+from .core_functions.document import PresentationDocument
+from .pipelines.presentation_pipeline import PresentationPipeline
+from .utils.model_settings import ModelSettings
+
+
+class ProcessingError(RuntimeError):
+    """The deck could not be processed or processing was stopped."""
+
+
+def process_pptx(
+    source: bytes | BinaryIO,
+    settings: ModelSettings,
+    target_language: str = "English",
+    output: BinaryIO | None = None,
+    merge_runs: bool = False,
+    spell_check: bool = False,
+    polish: bool = False,
+    translate: bool = True,
+    style_instructions: str = "None",
+    progress_callback=None,
+    stop_check_callback=None,
+) -> bytes | BinaryIO:
+    """Run the enabled stages over a deck held in memory.
+
+    source is the PPTX as bytes or a readable binary file object. The result
+    is written to output if given, which is then returned, otherwise the
+    output PPTX is returned as bytes.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = BytesIO(source)
+    document = PresentationDocument.from_pptx(source)
+
+    pipeline_config = {
+        "root_folder": None,
+        "pptx_folder": None,
+        "pptx_name": None,
+        "extract_folder": None,
+        "output_folder": None,
+        "output_pptx": None,
+        "target_language": target_language,
+    }
+    pipeline = PresentationPipeline(
+        merge_runs=merge_runs,
+        spell_check=spell_check,
+        polish=polish,
+        translate=translate,
+        fresh_extract=True,
+        Further_StyleInstructions=style_instructions,
+        progress_callback=progress_callback,
+        stop_check_callback=stop_check_callback,
+        pipeline_config=pipeline_config,
+        model_settings=settings,
+    )
+    if not pipeline.process_document(document):
+        raise ProcessingError("Processing stopped or a slide failed")
+
+    target = output if output is not None else BytesIO()
+    document.save(
+        target,
+        pipeline.compression_level,
+        resolve_compression_threads(pipeline.compression_threads),
+    )
+    if output is not None:
+        return output
+    return target.getvalue()
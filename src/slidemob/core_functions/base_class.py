@@ -1,11 +1,24 @@
+from functools import lru_cache
 import json
 import os
 import traceback
 import xml.etree.ElementTree as ET
 import zipfile
 
-from ..utils.model_settings import ModelSettings
+from ..utils.model_settings import ModelSettings, get_model_settings
 from ..utils.path_manager import PathManager, get_resource_path
+from .compression import resolve_compression_threads, write_members
+from .estimator import get_latency_history
+from .package_index import get_package_index
+from .segments import TextSegment, extract_segments
+from .utils.cache import get_translation_memory
+
+
+@lru_cache(maxsize=None)
+def load_json_resource(relative_path: str):
+    """Load a packaged JSON resource once per process."""
+    with open(get_resource_path(relative_path)) as f:
+        return json.load(f)
 
 
 class PowerpointPipeline:
@@ -23,12 +36,15 @@ class PowerpointPipeline:
             "mc": "http://schemas.openxmlformats.org/markup-compatibility/2006",
             "v": "urn:schemas-microsoft-com:vml",
         },
+        model_settings: ModelSettings | None = None,
     ):
 
         self.verbose = verbose
         self.extract_namespaces = extract_namespaces
         self.namespaces = namespaces
         self.pipeline_config = pipeline_config
+        # Explicit settings skip loading config_gui.json and .env from disk
+        self.model_settings = model_settings
         self.get_config()
 
     def get_config(self):
@@ -51,12 +67,62 @@ class PowerpointPipeline:
         self.extract_namespaces = self.extract_namespaces
         self.namespaces = self.namespaces
         # Initialize model settings
-        model_settings = ModelSettings()
+        model_settings = self.model_settings or get_model_settings()
+        self.model_settings = model_settings
         # Load GUI config
         self.reduce_slides = model_settings.reduce_slides
         self.update_language = model_settings.update_language
         self.fresh_extract = model_settings.fresh_extract
         self.translation_strategy = model_settings.translation_strategy
+        self.single_call_translation = model_settings.single_call_translation
+        self.polish_concurrency = model_settings.polish_concurrency
+        self.polish_min_length = model_settings.polish_min_length
+        self.streaming_mode = model_settings.streaming_mode
+        self.max_slides_in_flight = model_settings.max_slides_in_flight
+        self.slide_workers = model_settings.slide_workers
+        self.cpu_workers = model_settings.cpu_workers
+        self.compression_level = model_settings.compression_level
+        self.compression_threads = model_settings.compression_threads
+        self.batch_url = model_settings.batch_url
+        self.structured_outputs = model_settings.structured_outputs
+        self.mapping_retries = model_settings.mapping_retries
+        self.reasoning_effort = model_settings.reasoning_effort
+        self.reasoning_max_tokens = model_settings.reasoning_max_tokens
+        self.reasoning_fallback_model = model_settings.reasoning_fallback_model
+        self.reasoning_min_length = model_settings.reasoning_min_length
+        self.coalesce_requests = model_settings.coalesce_requests
+        self.hedge_requests = model_settings.hedge_requests
+        self.hedge_percentile = model_settings.hedge_percentile
+        self.hedge_budget = model_settings.hedge_budget
+        self.hedge_backend = model_settings.hedge_backend
+        self.routing = model_settings.routing
+        self.route_short_method = model_settings.route_short_method
+        self.route_short_model = model_settings.route_short_model
+        self.route_short_api_url = model_settings.route_short_api_url
+        self.route_short_max_length = model_settings.route_short_max_length
+        self.route_short_client = model_settings.route_short_client
+        self.route_concurrency = model_settings.route_concurrency
+        self.exchange_recorder = model_settings.exchange_recorder
+        self.fuzzy_matching = model_settings.fuzzy_matching
+        self.fuzzy_reuse_threshold = model_settings.fuzzy_reuse_threshold
+        self.fuzzy_reference_threshold = model_settings.fuzzy_reference_threshold
+        if model_settings.translation_memory:
+            self.translation_memory = get_translation_memory(
+                model_settings.translation_memory_path
+            )
+        else:
+            self.translation_memory = None
+        if model_settings.latency_history:
+            self.latency_history = get_latency_history(
+                model_settings.latency_history_path
+            )
+        else:
+            self.latency_history = None
+        # Packaged prices per million tokens, extended by the model_pricing setting
+        self.model_pricing = {
+            **load_json_resource("slidemob/utils/model_pricing.json"),
+            **model_settings.model_pricing,
+        }
 
         # Copy relevant attributes from model settings
         self.translation_client = model_settings.translation_client
@@ -70,11 +136,12 @@ class PowerpointPipeline:
         self.translation_headers = model_settings.translation_headers
         self.mapping_headers = model_settings.mapping_headers
         self.style_instructions = model_settings.style_instructions
+        self.glossary = model_settings.glossary
 
         # load reasoning model list from reasoning_model_list.json
-        reasoning_model_list_path = get_resource_path("slidemob/utils/reasoning_model_list.json")
-        with open(reasoning_model_list_path) as f:
-            self.reasoning_model_list = json.load(f)
+        self.reasoning_model_list = load_json_resource(
+            "slidemob/utils/reasoning_model_list.json"
+        )
 
         if self.translation_model in self.reasoning_model_list:
             self.translation_reasoning_model = True
@@ -86,7 +153,8 @@ class PowerpointPipeline:
         else:
             self.mapping_reasoning_model = False
 
-        self.paths = PathManager(input_file=self.pptx_path)  # overall msanaged paths
+        # overall msanaged paths, in-memory decks have none
+        self.paths = PathManager(input_file=self.pptx_path) if self.pptx_path else None
 
         if self.verbose:
             print(f"\tPPTX path: {self.pptx_path}")
@@ -95,16 +163,13 @@ class PowerpointPipeline:
         if self.verbose:
             print(f"\tOutput folder: {self.output_folder}")
 
-    def find_slide_files(self) -> list[str]:
-        """Find all slide XML files in the folder structure."""
-        slide_files = []
-        for root, _, files in os.walk(self.extract_path):
-            for file in files:
-                if file.startswith("slide") and file.endswith(".xml"):
-                    number_part = file[5:-4]
-                    if number_part.isdigit():
-                        slide_files.append(os.path.join(root, file))
-        return sorted(slide_files)
+    def find_slide_files(self, folder_path: str | None = None) -> list[str]:
+        """Return the slide XML files of an extracted deck in presentation order."""
+        folder_path = folder_path or self.extract_path
+        return [
+            os.path.join(folder_path, *part.split("/"))
+            for part in get_package_index(folder_path).slides
+        ]
 
     def extract_paragraphs(self, xml_file: str) -> list[ET.Element]:
         """Extract everything inparagraphs from the XML file."""
@@ -112,47 +177,22 @@ class PowerpointPipeline:
         root = tree.getroot()
         return root.findall(".//a:p", self.namespaces)
 
-    def extract_text_runs(self, xml_file: str) -> tuple[list[ET.Element], set]:
-        """Extract text elements that need translation."""
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        text_elements = []
-        original_text_elements = set()
-
-        # Create a backup with the original text elements
-        for paragraph in root.findall(".//a:p", self.namespaces):
-            for run in paragraph.findall(".//a:r", self.namespaces):
-                run_props = run.find(".//a:rPr", self.namespaces)
-                lang = run_props.get("lang") if run_props is not None else "en-GB"
-
-                for original_text_element in run.findall(".//a:t", self.namespaces):
-                    if (
-                        original_text_element.text
-                        and original_text_element.text.strip()
-                    ):
-                        original_text_elements.add(original_text_element.text.strip())
-
-        # Process paragraphs while preserving structure
-        for paragraph in root.findall(".//a:p", self.namespaces):
-            text_parts = []
-            lang = None
-            for text_element in paragraph.findall(".//a:t", self.namespaces):
-                run_props = text_element.find(".//a:rPr", self.namespaces)
-                if run_props is not None:
-                    lang = run_props.get("lang", "en-GB")
-                if text_element.text and text_element.text.strip():
-                    text_parts.append(text_element.text.strip())
-
-            if text_parts:
-                text_element = ET.Element("a:t")
-                text_element.text = " ".join(text_parts)
-                text_element.set("lang", lang or "en-GB")
-                text_elements.append(text_element)
+    def extract_text_runs(
+        self, xml_file: str | ET.Element
+    ) -> tuple[list[TextSegment], set]:
+        """Extract the paragraphs that need translation and their run texts.
+
+        Accepts a slide XML path or the root of an already parsed slide.
+        """
+        segments = extract_segments(xml_file, self.namespaces)
+        original_text_elements = {
+            text for segment in segments for text in segment.run_texts
+        }
 
         print("Text elements found:")
-        for element in text_elements:
-            print(f"- {element.text.strip()} | lang: {element.get('lang')}")
-        return text_elements, original_text_elements
+        for segment in segments:
+            print(f"- {segment.text} | lang: {segment.lang}")
+        return segments, original_text_elements
 
     def extract_pptx(self) -> str:
         """Extract a PPTX file into its XML components."""
@@ -178,60 +218,43 @@ class PowerpointPipeline:
         return self.extract_path
 
     def get_namespace(self) -> dict:
-        """Get the namespaces from the first slide XML using text processing."""
-        slide_path = os.path.join(self.extract_path, "ppt/slides/slide1.xml")
-
+        """Get the namespaces declared on the first slide of the extracted deck."""
         try:
-            with open(slide_path, encoding="utf-8") as file:
-                content = file.read()
-
-            # Find the root element opening tag
-            start_idx = content.find("<p:sld")
-            end_idx = content.find(">", start_idx)
-            if start_idx == -1 or end_idx == -1:
-                print("Could not find root element")
-                return {}
-
-            # Extract the root element declaration
-            root_declaration = content[start_idx:end_idx]
-
-            # Find all xmlns declarations
-            namespaces = {}
-            import re
-
-            # Pattern to match xmlns:prefix="uri" or xmlns="uri"
-            pattern = r'xmlns(?::([^=]+))?="([^"]+)"'
-            matches = re.finditer(pattern, root_declaration)
-
-            for match in matches:
-                prefix = match.group(1)  # This might be None for default namespace
-                uri = match.group(2)
-                if prefix:
-                    namespaces[prefix] = uri
-                else:
-                    namespaces["default"] = uri
-
-            print("\tExtracted namespaces:", namespaces)
-            return namespaces
-
+            namespaces = dict(get_package_index(self.extract_path).namespaces)
         except Exception as e:
             print(f"\tError extracting namespaces: {e}")
             return {}
+        if not namespaces:
+            print("Could not find root element")
+            return {}
+        print("\tExtracted namespaces:", namespaces)
+        return namespaces
 
     def compose_pptx(self, source_path: str, output_pptx: str):
-        """Compose a PPTX file from a directory containing the XML structure."""
-        self.extract_path
+        """Compose a PPTX file from a directory containing the XML structure.
 
+        Members are deflated by compression_threads threads in parallel and
+        written in directory order.
+        """
         os.makedirs(os.path.dirname(self.output_pptx), exist_ok=True)
         try:
             with zipfile.ZipFile(
                 output_pptx, "w", compression=zipfile.ZIP_DEFLATED
             ) as zf:
-                for root, _, files in os.walk(source_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, source_path)
-                        zf.write(file_path, arcname)
+                members = (
+                    (
+                        os.path.relpath(os.path.join(root, file), source_path),
+                        os.path.join(root, file),
+                    )
+                    for root, _, files in os.walk(source_path)
+                    for file in files
+                )
+                write_members(
+                    zf,
+                    members,
+                    self.compression_level,
+                    resolve_compression_threads(self.compression_threads),
+                )
         except Exception as e:
             print(f"Error composing PPTX: {e}")
             print("Full traceback:")
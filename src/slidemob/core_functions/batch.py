@@ -0,0 +1,388 @@
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+from openai import AzureOpenAI
+
+from ..utils.promts import mapping_prompt_openai, translate_and_align_prompt
+from .translator import REDUCED_SLIDES, SlideTranslator
+
+# Batch states after which polling stops
+FINAL_BATCH_STATES = ("completed", "failed", "expired", "cancelled")
+
+# Chat completion paths of the batch APIs, Azure deployments have no /v1 prefix
+OPENAI_BATCH_URL = "/v1/chat/completions"
+AZURE_BATCH_URL = "/chat/completions"
+
+
+def parse_batch_output(lines) -> dict[str, str | None]:
+    """Return the message content per custom_id of a batch output file."""
+    results = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        content = None
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                content = None
+        results[record["custom_id"]] = content
+    return results
+
+
+class OpenAIBatchEndpoint:
+    """Submit request files to the batch API of an OpenAI-compatible client.
+
+    url is the chat completion path of the batch requests. By default it is
+    derived from the client, Azure OpenAI clients use AZURE_BATCH_URL.
+    """
+
+    def __init__(
+        self, client, completion_window: str = "24h", url: str | None = None
+    ):
+        if client is None:
+            raise ValueError(
+                "Batch translation needs an OpenAI or Azure OpenAI translation client"
+            )
+        if not (hasattr(client, "files") and hasattr(client, "batches")):
+            # An endpoint pool spreads single requests and has no batch API
+            raise ValueError(
+                "Batch translation needs a client with a files and batches API, "
+                "a pool of translation_endpoints is not supported"
+            )
+        self.client = client
+        self.completion_window = completion_window
+        if not url:
+            # Recording clients forward to the client they wrap
+            wrapped = getattr(client, "client", client)
+            if isinstance(wrapped, AzureOpenAI):
+                url = AZURE_BATCH_URL
+            else:
+                url = OPENAI_BATCH_URL
+        self.url = url
+
+    def submit(self, requests_file: str) -> str:
+        with open(requests_file, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=self.url,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> dict[str, str | None]:
+        batch = self.client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return {}
+        content = self.client.files.content(batch.output_file_id).text
+        return parse_batch_output(content.splitlines())
+
+
+class LocalBatchEndpoint:
+    """File-based stand-in for a batch API, for offline runs and tests.
+
+    Submitted request files are copied to <folder>/<batch_id>/input.jsonl. The
+    batch is completed as soon as <folder>/<batch_id>/output.jsonl exists in
+    the format of the OpenAI batch API. If a responder is given, it is called
+    with the body of every request and returns the message content, and the
+    output file is written right away.
+    """
+
+    def __init__(self, folder: str, responder=None, url: str = OPENAI_BATCH_URL):
+        self.folder = folder
+        self.responder = responder
+        self.url = url
+
+    def submit(self, requests_file: str) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        batch_folder = os.path.join(self.folder, batch_id)
+        os.makedirs(batch_folder, exist_ok=True)
+        input_file = os.path.join(batch_folder, "input.jsonl")
+        shutil.copyfile(requests_file, input_file)
+
+        if self.responder:
+            with open(input_file, encoding="utf-8") as f_in, open(
+                os.path.join(batch_folder, "output.jsonl"), "w", encoding="utf-8"
+            ) as f_out:
+                for line in f_in:
+                    request = json.loads(line)
+                    content = self.responder(request["body"])
+                    record = {
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {"choices": [{"message": {"content": content}}]},
+                        },
+                    }
+                    f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            print(f"Waiting for {os.path.join(batch_folder, 'output.jsonl')}")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        if os.path.exists(os.path.join(self.folder, batch_id, "output.jsonl")):
+            return "completed"
+        return "in_progress"
+
+    def results(self, batch_id: str) -> dict[str, str | None]:
+        with open(
+            os.path.join(self.folder, batch_id, "output.jsonl"), encoding="utf-8"
+        ) as f:
+            return parse_batch_output(f)
+
+
+class BatchTranslator:
+    """Translate whole decks with two rounds of batch requests.
+
+    The first round sends one combined translate-and-align request per unique
+    paragraph of all decks. Paragraphs whose segment mapping failed validation
+    get a mapping request in a second round. The results are then written
+    back to the parsed slides.
+    """
+
+    def __init__(
+        self,
+        translator: SlideTranslator,
+        endpoint,
+        work_folder: str,
+        poll_interval: float = 30,
+    ):
+        self.translator = translator
+        self.endpoint = endpoint
+        self.work_folder = work_folder
+        self.poll_interval = poll_interval
+        self.verbose = translator.verbose
+
+    def translate_documents(self, documents: list, stop_check_callback=None) -> bool:
+        """Translate the slides of all documents in place."""
+        translator = self.translator
+        slides = []
+        paragraphs = {}
+
+        # Collect every paragraph that needs a model call
+        for document in documents:
+            for slide_name in document.slide_names():
+                if translator.reduce_slides:
+                    if os.path.basename(slide_name) not in REDUCED_SLIDES:
+                        continue
+                root = document.get_root(slide_name)
+                segments, original_text_elements = translator.extract_text_runs(root)
+                translation_map = {text: "" for text in original_text_elements}
+                slide_paragraphs = []
+                for segment in segments:
+                    if not segment.run_texts:
+                        continue
+                    if translator.pre_filter.classify(segment.text):
+                        # Keep every run of the paragraph as is
+                        segment.translations = {}
+                        continue
+                    candidates = set(segment.run_texts)
+                    key = (segment.text, tuple(sorted(candidates)))
+                    paragraphs.setdefault(
+                        key, {"text": segment.text, "candidates": candidates}
+                    )
+                    slide_paragraphs.append((segment, key))
+                slides.append((segments, translation_map, slide_paragraphs))
+
+        # Reuse the translation memory before sending anything
+        pending = {}
+        for index, (key, paragraph) in enumerate(paragraphs.items()):
+            segments = self._from_memory(paragraph)
+            if segments is not None:
+                paragraph["segments"] = segments
+            else:
+                pending[f"p{index}"] = paragraph
+
+        print(
+            f"Batch translation: {len(paragraphs)} unique paragraphs, "
+            f"{len(paragraphs) - len(pending)} from translation memory"
+        )
+
+        if pending:
+            results = self._run_batch(
+                "translate",
+                {
+                    custom_id: self._translation_request(paragraph)
+                    for custom_id, paragraph in pending.items()
+                },
+                stop_check_callback,
+            )
+            if results is None:
+                return False
+
+            needs_mapping = {}
+            for custom_id, paragraph in pending.items():
+                translation, segments = self._parse_translation(
+                    results.get(custom_id), paragraph["candidates"]
+                )
+                paragraph["translation"] = translation
+                if segments is not None:
+                    paragraph["segments"] = segments
+                elif translation:
+                    needs_mapping[custom_id] = paragraph
+
+            if needs_mapping:
+                results = self._run_batch(
+                    "mapping",
+                    {
+                        custom_id: self._mapping_request(paragraph)
+                        for custom_id, paragraph in needs_mapping.items()
+                    },
+                    stop_check_callback,
+                )
+                if results is None:
+                    return False
+                for custom_id, paragraph in needs_mapping.items():
+                    mapping = translator._parse_json_response(
+                        results.get(custom_id) or ""
+                    )
+                    if isinstance(mapping, dict):
+                        # Segments without a string mapping keep their text
+                        paragraph["segments"] = {
+                            segment: (
+                                mapping[segment]
+                                if isinstance(mapping.get(segment), str)
+                                else segment
+                            )
+                            for segment in paragraph["candidates"]
+                        }
+
+            for paragraph in pending.values():
+                self._to_memory(paragraph)
+            translator.flush_translation_memory()
+
+        # Write the results back, failed paragraphs keep their original text
+        for segments, translation_map, slide_paragraphs in slides:
+            for segment, key in slide_paragraphs:
+                translations = paragraphs[key].get("segments") or {}
+                segment.translations = {
+                    text: translations.get(text, text) for text in segment.run_texts
+                }
+                translation_map.update(segment.translations)
+            if not translator.apply_translation_map(
+                segments, translation_map, stop_check_callback
+            ):
+                return False
+        return True
+
+    def _translation_request(self, paragraph: dict) -> dict:
+        translator = self.translator
+        prompt = translate_and_align_prompt(
+            paragraph["candidates"],
+            paragraph["text"],
+            translator.target_language,
+            translator.style_instructions,
+        )
+        # Same body as the online request, reasoning models get their budget
+        return translator._translation_request_body(
+            translator.translation_model,
+            translator.translation_method,
+            prompt,
+            0.3,
+            {"type": "json_object"},
+        )
+
+    def _mapping_request(self, paragraph: dict) -> dict:
+        translator = self.translator
+        prompt = mapping_prompt_openai(
+            paragraph["candidates"], paragraph["text"], paragraph["translation"]
+        )
+        return translator._mapping_request_body(
+            translator.mapping_model,
+            translator.mapping_method,
+            prompt,
+            0.3,
+            {"type": "json_object"},
+        )
+
+    def _parse_translation(self, content: str | None, candidates: set):
+        """Return the translation and the validated segments of a response."""
+        if not content:
+            return None, None
+        translator = self.translator
+        content = re.sub(r"<think>.*?</think>", "", content, flags=re.DOTALL)
+        result = translator._parse_json_response(content)
+        if not isinstance(result, dict):
+            return None, None
+        translation = result.get("translation")
+        if not isinstance(translation, str) or not translation.strip():
+            return None, None
+        segments = result.get("segments")
+        if not translator._is_valid_segment_mapping(segments, candidates):
+            return translation.strip(), None
+        return translation.strip(), {
+            segment: segments[segment] for segment in candidates
+        }
+
+    def _run_batch(
+        self, name: str, requests: dict, stop_check_callback=None
+    ) -> dict | None:
+        """Write, submit and poll one batch. Returns None if stopped or failed."""
+        os.makedirs(self.work_folder, exist_ok=True)
+        requests_file = os.path.join(self.work_folder, f"{name}_requests.jsonl")
+        with open(requests_file, "w", encoding="utf-8") as f:
+            for custom_id, body in requests.items():
+                line = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": self.endpoint.url,
+                    "body": body,
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+        batch_id = self.endpoint.submit(requests_file)
+        print(f"Submitted {len(requests)} {name} requests as batch {batch_id}")
+
+        while True:
+            status = self.endpoint.status(batch_id)
+            if status in FINAL_BATCH_STATES:
+                break
+            if stop_check_callback and stop_check_callback():
+                print("\nProcessing stopped by user")
+                return None
+            if self.verbose:
+                print(f"\tBatch {batch_id}: {status}")
+            time.sleep(self.poll_interval)
+
+        if status != "completed":
+            print(f"Batch {batch_id} ended with status {status}")
+            return None
+        results = self.endpoint.results(batch_id)
+        failed = sum(1 for custom_id in requests if not results.get(custom_id))
+        print(f"Batch {batch_id} completed, {failed} of {len(requests)} requests failed")
+        return results
+
+    def _from_memory(self, paragraph: dict) -> dict | None:
+        translator = self.translator
+        if translator.translation_memory is None:
+            return None
+        translator.original_text = paragraph["text"]
+        entry = translator.translation_memory.get_entry(
+            translator._memory_key(paragraph["candidates"])
+        )
+        if entry and isinstance(entry.get("segments"), dict):
+            return entry["segments"]
+        return None
+
+    def _to_memory(self, paragraph: dict):
+        translator = self.translator
+        if translator.translation_memory is None or paragraph.get("segments") is None:
+            return
+        translator.original_text = paragraph["text"]
+        translator.translation_memory.set(
+            translator._memory_key(paragraph["candidates"]),
+            paragraph["translation"],
+            paragraph["segments"],
+            source=paragraph["text"],
+            context=translator._memory_context(),
+        )
@@ -0,0 +1,72 @@
+from concurrent.futures import Future
+import hashlib
+import json
+import threading
+
+
+def request_fingerprint(*parts) -> str:
+    """Fingerprint the parts that make two model requests identical."""
+    return hashlib.sha256(
+        json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller of a key runs the call, callers arriving while it is
+    running wait for it and get its result (or its exception). Once the call
+    has finished the key is released, so later calls run again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight: dict[str, Future] = {}
+        self.calls = 0
+        self.hits = 0
+
+    def do(self, key: str, call) -> tuple[object, bool]:
+        """Return the result of call() and whether it came from another caller."""
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is None:
+                future = self.in_flight[key] = Future()
+                self.calls += 1
+                shared = False
+            else:
+                self.hits += 1
+                shared = True
+        if shared:
+            return future.result(), True
+
+        try:
+            result = call()
+        except BaseException as e:
+            self._release(key)
+            future.set_exception(e)
+            raise
+        self._release(key)
+        future.set_result(result)
+        return result, False
+
+    def _release(self, key: str):
+        with self.lock:
+            self.in_flight.pop(key, None)
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {"calls": self.calls, "hits": self.hits}
+
+
+_flights: dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide single flight of a call type, shared by all decks."""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight()
+        return _flights[name]
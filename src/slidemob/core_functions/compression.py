@@ -0,0 +1,96 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
+import zipfile
+import zlib
+
+
+def resolve_compression_threads(threads: int) -> int:
+    """Return the number of compression threads, 0 or less means one per core."""
+    if threads <= 0:
+        return os.cpu_count() or 1
+    return threads
+
+
+def deflate(data: bytes, level: int) -> tuple[bytes, int]:
+    """Return the raw deflate stream of data, as stored in a zip, and its CRC."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), zlib.crc32(data)
+
+
+def write_precompressed(
+    zf: zipfile.ZipFile, name: str, size: int, compressed: bytes, crc: int
+):
+    """Append an already deflated member to a zip opened for writing.
+
+    Mirrors what ZipFile.writestr does, except that the compressor is skipped.
+    Only used when parallel compression is enabled explicitly, other writes go
+    through ZipFile.writestr.
+    """
+    zinfo = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.external_attr = 0o600 << 16
+    zinfo.file_size = size
+    zinfo.compress_size = len(compressed)
+    zinfo.CRC = crc
+
+    if not zf.fp:
+        raise ValueError("Attempt to write to ZIP archive that was already closed")
+    if zf._writing:
+        raise ValueError(
+            "Can't write to ZIP archive while an open writing handle exists."
+        )
+    # Same lock as ZipFile.open, the shared file position must not move
+    # between the header offset and the end of the member
+    with zf._lock:
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader())
+        zf.fp.write(compressed)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_members(zf: zipfile.ZipFile, members, level: int = 6, threads: int = 1):
+    """Deflate members concurrently and write them to zf in the given order.
+
+    members yields (name, source) pairs where source is the member bytes or
+    the path of a file to read. zlib releases the GIL, so threads compress in
+    parallel; at most two members per thread are held ahead of the writer.
+    """
+
+    def read(source) -> bytes:
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                return f.read()
+        return source
+
+    def compress(source) -> tuple[int, bytes, int]:
+        data = read(source)
+        return (len(data), *deflate(data, level))
+
+    if threads <= 1:
+        for name, source in members:
+            zf.writestr(
+                name,
+                read(source),
+                compress_type=zipfile.ZIP_DEFLATED,
+                compresslevel=level,
+            )
+        return
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for name, source in members:
+            pending.append((name, executor.submit(compress, source)))
+            if len(pending) >= threads * 2:
+                name, future = pending.popleft()
+                write_precompressed(zf, name, *future.result())
+        while pending:
+            name, future = pending.popleft()
+            write_precompressed(zf, name, *future.result())
@@ -0,0 +1,280 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import shutil
+import sys
+import threading
+from typing import BinaryIO
+import zipfile
+
+from lxml import etree as ET
+
+from .compression import write_members
+from .package_index import PackageIndex, get_package_index
+
+
+def serialize_tree(tree: ET._ElementTree) -> bytes:
+    """Serialize a slide tree with its XML declaration."""
+    return ET.tostring(
+        tree,
+        encoding="UTF-8",
+        xml_declaration=True,
+        standalone=tree.docinfo.standalone,
+    )
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of the process in MB."""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class PresentationDocument:
+    """A PPTX package held in memory.
+
+    Zip members are kept as bytes, slide XML is parsed once on first access and
+    the parsed trees are shared by all processing stages. Changed trees are
+    serialized and the package is composed exactly once in save().
+    """
+
+    def __init__(self, members: dict[str, bytes], member_order: list[str] | None = None):
+        self.members = members
+        self.member_order = member_order or list(members)
+        self.trees: dict[str, ET._ElementTree] = {}
+        self.index: PackageIndex | None = None
+
+    @classmethod
+    def from_pptx(cls, pptx_path: str | BinaryIO) -> "PresentationDocument":
+        """Read all members of a PPTX file or binary file object into memory."""
+        with zipfile.ZipFile(pptx_path, "r") as pptx:
+            member_order = [
+                info.filename for info in pptx.infolist() if not info.is_dir()
+            ]
+            members = {name: pptx.read(name) for name in member_order}
+        return cls(members, member_order)
+
+    @classmethod
+    def from_folder(cls, folder_path: str) -> "PresentationDocument":
+        """Read an already extracted PPTX folder into memory."""
+        members = {}
+        for root, _, files in os.walk(folder_path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                arcname = os.path.relpath(file_path, folder_path).replace(os.sep, "/")
+                with open(file_path, "rb") as f:
+                    members[arcname] = f.read()
+        # [Content_Types].xml is expected as the first member of the package
+        member_order = sorted(members, key=lambda name: name != "[Content_Types].xml")
+        return cls(members, member_order)
+
+    def slide_names(self) -> list[str]:
+        """Return the slide part names in presentation order."""
+        if self.index is None:
+            self.index = PackageIndex.from_members(self.members)
+        return self.index.slides
+
+    def get_tree(self, name: str) -> ET._ElementTree:
+        """Return the parsed XML tree of a member, parsing it only once."""
+        if name not in self.trees:
+            self.trees[name] = ET.ElementTree(ET.fromstring(self.members[name]))
+        return self.trees[name]
+
+    def get_root(self, name: str) -> ET._Element:
+        return self.get_tree(name).getroot()
+
+    def set_member(self, name: str, content: bytes):
+        """Replace the bytes of a member and drop its parsed tree."""
+        self.members[name] = content
+        self.trees.pop(name, None)
+
+    def serialize(self):
+        """Write all parsed trees back to member bytes."""
+        for name, tree in self.trees.items():
+            self.members[name] = serialize_tree(tree)
+
+    def save(
+        self,
+        output_pptx: str | BinaryIO,
+        compression_level: int = 6,
+        compression_threads: int = 1,
+    ) -> bool:
+        """Serialize the parsed trees and compose the output PPTX once.
+
+        output_pptx is a path or a writable binary file object. Members are
+        deflated by compression_threads threads in parallel.
+        """
+        self.serialize()
+        if isinstance(output_pptx, str):
+            output_dir = os.path.dirname(output_pptx)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+        with zipfile.ZipFile(output_pptx, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            write_members(
+                zf,
+                ((name, self.members[name]) for name in self.member_order),
+                compression_level,
+                compression_threads,
+            )
+        return True
+
+
+class StreamingPresentation:
+    """Process a PPTX slide by slide with bounded memory.
+
+    Parsing, transforming and writing overlap in three stages connected by
+    queues: a reader thread parses the next slides, up to workers slides are
+    transformed at once (their model requests run concurrently) and a writer
+    thread serializes finished slides and adds them to the output zip in slide
+    order. At most max_slides_in_flight parsed slides exist at any time, a
+    slide's slot is only freed once it has been written.
+    """
+
+    def __init__(
+        self,
+        pptx_path: str,
+        max_slides_in_flight: int = 1,
+        workers: int = 1,
+        compression_level: int = 6,
+    ):
+        self.pptx_path = pptx_path
+        self.compression_level = compression_level
+        self.max_slides_in_flight = max(1, max_slides_in_flight)
+        # More concurrent transforms than slots would wait for slides forever
+        self.workers = max(1, min(workers, self.max_slides_in_flight))
+
+    def slide_names(self) -> list[str]:
+        return get_package_index(self.pptx_path).slides
+
+    def process(self, output_pptx: str, transform) -> bool:
+        """Stream all slides through transform(name, root) into output_pptx.
+
+        The transform returns False to abort; the partial output is removed.
+        With more than one worker it is called from several threads at once.
+        """
+        output_dir = os.path.dirname(output_pptx)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        success = False
+        try:
+            with zipfile.ZipFile(self.pptx_path, "r") as source, zipfile.ZipFile(
+                output_pptx,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=self.compression_level,
+            ) as target:
+                slide_names = self.slide_names()
+                slide_set = set(slide_names)
+
+                # Copy all other parts member by member without holding them
+                for info in source.infolist():
+                    if info.is_dir() or info.filename in slide_set:
+                        continue
+                    with source.open(info) as src, target.open(
+                        info.filename, "w"
+                    ) as dst:
+                        shutil.copyfileobj(src, dst)
+
+                if not self._run_stages(source, target, slide_names, transform):
+                    return False
+            success = True
+            return True
+        finally:
+            if not success and os.path.exists(output_pptx):
+                os.remove(output_pptx)
+
+    def _run_stages(self, source, target, slide_names: list[str], transform) -> bool:
+        slots = threading.Semaphore(self.max_slides_in_flight)
+        stop = threading.Event()
+        parsed = queue.Queue()
+        finished = queue.Queue()
+        done = object()
+        errors = []
+
+        def read_slides():
+            try:
+                for name in slide_names:
+                    # Backpressure: wait until a written slide frees its slot
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    parsed.put((name, ET.ElementTree(ET.fromstring(source.read(name)))))
+            except Exception as e:
+                parsed.put(e)
+            finally:
+                parsed.put(done)
+
+        def write_slides():
+            while True:
+                item = finished.get()
+                if item is done:
+                    return
+                name, tree = item
+                try:
+                    if not errors:
+                        target.writestr(name, serialize_tree(tree))
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+                finally:
+                    del tree, item
+                    slots.release()
+
+        reader = threading.Thread(target=read_slides, daemon=True)
+        writer = threading.Thread(target=write_slides, daemon=True)
+        reader.start()
+        writer.start()
+
+        pending = deque()
+
+        def finish_oldest() -> bool:
+            name, tree, future = pending.popleft()
+            if future.result() is False:
+                return False
+            finished.put((name, tree))
+            return True
+
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                try:
+                    while not stop.is_set():
+                        item = parsed.get()
+                        if item is done:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+                        name, tree = item
+                        pending.append(
+                            (name, tree, executor.submit(transform, name, tree.getroot()))
+                        )
+                        del item, tree
+                        while len(pending) >= self.workers:
+                            if not finish_oldest():
+                                return False
+                    while pending and not stop.is_set():
+                        if not finish_oldest():
+                            return False
+                    completed = not stop.is_set()
+                finally:
+                    # Slides queued behind an aborted one are never sent
+                    for _, _, future in pending:
+                        future.cancel()
+        finally:
+            stop.set()
+            finished.put(done)
+            writer.join()
+            reader.join()
+        if errors:
+            raise errors[0]
+        return completed
@@ -0,0 +1,216 @@
+from collections import Counter, defaultdict
+from functools import lru_cache
+import json
+import os
+import statistics
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # Optional, tokens are then estimated at 4 characters each
+    tiktoken = None
+
+# Backends that are not billed per token
+FREE_METHODS = ("Google", "LMStudio")
+
+# Without latency history a request takes a fixed overhead plus its completion
+DEFAULT_REQUEST_SECONDS = 0.5
+DEFAULT_TOKENS_PER_SECOND = 50
+MIN_LATENCY_SAMPLES = 5
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """Count the tokens of a text with tiktoken, or estimate them from its length."""
+    if not text:
+        return 0
+    if tiktoken is None:
+        return max(1, len(text) // 4)
+    return len(_encoding(model).encode(text))
+
+
+def count_message_tokens(messages: list[dict], model: str = "") -> int:
+    """Prompt tokens of a chat request, including the per message overhead."""
+    return 3 + sum(4 + count_tokens(message["content"], model) for message in messages)
+
+
+class LatencyHistory:
+    """Recent request latencies per stage and model, kept across runs."""
+
+    def __init__(self, history_file: str, window: int = 200):
+        self.history_file = history_file
+        self.window = window
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.samples = self._load()
+
+    def _load(self) -> dict:
+        if os.path.exists(self.history_file):
+            try:
+                with open(self.history_file) as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def record(self, stage: str, model: str, seconds: float):
+        with self.lock:
+            samples = self.samples.setdefault(f"{stage}:{model}", [])
+            samples.append(round(seconds, 3))
+            del samples[: -self.window]
+            self.dirty = True
+
+    def median(self, stage: str, model: str) -> float | None:
+        """Median latency in seconds, None until enough requests were seen."""
+        with self.lock:
+            samples = list(self.samples.get(f"{stage}:{model}", []))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return statistics.median(samples)
+
+    def flush(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            history_dir = os.path.dirname(self.history_file)
+            if history_dir:
+                os.makedirs(history_dir, exist_ok=True)
+            temp_file = f"{self.history_file}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump(self.samples, f)
+            os.replace(temp_file, self.history_file)
+            self.dirty = False
+
+
+_histories: dict[str, LatencyHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_latency_history(history_file: str) -> LatencyHistory:
+    """Return the process-wide latency history stored in a file."""
+    with _histories_lock:
+        if history_file not in _histories:
+            _histories[history_file] = LatencyHistory(history_file)
+        return _histories[history_file]
+
+
+class RunEstimate:
+    """Requests, tokens, cost and wall time of a run, counted without any API call.
+
+    Prompt tokens are counted on the prompts the run would send, completion
+    tokens are projected from the expected responses. Latencies come from the
+    history of earlier runs, requests are spread over the given concurrency.
+    Prices are in USD per million tokens.
+    """
+
+    def __init__(
+        self,
+        pricing: dict,
+        latency_history: LatencyHistory | None = None,
+        concurrency: int = 1,
+    ):
+        self.pricing = pricing
+        self.latency_history = latency_history
+        self.concurrency = max(1, concurrency)
+        self.lock = threading.Lock()
+        self.requests = defaultdict(Counter)
+        self.seconds = Counter()
+        self.paragraphs = Counter()
+
+    def add_request(
+        self,
+        stage: str,
+        method: str,
+        model: str,
+        messages: list[dict],
+        completion: str,
+    ):
+        """Count a request from its messages and its projected response text."""
+        if method == "Google":
+            prompt_tokens = completion_tokens = 0
+        else:
+            prompt_tokens = count_message_tokens(messages, model)
+            completion_tokens = count_tokens(completion, model)
+        seconds = None
+        if self.latency_history is not None:
+            seconds = self.latency_history.median(stage, model)
+        if seconds is None:
+            seconds = (
+                DEFAULT_REQUEST_SECONDS + completion_tokens / DEFAULT_TOKENS_PER_SECOND
+            )
+        with self.lock:
+            counter = self.requests[(stage, method, model)]
+            counter["requests"] += 1
+            counter["prompt_tokens"] += prompt_tokens
+            counter["completion_tokens"] += completion_tokens
+            self.seconds[(stage, method, model)] += seconds
+
+    def count_paragraph(self, outcome: str):
+        """Count a paragraph by how it is handled, e.g. sent, pre_filter or memory."""
+        with self.lock:
+            self.paragraphs[outcome] += 1
+
+    def cost(self, method: str, model: str, counter: Counter) -> float | None:
+        """Cost in USD of the requests to a model, None if it has no price."""
+        if method in FREE_METHODS:
+            return 0.0
+        price = self.pricing.get(model)
+        if price is None:
+            return None
+        return (
+            counter["prompt_tokens"] * price["input"]
+            + counter["completion_tokens"] * price["output"]
+        ) / 1_000_000
+
+    def summary(self) -> dict:
+        with self.lock:
+            requests = {key: Counter(counter) for key, counter in self.requests.items()}
+            seconds = sum(self.seconds.values())
+            paragraphs = dict(self.paragraphs)
+        totals = sum(requests.values(), Counter())
+        cost = 0.0
+        unpriced_models = set()
+        for (_, method, model), counter in requests.items():
+            model_cost = self.cost(method, model, counter)
+            if model_cost is None:
+                unpriced_models.add(model)
+            else:
+                cost += model_cost
+        return {
+            "paragraphs": paragraphs,
+            "requests": totals["requests"],
+            "prompt_tokens": totals["prompt_tokens"],
+            "completion_tokens": totals["completion_tokens"],
+            "cost": cost,
+            "unpriced_models": sorted(unpriced_models),
+            "wall_seconds": seconds / self.concurrency,
+            "stages": {key: dict(counter) for key, counter in requests.items()},
+        }
+
+    def report(self):
+        summary = self.summary()
+        print(f"Dry run, no API call was made. Paragraphs: {summary['paragraphs']}")
+        for (stage, method, model), counter in summary["stages"].items():
+            print(
+                f"Estimated {stage} ({method}:{model}): {counter['requests']} requests, "
+                f"{counter['prompt_tokens']} prompt tokens, "
+                f"{counter['completion_tokens']} completion tokens"
+            )
+        line = (
+            f"Estimated total: {summary['requests']} requests, "
+            f"{summary['prompt_tokens'] + summary['completion_tokens']} tokens, "
+            f"${summary['cost']:.4f}, "
+            f"{summary['wall_seconds'] / 60:.1f} minutes at concurrency {self.concurrency}"
+        )
+        if summary["unpriced_models"]:
+            line += f" (no price for {', '.join(summary['unpriced_models'])})"
+        print(line)
+        if tiktoken is None:
+            print("Note: tiktoken is not installed, tokens are estimated from text length")
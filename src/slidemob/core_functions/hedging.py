@@ -0,0 +1,120 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import math
+import threading
+import time
+
+# Threads for hedged calls; a losing request keeps its thread until it returns
+HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="slidemob-hedge")
+
+
+class LatencyTracker:
+    """Rolling window of observed request latencies in seconds."""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the latency percentile or None until enough samples exist."""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+
+class HedgedCaller:
+    """Send a duplicate request when the first one is slower than usual.
+
+    If a call has not returned after the configured latency percentile, the
+    same request is sent again (optionally to a secondary backend) and the
+    first usable response wins. At most max_hedge_ratio of all calls are hedged.
+    """
+
+    def __init__(self, percentile: float = 95, max_hedge_ratio: float = 0.1):
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.tracker = LatencyTracker()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedges_won = 0
+
+    def call(self, primary, secondary=None):
+        """Run primary() and hedge with secondary() (or primary) if it is slow.
+
+        A call that returns None or raises counts as failed; the other request
+        is then awaited instead.
+        """
+        with self.lock:
+            self.calls += 1
+        delay = self.tracker.percentile(self.percentile)
+        start = time.perf_counter()
+
+        if delay is None:
+            result = primary()
+            self.tracker.record(time.perf_counter() - start)
+            return result
+
+        first = HEDGE_EXECUTOR.submit(primary)
+        done, _ = wait([first], timeout=delay)
+        if done or not self._take_budget():
+            result = first.result()
+            self.tracker.record(time.perf_counter() - start)
+            return result
+
+        hedge = HEDGE_EXECUTOR.submit(secondary or primary)
+        pending = {first, hedge}
+        result = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"\tHedged request failed: {e}")
+                    result = None
+                if result is not None:
+                    if future is hedge:
+                        with self.lock:
+                            self.hedges_won += 1
+                    self.tracker.record(time.perf_counter() - start)
+                    return result
+        return result
+
+    def _take_budget(self) -> bool:
+        with self.lock:
+            if self.hedges + 1 > self.max_hedge_ratio * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedges,
+                "hedges_won": self.hedges_won,
+            }
+
+
+_hedgers: dict[tuple, HedgedCaller] = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger(
+    name: str, percentile: float = 95, max_hedge_ratio: float = 0.1
+) -> HedgedCaller:
+    """Return the process-wide hedger of a call type so latencies accumulate."""
+    key = (name, percentile, max_hedge_ratio)
+    with _hedgers_lock:
+        if key not in _hedgers:
+            _hedgers[key] = HedgedCaller(percentile, max_hedge_ratio)
+        return _hedgers[key]
@@ -0,0 +1,68 @@
+from lxml import etree as ET
+
+from .document import PresentationDocument
+from .segments import TextSegment, extract_segments
+
+# Shapes whose text is aligned, group shapes only contain other shapes
+TEXT_SHAPES = ("sp", "graphicFrame", "cxnSp")
+
+
+def shape_paragraphs(root: ET._Element, namespaces: dict) -> dict:
+    """Map the shape ids of a slide to their paragraphs by paragraph index."""
+    shape_tags = {f"{{{namespaces['p']}}}{tag}" for tag in TEXT_SHAPES}
+    shapes = {}
+    for properties in root.iterfind(".//p:cNvPr", namespaces):
+        shape = properties.getparent().getparent()
+        if shape is None or shape.tag not in shape_tags:
+            continue
+        segments = extract_segments(shape, namespaces)
+        if segments:
+            shapes[properties.get("id")] = {
+                segment.paragraph_id: segment for segment in segments
+            }
+    return shapes
+
+
+def align_documents(
+    source: PresentationDocument, translated: PresentationDocument, namespaces: dict
+) -> list[tuple[TextSegment, TextSegment]]:
+    """Pair the paragraphs of a deck with those of its translation.
+
+    Paragraphs are aligned by slide part, shape id and paragraph index within
+    the shape. Paragraphs without runs or left untranslated are skipped.
+    """
+    translated_slides = set(translated.slide_names())
+    pairs = []
+    for slide_name in source.slide_names():
+        if slide_name not in translated_slides:
+            continue
+        translated_shapes = shape_paragraphs(translated.get_root(slide_name), namespaces)
+        for shape_id, paragraphs in shape_paragraphs(
+            source.get_root(slide_name), namespaces
+        ).items():
+            translated_paragraphs = translated_shapes.get(shape_id, {})
+            for paragraph_id, segment in paragraphs.items():
+                translation = translated_paragraphs.get(paragraph_id)
+                if (
+                    translation is None
+                    or not segment.run_texts
+                    or not translation.run_texts
+                    or translation.text == segment.text
+                ):
+                    continue
+                pairs.append((segment, translation))
+    return pairs
+
+
+def run_mapping(source: TextSegment, translation: TextSegment) -> dict:
+    """Map the runs of a paragraph to the runs of its translation.
+
+    Runs are paired in order if both paragraphs have the same number of runs,
+    otherwise the first run takes the whole translation, as the mapping model
+    does when runs cannot be matched.
+    """
+    if len(source.run_texts) == len(translation.run_texts):
+        return dict(zip(source.run_texts, translation.run_texts))
+    mapping = {text: "" for text in source.run_texts}
+    mapping[source.run_texts[0]] = translation.text
+    return mapping
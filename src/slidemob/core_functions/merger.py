@@ -5,6 +5,18 @@ from lxml import etree as ET
 
 from .base_class import PowerpointPipeline
 
+# Run properties that do not change how a run is rendered
+IGNORED_RUN_ATTRIBUTES = ("lang", "dirty", "err", "noProof")
+
+
+def rendered_run_attributes(run_props) -> dict:
+    """Return the attributes of an a:rPr element that affect rendering."""
+    return {
+        key: value
+        for key, value in run_props.attrib.items()
+        if key not in IGNORED_RUN_ATTRIBUTES
+    }
+
 
 class RunMerger:
     def __init__(self, namespaces):
@@ -12,46 +24,22 @@ class RunMerger:
 
     def merge_runs(self, paragraph):
         """Merge neighboring runs in a paragraph if they have the same parameters."""
-        runs = paragraph.findall(
-            ".//w:r",
-            namespaces={
-                "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-            },
-        )
+        runs = paragraph.findall("a:r", self.namespaces)
         i = 0
         while i < len(runs) - 1:
             current_run = runs[i]
             next_run = runs[i + 1]
 
-            # Check if runs can be merged (have same properties)
-            if self.runs_are_similar(current_run, next_run):
+            # Only directly adjacent runs, a line break or field in between stays put
+            if current_run.getnext() is next_run and self.runs_are_similar(
+                current_run, next_run
+            ):
                 # Get the text content
-                current_text = (
-                    current_run.findtext(
-                        ".//w:t",
-                        namespaces={
-                            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                        },
-                    )
-                    or ""
-                )
-                next_text = (
-                    next_run.findtext(
-                        ".//w:t",
-                        namespaces={
-                            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                        },
-                    )
-                    or ""
-                )
+                current_text = current_run.findtext("a:t", namespaces=self.namespaces) or ""
+                next_text = next_run.findtext("a:t", namespaces=self.namespaces) or ""
 
                 # Update text of current run
-                text_element = current_run.find(
-                    ".//w:t",
-                    namespaces={
-                        "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                    },
-                )
+                text_element = current_run.find("a:t", self.namespaces)
                 if text_element is not None:
                     text_element.text = current_text + next_text
 
@@ -61,37 +49,27 @@ class RunMerger:
                     next_run_parent.remove(next_run)
 
                 # Don't increment i since we removed a run
-                runs = paragraph.findall(
-                    ".//w:r",
-                    namespaces={
-                        "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-                    },
-                )
+                runs.pop(i + 1)
             else:
                 i += 1
 
     def runs_are_similar(self, run1, run2):
         """Check if two runs are mergeable based on their parameters."""
         # Compare text properties
-        props1 = run1.find(
-            "w:rPr",
-            namespaces={
-                "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-            },
-        )
-        props2 = run2.find(
-            "w:rPr",
-            namespaces={
-                "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-            },
-        )
+        props1 = run1.find("a:rPr", self.namespaces)
+        props2 = run2.find("a:rPr", self.namespaces)
 
         if props1 is None or props2 is None:
             return False
 
-        # Compare relevant attributes
-        attrs_to_compare = ["lang", "sz", "b", "i", "u"]
-        return all(props1.get(attr) == props2.get(attr) for attr in attrs_to_compare)
+        # Size, weight, baseline, strike, caps, spacing etc. must all match
+        if rendered_run_attributes(props1) != rendered_run_attributes(props2):
+            return False
+
+        # Fill, fonts and hyperlinks are child elements and must match as well
+        return [ET.tostring(child) for child in props1] == [
+            ET.tostring(child) for child in props2
+        ]
 
     def process_paragraphs(self, root):
         """Process all paragraphs in the XML tree."""
@@ -0,0 +1,168 @@
+from functools import lru_cache
+import os
+import posixpath
+import re
+import zipfile
+
+from lxml import etree as ET
+
+CONTENT_TYPES_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+PRESENTATION_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+DOCUMENT_RELATIONSHIPS_NS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+
+# Content types of the parts the pipelines care about
+PART_CONTENT_TYPES = {
+    "slides": "application/vnd.openxmlformats-officedocument.presentationml.slide+xml",
+    "layouts": "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml",
+    "masters": "application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml",
+    "notes": "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml",
+}
+
+PART_NUMBER = re.compile(r"(\d+)\.xml$")
+SLIDE_PATTERN = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+
+
+def _part_number(name: str) -> int:
+    match = PART_NUMBER.search(name)
+    return int(match.group(1)) if match else 0
+
+
+def sort_slide_names(names) -> list[str]:
+    """Return the slide part names among names in slide number order."""
+    slides = [name for name in names if SLIDE_PATTERN.match(name)]
+    return sorted(slides, key=lambda name: int(SLIDE_PATTERN.match(name).group(1)))
+
+
+class PackageIndex:
+    """Parts of a PPTX package, located without listing the files on disk.
+
+    Layouts, masters and notes come from the overrides in [Content_Types].xml,
+    slides in presentation order from p:sldIdLst in ppt/presentation.xml and
+    its relationships. namespaces holds the declarations of the first slide.
+    read(name) returns the bytes of a part name or None if it does not exist.
+    """
+
+    def __init__(self, read):
+        parts = {kind: [] for kind in PART_CONTENT_TYPES}
+        content_types = read("[Content_Types].xml")
+        if content_types:
+            by_content_type = {value: kind for kind, value in PART_CONTENT_TYPES.items()}
+            for override in ET.fromstring(content_types).iter(
+                f"{{{CONTENT_TYPES_NS}}}Override"
+            ):
+                kind = by_content_type.get(override.get("ContentType"))
+                if kind:
+                    parts[kind].append(override.get("PartName", "").lstrip("/"))
+        for kind in parts:
+            parts[kind].sort(key=_part_number)
+
+        self.slides = self._presentation_order(read) or parts["slides"]
+        self.layouts = parts["layouts"]
+        self.masters = parts["masters"]
+        self.notes = parts["notes"]
+        self.namespaces = self._first_slide_namespaces(read)
+
+    @classmethod
+    def from_folder(cls, folder_path: str) -> "PackageIndex":
+        def read(name):
+            path = os.path.join(folder_path, *name.split("/"))
+            if not os.path.isfile(path):
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+
+        index = cls(read)
+        slides_folder = os.path.join(folder_path, "ppt", "slides")
+        if not index.slides and os.path.isdir(slides_folder):
+            # Packages without content type overrides, e.g. hand-made test folders
+            index.slides = sort_slide_names(
+                f"ppt/slides/{name}" for name in os.listdir(slides_folder)
+            )
+        return index
+
+    @classmethod
+    def from_zip(cls, pptx: zipfile.ZipFile) -> "PackageIndex":
+        names = set(pptx.namelist())
+        index = cls(lambda name: pptx.read(name) if name in names else None)
+        if not index.slides:
+            index.slides = sort_slide_names(names)
+        return index
+
+    @classmethod
+    def from_members(cls, members: dict[str, bytes]) -> "PackageIndex":
+        index = cls(members.get)
+        if not index.slides:
+            index.slides = sort_slide_names(members)
+        return index
+
+    @staticmethod
+    def _presentation_order(read) -> list[str]:
+        presentation = read("ppt/presentation.xml")
+        relationships = read("ppt/_rels/presentation.xml.rels")
+        if not presentation or not relationships:
+            return []
+        targets = {
+            rel.get("Id"): rel.get("Target", "")
+            for rel in ET.fromstring(relationships).iter(
+                f"{{{RELATIONSHIPS_NS}}}Relationship"
+            )
+        }
+        slides = []
+        for slide_id in ET.fromstring(presentation).iter(f"{{{PRESENTATION_NS}}}sldId"):
+            target = targets.get(slide_id.get(f"{{{DOCUMENT_RELATIONSHIPS_NS}}}id"))
+            if not target:
+                continue
+            if target.startswith("/"):
+                slides.append(target.lstrip("/"))
+            else:
+                slides.append(posixpath.normpath(posixpath.join("ppt", target)))
+        return slides
+
+    def _first_slide_namespaces(self, read) -> dict:
+        if not self.slides:
+            return {}
+        content = read(self.slides[0])
+        if not content:
+            return {}
+        # Only the root element is needed, the rest of the slide is never parsed
+        parser = ET.XMLPullParser(events=("start",))
+        for offset in range(0, len(content), 4096):
+            parser.feed(content[offset : offset + 4096])
+            for _, element in parser.read_events():
+                return {
+                    prefix if prefix else "default": uri
+                    for prefix, uri in element.nsmap.items()
+                }
+        return {}
+
+
+@lru_cache(maxsize=32)
+def _cached_index(path: str, version: tuple) -> PackageIndex:
+    if os.path.isdir(path):
+        return PackageIndex.from_folder(path)
+    with zipfile.ZipFile(path, "r") as pptx:
+        return PackageIndex.from_zip(pptx)
+
+
+def get_package_index(path: str) -> PackageIndex:
+    """Return the index of a PPTX file or extracted folder.
+
+    The index is built once and shared by all pipelines until the package
+    files change.
+    """
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        version = tuple(
+            os.path.getmtime(file) if os.path.exists(file) else 0
+            for file in (
+                os.path.join(path, "[Content_Types].xml"),
+                os.path.join(path, "ppt", "presentation.xml"),
+                os.path.join(path, "ppt", "_rels", "presentation.xml.rels"),
+            )
+        )
+    else:
+        version = (os.path.getmtime(path), os.path.getsize(path))
+    return _cached_index(path, version)
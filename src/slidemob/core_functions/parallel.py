@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import json
+import os
+
+from lxml import etree as ET
+
+from ..utils.model_settings import ModelSettings
+from .base_class import PowerpointPipeline
+from .document import serialize_tree
+from .merger import RunMerger
+from .translator import SlideTranslator
+
+# Translator of each worker process, built once per settings
+_worker_translators: dict[str, SlideTranslator] = {}
+
+
+def resolve_cpu_workers(cpu_workers: int) -> int:
+    """Return the number of worker processes, 0 or less means one per core."""
+    if cpu_workers <= 0:
+        return os.cpu_count() or 1
+    return cpu_workers
+
+
+def merge_slide_xml(xml: bytes, namespaces: dict) -> bytes:
+    """Merge similar runs of one serialized slide."""
+    tree = ET.ElementTree(ET.fromstring(xml))
+    RunMerger(namespaces).process_paragraphs(tree.getroot())
+    return serialize_tree(tree)
+
+
+def translate_slide_xml(
+    xml: bytes, gui_config: dict, api_keys: dict, pipeline_config: dict
+) -> bytes | None:
+    """Translate one serialized slide, returns None if the translation failed.
+
+    Used for replay runs, where translating only reads recorded responses and
+    is CPU work. Each worker process builds its own settings and translator
+    from the plain configuration of the parent once.
+    """
+    key = json.dumps([gui_config, api_keys, pipeline_config], sort_keys=True, default=str)
+    translator = _worker_translators.get(key)
+    if translator is None:
+        model_settings = ModelSettings(gui_config=gui_config, api_keys=api_keys)
+        translator = SlideTranslator(
+            pipeline_settings=PowerpointPipeline(
+                pipeline_config=pipeline_config, model_settings=model_settings
+            )
+        )
+        _worker_translators[key] = translator
+    tree = ET.ElementTree(ET.fromstring(xml))
+    if not translator.translate_slide(tree.getroot()):
+        return None
+    return serialize_tree(tree)
+
+
+def map_slides(transform, slides: dict[str, bytes], workers: int, **kwargs) -> dict:
+    """Apply transform(xml, **kwargs) to every slide and return the new bytes.
+
+    With more than one worker the slides are spread over a process pool, only
+    bytes are passed between the processes. transform must be a module-level
+    function so it can be pickled.
+    """
+    transform = partial(transform, **kwargs)
+    if workers <= 1 or len(slides) < 2:
+        return {name: transform(xml) for name, xml in slides.items()}
+
+    workers = min(workers, len(slides))
+    # Few large chunks keep the pickling overhead low on big decks
+    chunksize = max(1, len(slides) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(
+            zip(slides, executor.map(transform, slides.values(), chunksize=chunksize))
+        )
@@ -1,11 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
+import time
 import traceback
-import xml.etree.ElementTree as ET
 
+from lxml import etree as ET
 from pydantic import BaseModel
 
+from ..utils.model_settings import ModelSettings
+from ..utils.promts import POLISH_JSON_INSTRUCTION, polish_mapping_prompt, polish_prompt
 from .base_class import PowerpointPipeline
+from .document import PresentationDocument
+from .estimator import RunEstimate
+from .segments import TextSegment
+from .reasoning import TokenUsage, completion_budget_kwargs
+
+SYSTEM_PROMPT = "You are a professional editor."
 
 
 class PolishResponse(BaseModel):
@@ -13,47 +23,72 @@ class PolishResponse(BaseModel):
 
 
 class SlidePolisher(PowerpointPipeline):
-    def __init__(self, Further_StyleInstructions: str = "None"):
+    def __init__(
+        self,
+        Further_StyleInstructions: str = "None",
+        pipeline_config: dict = None,
+        model_settings: ModelSettings | None = None,
+    ):
 
-        super().__init__()
+        super().__init__(pipeline_config=pipeline_config, model_settings=model_settings)
 
         self.Further_StyleInstructions = ""
-        if Further_StyleInstructions != "None":
-            self.Further_StyleInstructions = f" Here are some further wording style instructions: {self.Further_StyleInstructions}"
+        if Further_StyleInstructions and Further_StyleInstructions != "None":
+            self.Further_StyleInstructions = f" Here are some further wording style instructions: {Further_StyleInstructions}"
         else:
             self.Further_StyleInstructions = ""
 
-    def polish_text(self, text: str) -> str:
-        """Polsish text while preserving approximate length and formatting."""
-        prompt = f"""Polish and improve the text strictly following this instructions: 
-        IMPORTANT: If the text is already good, just return it as is.
-        IMPORTANT: If the text is to short, just return it as is.
-        IMPORTANT: For the new text you must not return any other text than the pure polished text.
-        Maintain similar total character length and preserve any special formatting or technical terms. 
-        Keep technical terms. 
-        IMPORTANT: Keep company role- and position names in the translation (e.g., Lead, Senior, DataScientist, CEO, etc.).
-        Keep names of companies in the translation (e.g., Apple, Microsoft, etc.).
-        Keep names of products in the translation (e.g., iPhone, Windows, LegalAI, etc.).
-        Make the text sharp, concise and business-like.
-        {self.Further_StyleInstructions}
-        IMPORTANT: For the new polished text you must not return any other text than the pure polished text. Rather than mentioning that you could not improve the text, just return the text as is.
-        IMPORTANT: Use the -> format_polished_text tool to return the polished text and the original text for the final response.
-        Here is the text to improve:
-        {text}
-        """
+        # Polishing uses the configured translation backend
+        self.client = self.translation_client
+        self.model = self.translation_model
+        self.token_usage = TokenUsage()
+
+    def _budget_kwargs(self, model: str) -> dict:
+        return completion_budget_kwargs(
+            "polish",
+            model in self.reasoning_model_list,
+            self.translation_method,
+            0.3,
+            self.reasoning_effort,
+            self.reasoning_max_tokens,
+        )
+
+    def _record_latency(self, stage: str, model: str, start: float):
+        """Keep the latency of a request for the estimates of later dry runs."""
+        if self.latency_history is None:
+            return
+        if self.exchange_recorder is not None and self.exchange_recorder.mode == "replay":
+            return
+        self.latency_history.record(stage, model, time.perf_counter() - start)
 
-        pydentic_prompt_addition = "Respond with a JSON object containing only a 'polished_text' field with the polished version of this text"
+    def _model_for(self, text: str) -> str:
+        """Short paragraphs are polished without the reasoning model."""
+        if (
+            self.reasoning_fallback_model
+            and self.translation_reasoning_model
+            and len(text) < self.reasoning_min_length
+        ):
+            return self.reasoning_fallback_model
+        return self.model
 
-        if self.model == "gpt-4":  # non pydentic model
+    def polish_text(self, text: str, model: str | None = None) -> str:
+        """Polsish text while preserving approximate length and formatting."""
+        model = model or self.model
+        prompt = polish_prompt(text, self.Further_StyleInstructions)
+
+        if model == "gpt-4":  # non pydentic model
             try:
+                start = time.perf_counter()
                 response = self.client.chat.completions.create(
-                    model=self.model,
+                    model=model,
                     messages=[
-                        {"role": "system", "content": "You are a professional editor."},
+                        {"role": "system", "content": SYSTEM_PROMPT},
                         {"role": "user", "content": prompt},
                     ],
-                    temperature=0.3,
+                    **self._budget_kwargs(model),
                 )
+                self.token_usage.record("polish", model, response)
+                self._record_latency("polish", model, start)
                 if not response.choices[0]:
                     print(f"No response from LLM with this text: {text}")
                     return text
@@ -72,11 +107,12 @@ class SlidePolisher(PowerpointPipeline):
                 return text
         else:  # pydentic model
             try:
+                start = time.perf_counter()
                 response = self.client.chat.completions.create(
-                    model=self.model,
+                    model=model,
                     messages=[
-                        {"role": "system", "content": "You are a professional editor."},
-                        {"role": "user", "content": prompt + pydentic_prompt_addition},
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt + POLISH_JSON_INSTRUCTION},
                     ],
                     tools=[
                         {
@@ -105,12 +141,17 @@ class SlidePolisher(PowerpointPipeline):
                         "type": "function",
                         "function": {"name": "format_polished_text"},
                     },
-                    temperature=0.3,
                     response_format={"type": "json_object"},
+                    **self._budget_kwargs(model),
                 )
-                polished_response = PolishResponse.model_validate_json(
-                    response.choices[0].message.content
-                )
+                self.token_usage.record("polish", model, response)
+                self._record_latency("polish", model, start)
+                message = response.choices[0].message
+                if message.tool_calls:
+                    arguments = message.tool_calls[0].function.arguments
+                else:
+                    arguments = message.content
+                polished_response = PolishResponse.model_validate_json(arguments)
                 return polished_response.polished_text.strip()
 
             except Exception as e:
@@ -125,58 +166,89 @@ class SlidePolisher(PowerpointPipeline):
                 return text
 
     def create_maping(
-        self, text_elements: list[ET.Element], original_text_elements: set
+        self, segments: list[TextSegment], original_text_elements: set
     ) -> dict:
-        """Create a mapping between original text and their translations."""
+        """Create a mapping between original text and their polished versions.
+
+        Paragraphs are polished concurrently with at most polish_concurrency
+        requests in flight. Paragraphs shorter than polish_min_length are kept
+        as they are without asking the model. The polished runs of each
+        paragraph are also stored on its segment.
+        """
         polish_mapping = {text: "" for text in original_text_elements}
 
-        for element in text_elements:
-            original_text = element.text.strip() if element.text else ""
-            print(f"\tLLM fed text: {original_text}")
-            if original_text:
-                polished_text = self.polish_text(original_text)
-                print(f"\tOriginal paragraph: {original_text}")
-                print(f"\tPolished paragraph: {polished_text}\n")
-
-                prompt = f"""Match each original text segment with its corresponding part from the polished text.
-                Original segments: {[text for text in original_text_elements]}
-                Full original text: {original_text}
-                Full polished text: {polished_text}
-                
-                Return a JSON object where keys are the original segments and values are their corresponding polished text.
-                Only include segments that appear in the original text."""
-
-                try:
-                    response = self.client.chat.completions.create(
-                        model=self.pydentic_model,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a professional editor.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=0.3,
-                        response_format={"type": "json_object"},
-                    )
+        paragraphs = []
+        for segment in segments:
+            if not segment.run_texts:
+                continue
+            if len(segment.text) < self.polish_min_length:
+                for text in segment.run_texts:
+                    polish_mapping[text] = polish_mapping[text] or text
+                continue
+            paragraphs.append(segment)
 
-                    segment_mappings = json.loads(response.choices[0].message.content)
+        # 0 or less polishes one paragraph at a time
+        workers = max(1, self.polish_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda segment: self._polish_paragraph(
+                    segment.text, set(segment.run_texts)
+                ),
+                paragraphs,
+            )
+            for segment, segment_mappings in zip(paragraphs, results):
+                translations = {
+                    orig_text: polished_text
+                    for orig_text, polished_text in segment_mappings.items()
+                    if orig_text in segment.run_texts and isinstance(polished_text, str)
+                }
+                # Runs mapped to nothing are removed, but never the whole paragraph
+                if not any(text.strip() for text in translations.values()):
+                    translations = {}
+                segment.translations = translations
+                polish_mapping.update(translations)
 
-                    for orig_text, trans_text in segment_mappings.items():
-                        if orig_text in polish_mapping:
-                            polish_mapping[orig_text] = trans_text
+        if self.verbose:
+            print(f"\tMapping: {polish_mapping}")
+        return polish_mapping
 
-                except Exception as e:
-                    print(f"\tError matching segments: {e}")
-                    print("Full traceback:")
-                    print(traceback.format_exc())
+    def _polish_paragraph(self, original_text: str, local_candidates: set) -> dict:
+        """Polish one paragraph and match the polished text to its runs."""
+        print(f"\tLLM fed text: {original_text}")
+        model = self._model_for(original_text)
+        polished_text = self.polish_text(original_text, model)
+        print(f"\tOriginal paragraph: {original_text}")
+        print(f"\tPolished paragraph: {polished_text}\n")
 
-        print(f"\tMapping: {polish_mapping}")
-        return polish_mapping
+        if polished_text == original_text:
+            return {text: text for text in local_candidates}
 
-    def process_slides(self, folder_path: str):
+        prompt = polish_mapping_prompt(local_candidates, original_text, polished_text)
+
+        try:
+            start = time.perf_counter()
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                response_format={"type": "json_object"},
+                **self._budget_kwargs(model),
+            )
+            self.token_usage.record("polish", model, response)
+            self._record_latency("polish_mapping", model, start)
+            return json.loads(response.choices[0].message.content)
+
+        except Exception as e:
+            print(f"\tError matching segments: {e}")
+            print("Full traceback:")
+            print(traceback.format_exc())
+            return {}
+
+    def process_slides(self, folder_path: str | None = None):
         """Main function to process all slides in the presentation."""
-        slide_files = self.find_slide_files(folder_path)
+        slide_files = self.find_slide_files()
 
         for slide_file in slide_files:
             print(f"\nProcessing {os.path.basename(slide_file)}...")
@@ -195,37 +267,7 @@ class SlidePolisher(PowerpointPipeline):
                     prefix = key.split(":")[1]
                     namespaces[prefix] = value
 
-            # Extract and create translation mapping
-            text_elements, original_text_elements = self.extract_text_runs(slide_file)
-            mapping = self.create_maping(text_elements, original_text_elements)
-
-            # Update text while preserving XML structure and whitespace
-            for original_text, polished_text in mapping.items():
-                if not polished_text.strip():  # Skip empty translations
-                    continue
-                # Update Text
-                for element in root.findall(".//a:t", self.namespaces):
-                    if element.text and element.text.strip() == original_text:
-                        if polished_text.strip():  # If we have a valid translation
-                            # Preserve any leading/trailing whitespace from the original
-                            leading_space = ""
-                            trailing_space = ""
-                            if element.text.startswith(" "):
-                                leading_space = " "
-                            if element.text.endswith(" "):
-                                trailing_space = " "
-                            # Update text
-                            element.text = (
-                                leading_space + polished_text.strip() + trailing_space
-                            )
-
-                        else:
-                            # Find the parent run ('a:r') element and remove it
-                            parent_run = element.getparent()
-                            if parent_run is not None:
-                                parent_paragraph = parent_run.getparent()
-                                if parent_paragraph is not None:
-                                    parent_paragraph.remove(parent_run)
+            self.polish_slide(root)
 
             # Register extracted namespaces
             for prefix, uri in namespaces.items():
@@ -238,3 +280,86 @@ class SlidePolisher(PowerpointPipeline):
             # Write back XML while preserving declaration and namespaces
             with open(slide_file, "wb") as f:
                 tree.write(f, encoding="UTF-8", xml_declaration=True)
+
+        self.finish_run()
+
+    def finish_run(self):
+        """Print the token usage and keep the request latencies for dry runs."""
+        self.token_usage.report()
+        if self.latency_history is not None:
+            self.latency_history.flush()
+
+    def polish_slide(self, root: ET.Element):
+        """Polish a parsed slide in place."""
+        # Extract and create polish mapping from the already parsed slide
+        segments, original_text_elements = self.extract_text_runs(root)
+        self.create_maping(segments, original_text_elements)
+
+        # Write the polished runs straight into their nodes and remove the
+        # runs whose text was merged into their neighbours
+        for segment in segments:
+            if segment.translations:
+                segment.apply(segment.translations)
+
+    def estimate_slides(self, document: PresentationDocument) -> RunEstimate:
+        """Estimate the requests, tokens, cost and time of polishing a deck.
+
+        No request is sent, paragraphs are polished polish_concurrency at a time.
+        """
+        estimate = RunEstimate(
+            self.model_pricing, self.latency_history, self.polish_concurrency
+        )
+        for slide_name in document.slide_names():
+            self.estimate_slide(document.get_root(slide_name), estimate)
+        return estimate
+
+    def estimate_slide(self, root: ET.Element, estimate: RunEstimate):
+        """Count the requests polishing a parsed slide would send.
+
+        Polished paragraphs are projected to be as long as the original, and
+        every polished paragraph is counted with its run matching request.
+        """
+        segments, _ = self.extract_text_runs(root)
+        for segment in segments:
+            if not segment.run_texts:
+                continue
+            if len(segment.text) < self.polish_min_length:
+                estimate.count_paragraph("too_short")
+                continue
+            estimate.count_paragraph("sent")
+            model = self._model_for(segment.text)
+            prompt = polish_prompt(segment.text, self.Further_StyleInstructions)
+            completion = segment.text
+            if model != "gpt-4":
+                prompt += POLISH_JSON_INSTRUCTION
+                completion = json.dumps(
+                    {"original_text": segment.text, "polished_text": segment.text},
+                    ensure_ascii=False,
+                )
+            estimate.add_request(
+                "polish",
+                self.translation_method,
+                model,
+                [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                completion,
+            )
+            estimate.add_request(
+                "polish_mapping",
+                self.translation_method,
+                model,
+                [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": polish_mapping_prompt(
+                            set(segment.run_texts), segment.text, segment.text
+                        ),
+                    },
+                ],
+                json.dumps(
+                    {text: text for text in segment.run_texts}, ensure_ascii=False
+                ),
+            )
@@ -0,0 +1,91 @@
+from collections import Counter, defaultdict
+import re
+import threading
+
+# Backends that accept reasoning_effort and max_completion_tokens
+EFFORT_METHODS = ("OpenAI", "Azure OpenAI")
+
+THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.DOTALL)
+
+
+def completion_budget_kwargs(
+    stage: str,
+    reasoning_model: bool,
+    method: str,
+    temperature: float,
+    reasoning_effort: dict,
+    max_tokens: dict,
+) -> dict:
+    """Return the sampling and token budget arguments of a request of a stage.
+
+    OpenAI reasoning models reject a temperature and are limited through
+    reasoning_effort and max_completion_tokens instead. Other models, including
+    local reasoning models that think in <think> blocks, get max_tokens.
+    """
+    kwargs = {}
+    limit = max_tokens.get(stage)
+    if reasoning_model and method in EFFORT_METHODS:
+        if reasoning_effort.get(stage):
+            kwargs["reasoning_effort"] = reasoning_effort[stage]
+        if limit:
+            kwargs["max_completion_tokens"] = limit
+    else:
+        kwargs["temperature"] = temperature
+        if limit:
+            kwargs["max_tokens"] = limit
+    return kwargs
+
+
+class TokenUsage:
+    """Token counters per stage and model, with reasoning tokens kept apart."""
+
+    def __init__(self):
+        self.counters = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def record(self, stage: str, model: str, response):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+            return
+
+        details = getattr(usage, "completion_tokens_details", None)
+        reasoning_tokens = getattr(details, "reasoning_tokens", None)
+        estimated = 0
+        if not isinstance(reasoning_tokens, int):
+            # Local models only return the thinking as text, about 4 chars a token
+            reasoning_tokens = 0
+            try:
+                content = response.choices[0].message.content or ""
+            except (AttributeError, IndexError, TypeError):
+                content = ""
+            thinking = "".join(THINK_PATTERN.findall(content))
+            if thinking:
+                estimated = reasoning_tokens = len(thinking) // 4
+
+        with self.lock:
+            counter = self.counters[(stage, model)]
+            counter["requests"] += 1
+            counter["prompt_tokens"] += prompt_tokens
+            counter["completion_tokens"] += completion_tokens
+            counter["reasoning_tokens"] += reasoning_tokens
+            counter["estimated_reasoning_tokens"] += estimated
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {key: dict(counter) for key, counter in self.counters.items()}
+
+    def report(self):
+        for (stage, model), counter in self.summary().items():
+            line = (
+                f"Tokens {stage} ({model}): {counter['requests']} requests, "
+                f"{counter['prompt_tokens']} prompt, "
+                f"{counter['completion_tokens']} completion, "
+                f"{counter['reasoning_tokens']} reasoning"
+            )
+            if counter["estimated_reasoning_tokens"]:
+                line += " (estimated from <think> blocks)"
+            print(line)
@@ -0,0 +1,112 @@
+import math
+import threading
+import time
+
+# Concurrency limits are shared by all translators of the process that use
+# the same backend with the same limit
+_backend_semaphores: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_backend_semaphores_lock = threading.Lock()
+
+
+def get_backend_semaphore(backend: str, limit: int) -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore limiting requests to a backend."""
+    key = (backend, max(1, limit))
+    with _backend_semaphores_lock:
+        if key not in _backend_semaphores:
+            _backend_semaphores[key] = threading.BoundedSemaphore(key[1])
+        return _backend_semaphores[key]
+
+
+class TranslationRoute:
+    """A translation backend and the segments it is used for."""
+
+    def __init__(
+        self,
+        name: str,
+        translate,
+        backend: str,
+        max_length: int | None = None,
+        max_concurrency: int = 4,
+    ):
+        self.name = name
+        self.translate = translate
+        self.backend = backend
+        self.max_length = max_length
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = get_backend_semaphore(backend, max_concurrency)
+        self.requests = 0
+        self.errors = 0
+        self.latencies = []
+
+    def accepts(self, text: str) -> bool:
+        return self.max_length is None or len(text) <= self.max_length
+
+
+class TranslationRouter:
+    """Send every segment to the first route that accepts it.
+
+    If a backend fails or returns nothing usable, the remaining routes are
+    tried in order. Requests, errors and latencies are counted per route.
+    """
+
+    def __init__(self, routes: list[TranslationRoute], verbose: bool = False):
+        self.routes = routes
+        self.verbose = verbose
+        self.fallbacks = 0
+        # Copies of a translator share the router across slide workers
+        self.lock = threading.Lock()
+
+    def select(self, text: str) -> TranslationRoute:
+        """Return the first route that accepts the text, the last one otherwise."""
+        return next(
+            (route for route in self.routes if route.accepts(text)), self.routes[-1]
+        )
+
+    def translate(self, text: str) -> str | None:
+        selected = self.select(text)
+        candidates = [selected] + [
+            route for route in self.routes if route is not selected
+        ]
+
+        for attempt, route in enumerate(candidates):
+            if attempt:
+                with self.lock:
+                    self.fallbacks += 1
+                print(f"\tFalling back to route '{route.name}'")
+            start = time.perf_counter()
+            try:
+                with route.semaphore:
+                    result = route.translate(text)
+            except Exception as e:
+                print(f"\tRoute '{route.name}' failed: {e}")
+                result = None
+            succeeded = isinstance(result, str) and bool(result.strip())
+            with self.lock:
+                route.latencies.append(time.perf_counter() - start)
+                route.requests += 1
+                if not succeeded:
+                    route.errors += 1
+            if succeeded:
+                if self.verbose:
+                    print(f"\tRouted to '{route.name}' ({route.backend})")
+                return result
+        return None
+
+    def summary(self) -> dict:
+        """Return requests, errors and latencies per route."""
+        summary = {}
+        for route in self.routes:
+            with self.lock:
+                requests, errors = route.requests, route.errors
+                latencies = sorted(route.latencies)
+            if not requests:
+                continue
+            p95_index = max(0, math.ceil(0.95 * len(latencies)) - 1)
+            summary[route.name] = {
+                "backend": route.backend,
+                "requests": requests,
+                "errors": errors,
+                "avg_latency_s": round(sum(latencies) / len(latencies), 3),
+                "p95_latency_s": round(latencies[p95_index], 3),
+            }
+        return summary
@@ -0,0 +1,103 @@
+from lxml import etree as ET
+
+
+class TextSegment:
+    """One paragraph of a slide with direct references to its text runs.
+
+    text is the joined text of the paragraph as sent to the models. nodes are
+    the a:t elements of its runs, run_texts their stripped text and offsets
+    the (start, end) position of each run in text. translations maps run
+    texts to their new text once the paragraph has been processed.
+    """
+
+    __slots__ = (
+        "paragraph_id",
+        "text",
+        "lang",
+        "nodes",
+        "run_texts",
+        "offsets",
+        "translations",
+    )
+
+    def __init__(
+        self,
+        paragraph_id: int,
+        text: str,
+        lang: str,
+        nodes: tuple,
+        run_texts: tuple,
+        offsets: tuple,
+    ):
+        self.paragraph_id = paragraph_id
+        self.text = text
+        self.lang = lang
+        self.nodes = nodes
+        self.run_texts = run_texts
+        self.offsets = offsets
+        self.translations = None
+
+    def apply(self, translations: dict, remove_empty: bool = True) -> None:
+        """Write new run texts straight into the runs of this paragraph.
+
+        Runs without an entry are left as they are. An empty entry removes the
+        run if remove_empty is set and is skipped otherwise.
+        """
+        for node, run_text in zip(self.nodes, self.run_texts):
+            translation = translations.get(run_text)
+            if translation is None or translation == run_text:
+                continue
+            if translation.strip():
+                # Preserve any leading/trailing whitespace from the original
+                leading_space = " " if node.text.startswith(" ") else ""
+                trailing_space = " " if node.text.endswith(" ") else ""
+                node.text = leading_space + translation.strip() + trailing_space
+            elif remove_empty:
+                run = node.getparent()
+                if run is not None and run.getparent() is not None:
+                    run.getparent().remove(run)
+
+
+def extract_segments(root: str | ET.Element, namespaces: dict) -> list[TextSegment]:
+    """Collect the paragraphs of a slide XML file or parsed slide that contain text."""
+    if isinstance(root, str):
+        root = ET.parse(root).getroot()
+    a_r = f"{{{namespaces['a']}}}r"
+    segments = []
+    for paragraph_id, paragraph in enumerate(root.iterfind(".//a:p", namespaces)):
+        parts = []
+        nodes = []
+        run_texts = []
+        offsets = []
+        lang = None
+        position = 0
+        for node in paragraph.iterfind(".//a:t", namespaces):
+            text = node.text.strip() if node.text else ""
+            if not text:
+                continue
+            if parts:
+                position += 1
+            parts.append(text)
+            # Field texts (slide numbers, dates) are context only, not runs
+            run = node.getparent()
+            if run is not None and run.tag == a_r:
+                run_props = run.find("a:rPr", namespaces)
+                if run_props is not None and lang is None:
+                    lang = run_props.get("lang")
+                nodes.append(node)
+                run_texts.append(text)
+                offsets.append((position, position + len(text)))
+            position += len(text)
+
+        if parts:
+            segments.append(
+                TextSegment(
+                    paragraph_id,
+                    " ".join(parts),
+                    lang or "en-GB",
+                    tuple(nodes),
+                    tuple(run_texts),
+                    tuple(offsets),
+                )
+            )
+    return segments
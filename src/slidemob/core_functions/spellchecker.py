@@ -1,16 +1,49 @@
+from functools import lru_cache
 import re
-import xml.etree.ElementTree as ET
 
+from lxml import etree as ET
 from spellchecker import SpellChecker
 
+from ..utils.model_settings import ModelSettings
 from .base_class import PowerpointPipeline
 
+# Upper bound of memoized corrections kept per process
+SPELLING_MEMO_SIZE = 20000
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+@lru_cache(maxsize=None)
+def get_spellchecker(language: str = "en") -> SpellChecker:
+    """Load the dictionary of a language once per process."""
+    return SpellChecker(language=language)
+
+
+@lru_cache(maxsize=SPELLING_MEMO_SIZE)
+def correct_word(word: str, language: str = "en") -> str:
+    """Return the correction of a single word, memoized across the deck."""
+    correction = get_spellchecker(language).correction(word.lower())
+    if not correction:
+        return word
+    # Keep the capitalization of the original word
+    if word[0].isupper():
+        correction = correction[0].upper() + correction[1:]
+    return correction
+
 
 class SlideSpellChecker(PowerpointPipeline):
-    def __init__(self, Further_SpellCheckInstructions):
-        super().__init__()
+    def __init__(
+        self,
+        Further_SpellCheckInstructions=None,
+        language: str = "en",
+        pipeline_config: dict = None,
+        model_settings: ModelSettings | None = None,
+    ):
+        super().__init__(pipeline_config=pipeline_config, model_settings=model_settings)
 
-        self.spell = SpellChecker()
+        self.language = language
+        self.spell = get_spellchecker(language)
+        self.glossary_terms = {term.casefold() for term in self.glossary or []}
         # Define namespaces used in PPTX XML
         self.namespaces = {
             "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
@@ -20,88 +53,85 @@ class SlideSpellChecker(PowerpointPipeline):
         ET.register_namespace("p", self.namespaces["p"])
 
     def check_and_fix_slide(self, xml_content):
-        tree = ET.ElementTree(ET.fromstring(xml_content))
-        root = tree.getroot()
-
-        # Find all paragraphs
-        for paragraph in root.findall(".//a:p", self.namespaces):
-            self._process_paragraph(paragraph)
-
+        root = ET.fromstring(xml_content)
+        self.check_and_fix_deck([root])
         return ET.tostring(root, encoding="unicode")
 
-    def _process_paragraph(self, paragraph):
-        runs = paragraph.findall("a:r", self.namespaces)
-        i = 0
-        while i < len(runs):
-            current_run = runs[i]
-
-            # Check if current run has error attribute
-            if current_run.get("err") == "1":
-                # Store original properties
-                run_props = current_run.find("a:rPr", self.namespaces)
-
-                # Collect text from this and adjacent runs
-                combined_text = self._collect_adjacent_text(runs, i)
-
-                # Fix spelling and update runs
-                corrected_text = self._fix_spelling(combined_text)
-                if corrected_text != combined_text:
-                    self._update_runs_with_correction(
-                        runs, i, corrected_text, run_props
+    def check_and_fix_deck(self, roots: list) -> dict:
+        """Correct the flagged runs of all slides in a single pass.
+
+        Unique flagged tokens of the whole deck are collected first, each one
+        is corrected once and the corrections are written back in one go.
+        Returns the applied corrections.
+        """
+        flagged_runs = []
+        tokens = set()
+        for root in roots:
+            for paragraph in root.findall(".//a:p", self.namespaces):
+                for run in paragraph.findall("a:r", self.namespaces):
+                    # Check language consistency
+                    self._check_language_consistency(run)
+                    if not self._is_flagged(run):
+                        continue
+                    text_elem = run.find("a:t", self.namespaces)
+                    if text_elem is None or not text_elem.text:
+                        continue
+                    flagged_runs.append((paragraph, run, text_elem))
+                    tokens.update(
+                        token
+                        for token in WORD_PATTERN.findall(text_elem.text)
+                        if not self._skip_token(token)
                     )
 
-                # Merge runs with identical properties
-                self._merge_identical_runs(paragraph)
-
-            # Check language consistency
-            self._check_language_consistency(current_run)
-
-            i += 1
-
-    def _collect_adjacent_text(self, runs, start_index):
-        """Collects text from adjacent runs that might be part of the same word"""
-        text_parts = []
-        i = start_index
-
-        while i < len(runs):
-            text_elem = runs[i].find("a:t", self.namespaces)
-            if text_elem is not None:
-                text_parts.append(text_elem.text)
-            i += 1
-
-            # Stop if we hit punctuation or clear word boundary
-            if text_elem is not None and re.search(r"[.!?,\s]$", text_elem.text):
-                break
-
-        return "".join(text_parts)
-
-    def _fix_spelling(self, text):
-        words = text.split()
-        corrected_words = []
-
-        for word in words:
-            if self.spell.correction(word) != word:
-                corrected_words.append(self.spell.correction(word))
-            else:
-                corrected_words.append(word)
-
-        return " ".join(corrected_words)
-
-    def _update_runs_with_correction(
-        self, runs, start_index, corrected_text, original_props
-    ):
-        """Updates the runs with corrected text while maintaining formatting"""
-        # Create new run with corrected text
-        new_run = ET.Element("a:r")
-        new_run.append(original_props)
+        # The dictionary lookup is cheap, the edit-distance search is not
+        unknown = self.spell.unknown(tokens)
+        corrections = {}
+        for token in tokens:
+            if token.lower() not in unknown:
+                continue
+            corrected = correct_word(token, self.language)
+            if corrected != token:
+                corrections[token] = corrected
+
+        paragraphs = []
+        for paragraph, run, text_elem in flagged_runs:
+            if corrections:
+                text_elem.text = WORD_PATTERN.sub(
+                    lambda match: corrections.get(match.group(0), match.group(0)),
+                    text_elem.text,
+                )
+            self._clear_flag(run)
+            if paragraph not in paragraphs:
+                paragraphs.append(paragraph)
+
+        # Merge runs with identical properties
+        for paragraph in paragraphs:
+            self._merge_identical_runs(paragraph)
+
+        if self.verbose:
+            print(f"\tSpelling corrections: {corrections}")
+        return corrections
+
+    def _is_flagged(self, run) -> bool:
+        """PowerPoint marks misspelled runs with err="1" on the run properties."""
+        if run.get("err") == "1":
+            return True
+        run_props = run.find("a:rPr", self.namespaces)
+        return run_props is not None and run_props.get("err") == "1"
 
-        text_elem = ET.SubElement(new_run, "a:t")
-        text_elem.text = corrected_text
+    def _clear_flag(self, run):
+        run.attrib.pop("err", None)
+        run_props = run.find("a:rPr", self.namespaces)
+        if run_props is not None:
+            run_props.attrib.pop("err", None)
 
-        # Replace old runs with new corrected run
-        parent = runs[start_index].getparent()
-        parent.remove(runs[start_index])
-        parent.insert(start_index, new_run)
+    def _skip_token(self, token: str) -> bool:
+        """Skip numbers, acronyms and glossary terms."""
+        if any(char.isdigit() for char in token):
+            return True
+        if len(token) > 1 and token.isupper():
+            return True
+        return token.casefold() in self.glossary_terms
 
     def _merge_identical_runs(self, paragraph):
         """Merges adjacent runs with identical properties"""
@@ -112,10 +142,13 @@ class SlideSpellChecker(PowerpointPipeline):
             current_run = runs[i]
             next_run = runs[i + 1]
 
-            if self._runs_have_identical_props(current_run, next_run):
+            if (
+                current_run.getnext() is next_run
+                and self._runs_have_identical_props(current_run, next_run)
+            ):
                 # Merge text content
-                current_text = current_run.find("a:t", self.namespaces).text
-                next_text = next_run.find("a:t", self.namespaces).text
+                current_text = current_run.find("a:t", self.namespaces).text or ""
+                next_text = next_run.find("a:t", self.namespaces).text or ""
                 current_run.find("a:t", self.namespaces).text = current_text + next_text
 
                 # Remove the merged run
@@ -131,6 +164,10 @@ class SlideSpellChecker(PowerpointPipeline):
 
         if props1 is None or props2 is None:
             return False
+        if run1.find("a:t", self.namespaces) is None:
+            return False
+        if run2.find("a:t", self.namespaces) is None:
+            return False
 
         # Compare relevant attributes
         attrs_to_compare = ["lang", "sz", "b", "i", "u"]
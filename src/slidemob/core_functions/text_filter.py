@@ -0,0 +1,133 @@
+from collections import Counter
+import re
+import threading
+
+from langdetect import DetectorFactory, detect
+
+# langdetect is non-deterministic unless seeded
+DetectorFactory.seed = 0
+
+NUMBER_PATTERN = re.compile(
+    r"^\(?[+\-−±]?\s*[$€£¥]?\s*\d[\d.,'  ]*"
+    r"(?:\s?(?:k|K|m|M|bn|mn|Mio\.?|Mrd\.?))?\)?\s*[$€£¥]?\)?$"
+)
+PERCENTAGE_PATTERN = re.compile(
+    r"^\(?[+\-−±]?\s*\d[\d.,  ]*\s?(?:%|pp|bps|‰)\)?$"
+)
+DATE_PATTERNS = [
+    re.compile(r"^\d{4}[-/.]\d{1,2}[-/.]\d{1,2}$"),  # 2024-03-31
+    re.compile(r"^\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}$"),  # 31.03.2024, 3/31/24
+    re.compile(r"^(?:Q[1-4]|H[12]|FY|CY)\s?'?\d{2,4}$"),  # Q3 2024, FY24
+    re.compile(r"^(?:Q[1-4]|H[12])\s?(?:FY|CY)?\s?'?\d{2,4}$"),  # Q3 FY24
+    re.compile(r"^\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp][Mm])?$"),  # 10:30, 9:15 pm
+]
+URL_PATTERN = re.compile(r"^(?:https?://|ftp://|www\.)\S+$", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$")
+# Upper case letters and at least three digits in parts joined by separators,
+# like AB-1234 or X7/200, but not COVID-19 or B2B
+PRODUCT_CODE_PATTERN = re.compile(
+    r"^(?=[^A-Z]*[A-Z])(?=(?:\D*\d){3})[A-Z0-9]+(?:[\-_/.#][A-Z0-9]+)+$"
+)
+
+
+class TextPreFilter:
+    """Classify text that can be kept as is without sending it to a model.
+
+    Every skipped text is counted per category so a run can report how many
+    requests the filter saved.
+    """
+
+    CATEGORIES = (
+        "empty",
+        "symbol",
+        "number",
+        "percentage",
+        "date",
+        "url",
+        "email",
+        "product_code",
+        "glossary",
+        "target_language",
+    )
+
+    def __init__(
+        self,
+        target_language_code: str | None = None,
+        glossary: list[str] | None = None,
+        min_detect_length: int = 20,
+    ):
+        self.target_language_code = (
+            target_language_code.split("-")[0].lower() if target_language_code else None
+        )
+        self.glossary = {term.strip().casefold() for term in glossary or [] if term}
+        self.min_detect_length = min_detect_length
+        # Shared by the translators of concurrently processed slides
+        self.counters = Counter()
+        self.lock = threading.Lock()
+
+    def classify(self, text: str) -> str | None:
+        """Return the skip category of the text or None if it needs a model call."""
+        category = self._classify(text)
+        if category:
+            with self.lock:
+                self.counters[category] += 1
+        return category
+
+    def category(self, text: str) -> str | None:
+        """Return the skip category like classify() without counting the text."""
+        return self._classify(text)
+
+    def should_skip(self, text: str) -> bool:
+        return self.classify(text) is not None
+
+    def _classify(self, text: str) -> str | None:
+        if not text or not text.strip():
+            return "empty"
+        text = text.strip()
+
+        # Cheap regex checks first, language detection last
+        if not any(char.isalnum() for char in text):
+            return "symbol"
+        if any(pattern.match(text) for pattern in DATE_PATTERNS):
+            return "date"
+        if NUMBER_PATTERN.match(text):
+            return "number"
+        if PERCENTAGE_PATTERN.match(text):
+            return "percentage"
+        if URL_PATTERN.match(text):
+            return "url"
+        if EMAIL_PATTERN.match(text):
+            return "email"
+        if PRODUCT_CODE_PATTERN.match(text):
+            return "product_code"
+        if self.glossary and text.casefold() in self.glossary:
+            return "glossary"
+        if self._is_target_language(text):
+            return "target_language"
+        return None
+
+    def _is_target_language(self, text: str) -> bool:
+        """Detect text that is already written in the target language."""
+        if not self.target_language_code:
+            return False
+        # langdetect is unreliable on short labels, only trust longer text
+        if sum(char.isalpha() for char in text) < self.min_detect_length:
+            return False
+        try:
+            detected = detect(text)
+        except Exception:
+            return False
+        return detected.split("-")[0].lower() == self.target_language_code
+
+    def summary(self) -> dict:
+        """Return the skip counters per category."""
+        with self.lock:
+            return {
+                category: self.counters[category]
+                for category in self.CATEGORIES
+                if self.counters[category]
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
@@ -1,7 +1,12 @@
 import asyncio
+from collections import Counter, defaultdict
+import copy
+from functools import partial
 import json
 import os
 import re
+import threading
+import time
 import traceback
 
 from googletrans import Translator
@@ -15,27 +20,106 @@ from ..utils.promts import (
     mapping_prompt_deepseek,
     mapping_prompt_llama2,
     mapping_prompt_openai,
+    mapping_prompt_structured,
     translation_prompt_deepseek_0,
     translation_prompt_llama2_0,
     translation_prompt_llama2_1,
     translation_prompt_openai_0,
     translation_prompt_openai_1,
     translation_prompt_with_markers,
+    translation_prompt_with_reference,
+    translate_and_align_prompt,
 )
-from .base_class import PowerpointPipeline
+from .base_class import PowerpointPipeline, load_json_resource
+from .coalescing import get_single_flight, request_fingerprint
+from .document import PresentationDocument
+from .estimator import RunEstimate
+from .hedging import get_hedger
+from .reasoning import TokenUsage, completion_budget_kwargs
+from .router import TranslationRoute, TranslationRouter
+from .segments import TextSegment
+from .text_filter import TextPreFilter
+from ..utils.endpoint_pool import EndpointPool
 from ..utils.marker_utils import MarkerUtils
+from ..utils.recorder import RecordingClient, RecordingSession
+
+
+# Slides processed when "Reduce Slides" is enabled
+REDUCED_SLIDES = ["slide2.xml", "slide3.xml", "slide4.xml"]
+
+TRANSLATION_SYSTEM_PROMPT = "You are a professional translator."
+MAPPING_SYSTEM_PROMPT = (
+    "You are a professional text alignment expert, editor and translator."
+)
+
+# Sampling defaults of the Azure OpenAI translation
+AZURE_DEFAULTS = {
+    "temperature": 0.7,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0,
+    "max_tokens_out": 1000,
+}
+
+# Numbers that must match for a fuzzy memory match to be reused as is
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Keep HTTP connections to the model servers alive between requests
+HTTP_SESSION = requests.Session()
 
 
 class TranslationResponse(BaseModel):
     translation: str
 
 
+def segment_mapping_schema(original_segments) -> dict:
+    """JSON schema response format that only admits the given segments."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "segment_mapping",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "segments": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "original": {
+                                    "type": "string",
+                                    "enum": sorted(original_segments),
+                                },
+                                "translation": {"type": "string"},
+                            },
+                            "required": ["original", "translation"],
+                            "additionalProperties": False,
+                        },
+                    }
+                },
+                "required": ["segments"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+class _ParagraphState(threading.local):
+    """State of the paragraph being translated, separate for every thread."""
+
+    original_text = None
+    last_request_failed = False
+
+
 class SlideTranslator:
     def __init__(
         self,
         pipeline_settings: PowerpointPipeline | None = None,
         verbose: bool = False,
     ):
+        # Shared with copies of this translator, so slides can be translated
+        # concurrently by the same translator and its backends
+        self.paragraph_state = _ParagraphState()
 
         # Initialize parent class first with settings from pipeline_settings
         self.root_folder = pipeline_settings.root_folder
@@ -63,164 +147,718 @@ class SlideTranslator:
         self.translation_reasoning_model = pipeline_settings.translation_reasoning_model
         self.mapping_reasoning_model = pipeline_settings.mapping_reasoning_model
         self.translation_strategy = pipeline_settings.translation_strategy
+        self.glossary = pipeline_settings.glossary
+        self.single_call_translation = pipeline_settings.single_call_translation
+
+        self.translation_memory = getattr(pipeline_settings, "translation_memory", None)
+        # Similar paragraphs in the memory are reused or sent as a reference
+        self.fuzzy_matching = self.translation_memory is not None and getattr(
+            pipeline_settings, "fuzzy_matching", False
+        )
+        self.fuzzy_reuse_threshold = getattr(
+            pipeline_settings, "fuzzy_reuse_threshold", 0.95
+        )
+        self.fuzzy_reference_threshold = getattr(
+            pipeline_settings, "fuzzy_reference_threshold", 0.75
+        )
+        self.fuzzy_stats = Counter()
+
+        # Recorded exchanges make reruns of the same decks deterministic and offline
+        self.exchange_recorder = getattr(pipeline_settings, "exchange_recorder", None)
+        self.http_session = HTTP_SESSION
+        if self.exchange_recorder is not None:
+            self.http_session = RecordingSession(HTTP_SESSION, self.exchange_recorder)
+
+        # Schema-constrained mapping responses and retries of unmapped segments
+        self.structured_outputs = getattr(pipeline_settings, "structured_outputs", False)
+        self.mapping_retries = getattr(pipeline_settings, "mapping_retries", 1)
+        self.mapping_stats = defaultdict(Counter)
+
+        # Reasoning budgets per stage, short segments skip the reasoning model
+        self.reasoning_models = set(getattr(pipeline_settings, "reasoning_model_list", []))
+        self.reasoning_effort = getattr(pipeline_settings, "reasoning_effort", {})
+        self.reasoning_max_tokens = getattr(pipeline_settings, "reasoning_max_tokens", {})
+        self.reasoning_fallback_model = getattr(
+            pipeline_settings, "reasoning_fallback_model", ""
+        )
+        self.reasoning_min_length = getattr(pipeline_settings, "reasoning_min_length", 80)
+        self.token_usage = TokenUsage()
+
+        # Latencies of earlier runs and prices are used by dry run estimates
+        self.latency_history = getattr(pipeline_settings, "latency_history", None)
+        self.model_pricing = getattr(pipeline_settings, "model_pricing", {})
+        self.slide_workers = getattr(pipeline_settings, "slide_workers", 1)
+
+        # Identical requests in flight at the same time share one call
+        self.coalesce_requests = getattr(pipeline_settings, "coalesce_requests", True)
+        self.coalesce_stats = defaultdict(Counter)
+        self.coalesce_lock = threading.Lock()
+
+        # Duplicate slow requests, latencies are tracked per process and model
+        self.hedge_requests = getattr(pipeline_settings, "hedge_requests", False)
+        self.hedge_backend = getattr(pipeline_settings, "hedge_backend", "same")
+        self.hedge_percentile = getattr(pipeline_settings, "hedge_percentile", 95)
+        self.hedge_budget = getattr(pipeline_settings, "hedge_budget", 0.1)
+        self.translation_hedger = get_hedger(
+            f"translation:{self.translation_model}",
+            self.hedge_percentile,
+            self.hedge_budget,
+        )
+        self.mapping_hedger = get_hedger(
+            f"mapping:{self.mapping_model}", self.hedge_percentile, self.hedge_budget
+        )
+        self.hedge_start = {
+            "translation": self.translation_hedger.summary(),
+            "mapping": self.mapping_hedger.summary(),
+        }
 
         # Load language codes mapping
-        config_languages_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "config_languages.json"
+        self.language_codes = load_json_resource("slidemob/config_languages.json")
+
+        # Local classifier that skips text which needs no model call
+        target_lang_code = None
+        for lang in self.language_codes.get("languages", []):
+            if lang["language"].startswith(self.target_language):
+                target_lang_code = lang["code"]
+                break
+        self.pre_filter = TextPreFilter(
+            target_language_code=target_lang_code, glossary=self.glossary
         )
-        with open(config_languages_path) as f:
-            self.language_codes = json.load(f)
 
         # Check model type for LMStudio
         if hasattr(self, "translation_model") and self.translation_model:
-            if re.search(r"\bdeepseek\b", self.translation_model.lower()):
-                self.translation_model_type = "deepseek"
-            elif re.search(r"\bllama\b", self.translation_model.lower()):
-                self.translation_model_type = "llama"
-            elif re.search(r"\bgpt\b", self.translation_model.lower()) or re.search(r"\bopenai\b", self.translation_model.lower()):
-                self.translation_model_type = "openai"
-            else:
-                self.translation_model_type = "unknown"
+            self.translation_model_type = self._detect_model_type(self.translation_model)
 
         # Check model type for LMStudio
         if hasattr(self, "mapping_model") and self.mapping_model:
-            if re.search(r"\bdeepseek\b", self.mapping_model.lower()):
-                self.mapping_model_type = "deepseek"
-            elif re.search(r"\bllama\b", self.mapping_model.lower()):
-                self.mapping_model_type = "llama"
-            elif re.search(r"\bgpt\b", self.mapping_model.lower()) or re.search(r"\bopenai\b", self.mapping_model.lower()):
-                self.mapping_model_type = "openai"
-            else:
-                self.mapping_model_type = "unknown"
+            self.mapping_model_type = self._detect_model_type(self.mapping_model)
+
+        # Send short segments to a cheaper backend, everything else to the
+        # configured translation model
+        self.router = None
+        self.last_request_failed = False
+        if getattr(pipeline_settings, "routing", False):
+            self.router = self._create_router(pipeline_settings)
+
+        self.non_reasoning_backend = None
+        if self.reasoning_fallback_model and (
+            self.translation_reasoning_model or self.mapping_reasoning_model
+        ):
+            self.non_reasoning_backend = self._create_non_reasoning_backend()
+
+    @property
+    def original_text(self) -> str | None:
+        return self.paragraph_state.original_text
+
+    @original_text.setter
+    def original_text(self, text: str | None):
+        self.paragraph_state.original_text = text
+
+    @property
+    def last_request_failed(self) -> bool:
+        return self.paragraph_state.last_request_failed
+
+    @last_request_failed.setter
+    def last_request_failed(self, failed: bool):
+        self.paragraph_state.last_request_failed = failed
+
+    @staticmethod
+    def _detect_model_type(model: str) -> str:
+        if re.search(r"\bdeepseek\b", model.lower()):
+            return "deepseek"
+        elif re.search(r"\bllama\b", model.lower()):
+            return "llama"
+        elif re.search(r"\bgpt\b", model.lower()) or re.search(r"\bopenai\b", model.lower()):
+            return "openai"
+        return "unknown"
+
+    def _create_non_reasoning_backend(self) -> "SlideTranslator":
+        """A copy of this translator that uses the fallback model on the same clients."""
+        model = self.reasoning_fallback_model
+        backend = copy.copy(self)
+        backend.router = None
+        backend.non_reasoning_backend = None
+        if self.translation_reasoning_model:
+            backend.translation_model = model
+            backend.translation_model_type = self._detect_model_type(model)
+            backend.translation_reasoning_model = False
+            backend.translation_hedger = get_hedger(
+                f"translation:{model}", self.hedge_percentile, self.hedge_budget
+            )
+        if self.mapping_reasoning_model:
+            backend.mapping_model = model
+            backend.mapping_model_type = self._detect_model_type(model)
+            backend.mapping_reasoning_model = False
+            backend.mapping_hedger = get_hedger(
+                f"mapping:{model}", self.hedge_percentile, self.hedge_budget
+            )
+        return backend
+
+    def _backend_for(self, text: str) -> "SlideTranslator":
+        """Return the translator that handles a paragraph of this length."""
+        if self.non_reasoning_backend and len(text) < self.reasoning_min_length:
+            self.non_reasoning_backend.original_text = text
+            return self.non_reasoning_backend
+        return self
+
+    def _create_router(self, pipeline_settings) -> TranslationRouter:
+        """Build the short text route and the default route."""
+        method = pipeline_settings.route_short_method
+        model = pipeline_settings.route_short_model or self.translation_model
+        concurrency = pipeline_settings.route_concurrency
+
+        # A copy of this translator that talks to the short text backend
+        short_backend = copy.copy(self)
+        short_backend.router = None
+        short_backend.translation_method = method
+        short_backend.translation_model = model
+        short_backend.translation_client = pipeline_settings.route_short_client
+        short_backend.translation_api_url = pipeline_settings.route_short_api_url
+        if method == "LMStudio":
+            short_backend.translation_headers = {"Content-Type": "application/json"}
+        short_backend.translation_model_type = self._detect_model_type(model)
+        short_backend.translation_reasoning_model = model in getattr(
+            pipeline_settings, "reasoning_model_list", []
+        )
+        short_backend.translation_hedger = get_hedger(
+            f"translation:{model}", self.hedge_percentile, self.hedge_budget
+        )
+
+        # The translator behind each route, by route name
+        self.route_backends = {"short": short_backend, "default": self}
+        routes = [
+            TranslationRoute(
+                "short",
+                short_backend._translate_for_route,
+                method if method == "Google" else f"{method}:{model}",
+                max_length=pipeline_settings.route_short_max_length,
+                max_concurrency=concurrency.get("short", 8),
+            ),
+            TranslationRoute(
+                "default",
+                self._translate_for_route,
+                f"{self.translation_method}:{self.translation_model}",
+                max_concurrency=concurrency.get("default", 4),
+            ),
+        ]
+        return TranslationRouter(routes, verbose=self.verbose)
 
     def create_translation_map(
-        self, text_elements: list[ET.Element], original_text_elements: set
+        self,
+        segments: list[TextSegment],
+        original_text_elements: set,
+        stop_check_callback=None,
     ) -> dict:
-        """Create a mapping between original text and their translations."""
+        """Translate the runs of every paragraph.
+
+        The translations of a paragraph are stored on its segment and merged
+        into the returned mapping between original run texts and translations.
+        """
         translation_map = {text: "" for text in original_text_elements}
-        for element in text_elements:
-            if element.text is not None:
-                self.original_text = element.text.strip()
-                source_lang = element.get("lang", "en-GB")
-            else:
+        for segment in segments:
+            # Stop between paragraphs instead of finishing the whole slide
+            if stop_check_callback and stop_check_callback():
+                break
+            self.original_text = segment.text
+            # Only the runs of the current paragraph are candidates, which
+            # reduces context noise and hallucinations
+            local_candidates = set(segment.run_texts)
+            if not local_candidates:
                 continue
 
-            if self.original_text is not None:
-                # Check if the text is only a number (float or integer) with optional spaces
-                if re.match(r"^\s*-?\d*\.?\d+\s*$", self.original_text):
-                    translated_text = self.original_text
-                    # Update translation map for the current original text
-                    if self.original_text in translation_map:
-                        translation_map[self.original_text] = translated_text
-                else:
-                    if self.translation_method == "OpenAI":
-                        translated_text = self.translate_text_OpenAI(self.original_text)
-                    elif self.translation_method == "Google":
-                        translated_text = self.translate_text_google(self.original_text)
-                    elif self.translation_method == "DeepSeek":
-                        translated_text = self.translate_text_deepseek(
-                            self.original_text
-                        )
-                    elif self.translation_method == "HuggingFace":
-                        translated_text = self.translate_text_huggingface(
-                            self.original_text
-                        )
-                    elif self.translation_method == "LMStudio":
-                        translated_text = self.translate_text_lmstudio(
-                            self.original_text
-                        )
-                    elif self.translation_method == "Azure OpenAI":
-                        translated_text = self.translate_text_azure_openai(
-                            self.original_text
-                        )
+            # Skip numbers, dates, codes etc. without any API call
+            skip_category = self.pre_filter.classify(self.original_text)
+            if skip_category:
+                if self.verbose:
+                    print(f"\tSkipped ({skip_category}): {self.original_text}")
+                # Keep every run of the paragraph as is
+                segment.translations = {}
+                for text in local_candidates:
+                    if not translation_map[text]:
+                        translation_map[text] = text
+                continue
 
+            # Reuse an identical paragraph from the translation memory
+            memory_key = None
+            if self.translation_memory is not None:
+                memory_key = self._memory_key(local_candidates)
+                entry = self.translation_memory.get_entry(memory_key)
+                if entry and isinstance(entry.get("segments"), dict):
                     if self.verbose:
-                        print(f"\tOriginal paragraph: {self.original_text}")
-                        print(f"\tTranslated paragraph: {translated_text}\n")
-                    
-                    # Filter candidates to only those that appear in the current paragraph
-                    # This reduces context noise and hallucinations
-                    local_candidates = {
-                        t for t in original_text_elements 
-                        if t in self.original_text
-                    }
-                    
-                    if not local_candidates:
-                         # Fallback if strict substring check fails (unlikely if extract matches)
-                         local_candidates = original_text_elements
-
-                    translation_map = self._create_mapping_map(
-                        local_candidates, translated_text, translation_map
+                        print(f"\tTranslation memory hit: {self.original_text}")
+                    self._store_segment_translations(
+                        segment, entry["segments"], translation_map
                     )
+                    continue
+
+            # Reuse or adapt the translation of a similar paragraph
+            segment_mappings = None
+            translated_text = None
+            reference = None
+            match = self._find_similar_paragraph() if memory_key else None
+            if match:
+                similarity, entry = match
+                if self._can_reuse(similarity, entry["source"]):
+                    if self.verbose:
+                        print(
+                            f"\tFuzzy memory hit ({similarity:.2f}): {entry['source']}"
+                        )
+                    if self._is_valid_segment_mapping(
+                        entry.get("segments"), local_candidates
+                    ):
+                        self.fuzzy_stats["reused"] += 1
+                        self._store_segment_translations(
+                            segment, entry["segments"], translation_map
+                        )
+                        continue
+                    # Different runs, only their mapping is requested
+                    self.fuzzy_stats["reused_translation"] += 1
+                    translated_text = entry["translation"]
+                else:
+                    self.fuzzy_stats["referenced"] += 1
+                    reference = (entry["source"], entry["translation"])
+
+            # Short paragraphs are not sent to a reasoning model
+            backend = self._backend_for(self.original_text)
+            if translated_text is None and self._use_single_call(self.original_text):
+                translated_text, segment_mappings = backend.translate_and_align(
+                    local_candidates, reference
+                )
+            if translated_text is None and reference and self._use_reference(
+                self.original_text
+            ):
+                translated_text = backend.translate_with_reference(
+                    self.original_text, reference
+                )
+            if translated_text is None:
+                translated_text = backend.translate_paragraph(self.original_text)
+
+            if self.verbose:
+                print(f"\tOriginal paragraph: {self.original_text}")
+                print(f"\tTranslated paragraph: {translated_text}\n")
+
+            if segment_mappings is None:
+                # Separate mapping request, also used when the combined
+                # response failed validation
+                segment_mappings = backend._create_mapping_map(
+                    local_candidates,
+                    translated_text,
+                    {text: "" for text in local_candidates},
+                )
+            self._store_segment_translations(segment, segment_mappings, translation_map)
+
+            if memory_key and translated_text:
+                self.translation_memory.set(
+                    memory_key,
+                    translated_text,
+                    segment.translations,
+                    source=self.original_text,
+                    context=self._memory_context(),
+                )
         return translation_map
 
-    def analyze_text(self, text: str) -> str:
-        if not text or text.isspace():
-            return "not_translatable"
+    @staticmethod
+    def _store_segment_translations(
+        segment: TextSegment, segment_mappings: dict, translation_map: dict
+    ):
+        segment.translations = {
+            text: segment_mappings[text]
+            for text in segment.run_texts
+            if isinstance(segment_mappings.get(text), str)
+        }
+        translation_map.update(segment.translations)
+
+    def _use_single_call(self, text: str) -> bool:
+        """Short segments routed to another backend are translated on their own."""
+        if not (self.single_call_translation and self.translation_client):
+            return False
+        return not self.router or self.router.select(text).name == "default"
+
+    def _memory_key(self, original_segments: set) -> str:
+        """Key a paragraph by everything that determines its translation."""
+        return self.translation_memory.make_key(
+            self.target_language,
+            self.translation_method,
+            self.translation_model,
+            self.style_instructions,
+            self.original_text,
+            sorted(original_segments),
+        )
 
-        text = text.strip()
-        # Check if empty or just whitespace
-        if not text:
-            return "not_translatable"
+    def _memory_context(self) -> str:
+        """Key of the paragraphs whose translations may serve as fuzzy matches."""
+        return self.translation_memory.make_key(
+            self.target_language, self.style_instructions
+        )
 
-        # Check if it's just numbers, basic punctuation, plus/minus signs, and spaces
-        if re.match(r"^[+\-\d\s%.,()]+$", text):
-            return "not_translatable"
+    def _find_similar_paragraph(self) -> tuple[float, dict] | None:
+        if not self.fuzzy_matching:
+            return None
+        match = self.translation_memory.find_similar(
+            self._memory_context(),
+            self.original_text,
+            self.fuzzy_reference_threshold,
+        )
+        if match is None or not isinstance(match[1].get("translation"), str):
+            return None
+        return match
+
+    def _can_reuse(self, similarity: float, source: str) -> bool:
+        """Near-identical paragraphs reuse a translation unless their numbers differ."""
+        return similarity >= self.fuzzy_reuse_threshold and NUMBER_PATTERN.findall(
+            source
+        ) == NUMBER_PATTERN.findall(self.original_text)
+
+    def _use_reference(self, text: str) -> bool:
+        """References are sent with the prompts of OpenAI-compatible backends."""
+        if not self.translation_client or self.translation_method in (
+            "Google",
+            "HuggingFace",
+        ):
+            return False
+        return not self.router or self.router.select(text).name == "default"
+
+    def translate_with_reference(self, text: str, reference: tuple) -> str | None:
+        """Translate a paragraph by adapting the translation of a similar one.
+
+        Returns None if the response holds no usable translation.
+        """
+        prompt = translation_prompt_with_reference(
+            text, self.target_language, self.style_instructions, *reference
+        )
+        response = self.use_translation_OpenAIclient(prompt, 0.3)
+        if not response:
+            return None
+        content = re.sub(
+            r"<think>.*?</think>",
+            "",
+            response.choices[0].message.content or "",
+            flags=re.DOTALL,
+        )
+        translation_match = re.search(
+            r"<translation>\s*(.*?)\s*</translation>", content, re.DOTALL
+        )
+        if translation_match and translation_match.group(1).strip():
+            return translation_match.group(1).strip()
+        return None
+
+    def flush_translation_memory(self):
+        if self.translation_memory is not None:
+            self.translation_memory.flush()
+
+    def translate_paragraph(self, text: str) -> str:
+        """Translate a paragraph, routed to a backend if routing is enabled."""
+        if self.router:
+            return self.router.translate(text)
+        return self._translate_with_method(text)
+
+    def _translate_for_route(self, text: str) -> str | None:
+        """Return None if the request failed so the router can fall back."""
+        self.last_request_failed = False
+        translation = self._translate_with_method(text)
+        if self.last_request_failed:
+            return None
+        return translation
+
+    def _translate_with_method(self, text: str) -> str:
+        """Translate a paragraph with the configured translation method."""
+        if self.translation_method == "OpenAI":
+            return self.translate_text_OpenAI(text)
+        elif self.translation_method == "Google":
+            return self.translate_text_google(text)
+        elif self.translation_method == "DeepSeek":
+            return self.translate_text_deepseek(text)
+        elif self.translation_method == "HuggingFace":
+            return self.translate_text_huggingface(text)
+        elif self.translation_method == "LMStudio":
+            return self.translate_text_lmstudio(text)
+        elif self.translation_method == "Azure OpenAI":
+            return self.translate_text_azure_openai(text)
+
+    def translate_and_align(
+        self, original_segments: set, reference: tuple | None = None
+    ) -> tuple[str | None, dict | None]:
+        """Translate the current paragraph and map its runs with a single request.
+
+        reference is the (source, translation) pair of a similar paragraph.
+        Returns the translation and the segment mapping. The mapping is None if
+        the response failed validation, the translation is None if it could not
+        be used at all.
+        """
+        prompt = translate_and_align_prompt(
+            original_segments,
+            self.original_text,
+            self.target_language,
+            self.style_instructions,
+            reference,
+        )
+        response = self.use_translation_OpenAIclient(
+            prompt, 0.3, {"type": "json_object"}
+        )
+        if not response:
+            return None, None
 
-        # Check if it's just special characters
-        if re.match(r"^[^a-zA-Z0-9\s]*$", text):
-            return "not_translatable"
+        content = re.sub(
+            r"<think>.*?</think>", "", response.choices[0].message.content, flags=re.DOTALL
+        )
+        result = self._parse_json_response(content)
+        if not isinstance(result, dict):
+            return None, None
 
-        # Check if it's just numbers  and special character(e.g., 10%)
-        if re.match(r"^[\d\s%.,]+$", text):
-            return "not_translatable"
+        translation = result.get("translation")
+        if not isinstance(translation, str) or not translation.strip():
+            return None, None
+
+        segments = result.get("segments")
+        if not self._is_valid_segment_mapping(segments, original_segments):
+            if self.verbose:
+                print("\tCombined response failed validation, using mapping call")
+            return translation.strip(), None
+        return translation.strip(), segments
+
+    def _is_valid_segment_mapping(self, segments, original_segments: set) -> bool:
+        """Check that every original run is mapped to a string."""
+        if not isinstance(segments, dict):
+            return False
+        return all(
+            isinstance(segments.get(segment), str) for segment in original_segments
+        )
 
-        # If we get here, the text contains some actual content
+    def analyze_text(self, text: str) -> str:
+        if self.pre_filter.classify(text):
+            return "not_translatable"
         return "translatable"
 
     def use_translation_OpenAIclient(
-        self, prompt: str, temperature: float, response_format: str
+        self, prompt: str, temperature: float, response_format: str | dict = "text"
     ) -> str:
+        response = self._coalesce(
+            "translation",
+            self.translation_model,
+            self.translation_method,
+            partial(self._send_translation_request, prompt, temperature, response_format),
+            prompt,
+            temperature,
+            response_format,
+        )
+        if response is None:
+            # A failed completion returns None, also from hedged, shared or
+            # pooled calls on other threads, so the flag is set on this thread
+            self.last_request_failed = True
+        return response
+
+    def _send_translation_request(
+        self, prompt: str, temperature: float, response_format: str | dict = "text"
+    ):
+        primary = partial(
+            self._create_translation_completion,
+            self.translation_client,
+            self.translation_model,
+            self.translation_method,
+            prompt,
+            temperature,
+            response_format,
+        )
+        if not self.hedge_requests:
+            return primary()
+        secondary = None
+        if self.hedge_backend == "alternate" and self.mapping_client is not None:
+            secondary = partial(
+                self._create_translation_completion,
+                self.mapping_client,
+                self.mapping_model,
+                self.mapping_method,
+                prompt,
+                temperature,
+                response_format,
+            )
+        return self.translation_hedger.call(primary, secondary)
+
+    def _coalesce(self, stage: str, model: str, method: str, send, *request):
+        """Share one call between identical requests in flight at the same time.
+
+        Requests of concurrent slides and decks are identical when stage,
+        backend, model, prompt and sampling options match.
+        """
+        if not self.coalesce_requests:
+            return send()
+        key = request_fingerprint(stage, method, model, *request)
+        response, shared = get_single_flight(stage).do(key, send)
+        with self.coalesce_lock:
+            self.coalesce_stats[stage]["requests"] += 1
+            if shared:
+                self.coalesce_stats[stage]["hits"] += 1
+        return response
+
+    def _budget_kwargs(
+        self, stage: str, model: str, method: str, temperature: float
+    ) -> dict:
+        return completion_budget_kwargs(
+            stage,
+            model in self.reasoning_models,
+            method,
+            temperature,
+            self.reasoning_effort,
+            self.reasoning_max_tokens,
+        )
+
+    def _translation_request_body(
+        self,
+        model: str,
+        method: str,
+        prompt: str,
+        temperature: float,
+        response_format: str | dict = "text",
+    ) -> dict:
+        """Return the chat completion arguments of a translation request."""
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        # LMStudio only accepts json_schema, plain JSON mode is left to the prompt
+        if isinstance(response_format, dict) and (
+            method != "LMStudio" or response_format.get("type") == "json_schema"
+        ):
+            body["response_format"] = response_format
+        body.update(self._budget_kwargs("translation", model, method, temperature))
+        if method == "Azure OpenAI" and "temperature" in body:
+            # Sampling options of the Azure settings, reasoning models reject them
+            azure_config = getattr(self, "azure_translation_config", AZURE_DEFAULTS)
+            body["frequency_penalty"] = azure_config["frequency_penalty"]
+            body["presence_penalty"] = azure_config["presence_penalty"]
+            body.setdefault("max_tokens", azure_config["max_tokens_out"])
+        return body
+
+    def _mapping_request_body(
+        self,
+        model: str,
+        method: str,
+        prompt: str,
+        temperature: float,
+        response_format: str | dict = "text",
+    ) -> dict:
+        """Return the chat completion arguments of a mapping request."""
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": MAPPING_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        # Only JSON schemas are forwarded: plain JSON mode was never sent for
+        # mapping requests and LMStudio rejects it
+        if (
+            isinstance(response_format, dict)
+            and response_format.get("type") == "json_schema"
+        ):
+            body["response_format"] = response_format
+        body.update(self._budget_kwargs("mapping", model, method, temperature))
+        return body
+
+    def _create_translation_completion(
+        self,
+        client,
+        model: str,
+        method: str,
+        prompt: str,
+        temperature: float,
+        response_format: str | dict = "text",
+    ):
+        """Send a translation request, returns None if it failed.
+
+        May run on a hedging thread, so failures are only reported through
+        the return value.
+        """
         try:
             # openai.api_base = self.translation_api_url
-            client = self.translation_client
+            start = time.perf_counter()
             response = client.chat.completions.create(
-                model=self.translation_model,
-                messages=[
-                    {"role": "system", "content": "You are a professional translator."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature,
+                **self._translation_request_body(
+                    model, method, prompt, temperature, response_format
+                )
             )
+            self.token_usage.record("translation", model, response)
+            self._record_latency("translation", model, start)
             return response
 
         except Exception as e:
             print(f"Translation error. Something wrong with the OpenAI API: {e}")
 
+    def _record_latency(self, stage: str, model: str, start: float):
+        """Keep the latency of a request for the estimates of later dry runs."""
+        if self.latency_history is None:
+            return
+        if self.exchange_recorder is not None and self.exchange_recorder.mode == "replay":
+            return
+        self.latency_history.record(stage, model, time.perf_counter() - start)
+
     def use_mapping_OpenAIclient(
-        self, prompt: str, temperature: float, response_format: str
+        self, prompt: str, temperature: float, response_format: str | dict = "text"
     ) -> str:
+        return self._coalesce(
+            "mapping",
+            self.mapping_model,
+            self.mapping_method,
+            partial(self._send_mapping_request, prompt, temperature, response_format),
+            prompt,
+            temperature,
+            response_format,
+        )
+
+    def _send_mapping_request(
+        self, prompt: str, temperature: float, response_format: str | dict = "text"
+    ):
+        primary = partial(
+            self._create_mapping_completion,
+            self.mapping_client,
+            self.mapping_model,
+            self.mapping_method,
+            prompt,
+            temperature,
+            response_format,
+        )
+        if not self.hedge_requests:
+            return primary()
+        secondary = None
+        if self.hedge_backend == "alternate" and self.translation_client is not None:
+            secondary = partial(
+                self._create_mapping_completion,
+                self.translation_client,
+                self.translation_model,
+                self.translation_method,
+                prompt,
+                temperature,
+                response_format,
+            )
+        return self.mapping_hedger.call(primary, secondary)
+
+    def _create_mapping_completion(
+        self,
+        client,
+        model: str,
+        method: str,
+        prompt: str,
+        temperature: float,
+        response_format: str | dict = "text",
+    ):
         try:
-            response = self.mapping_client.chat.completions.create(
-                model=self.mapping_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional text alignment expert, editor and translator.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=temperature,
+            start = time.perf_counter()
+            response = client.chat.completions.create(
+                **self._mapping_request_body(
+                    model, method, prompt, temperature, response_format
+                )
             )
+            self.token_usage.record("mapping", model, response)
+            self._record_latency("mapping", model, start)
             return response
 
         except Exception as e:
             print(f"Mapping error. Something wrong with the OpenAI API: {e}")
 
     def translate_text_OpenAI(self, text: str) -> str:
-        # result = self.analyze_text(text)
-        # if result == "not_translatable":
-        #     return text  # Return original text without translation
         """Translate text while preserving approximate length and formatting."""
         chosen_prompt = 1
         prompt_0 = translation_prompt_openai_0(
@@ -245,7 +883,7 @@ class SlideTranslator:
 
             if chosen_prompt == 1:
                 content = response.choices[0].message.content.strip()
-                if self.reasoning_model:
+                if self.translation_reasoning_model:
                     # First remove any <think>...</think> content, then search for translation
                     content_without_think = re.sub(
                         r"<think>.*?</think>", "", content, flags=re.DOTALL
@@ -303,15 +941,22 @@ class SlideTranslator:
 
         async def translate_text():
             async with Translator() as translator:
-                self.result = await translator.translate(text, dest=google_lang_code)
-
-        asyncio.run(translate_text())
-        return self.result.text
+                return await translator.translate(text, dest=google_lang_code)
+
+        def send():
+            return asyncio.run(translate_text()).text
+
+        if self.exchange_recorder is None:
+            return send()
+        return self.exchange_recorder.exchange(
+            "google",
+            {"text": text, "dest": google_lang_code},
+            send,
+            lambda translation: translation,
+            lambda translation: translation,
+        )
 
     def translate_text_deepseek(self, text: str) -> str:
-        # result = self.analyze_text(text)
-        # if result == "not_translatable":
-        #     return text  # Return original text without translation
         """Translate text while preserving approximate length and formatting."""
         prompt_0 = translation_prompt_deepseek_0(
             text, self.target_language, self.style_instructions
@@ -361,7 +1006,7 @@ class SlideTranslator:
         )
 
         payload = {"inputs": prompt_0}
-        response = requests.post(
+        response = self.http_session.post(
             self.translation_api_url, headers=self.translation_headers, json=payload
         )
 
@@ -420,7 +1065,7 @@ class SlideTranslator:
                 "temperature": 1.5,
             }
 
-            response = requests.post(
+            response = self.http_session.post(
                 self.translation_api_url,
                 headers=self.translation_headers,
                 json=payload,
@@ -466,21 +1111,13 @@ class SlideTranslator:
         """Translate text using Azure OpenAI"""
         try:
             # Get Azure config from settings or use defaults
-            azure_config = getattr(self, "azure_translation_config", AZURE_CONFIG)
-
-            model_cfg = {
-                "engine": self.translation_model,
-                "api_version": "2024-02-15-preview",
-                "temperature": azure_config["temperature"],
-                "frequency_penalty": azure_config["frequency_penalty"],
-                "presence_penalty": azure_config["presence_penalty"],
-                "max_tokens_out": azure_config["max_tokens_out"],
-            }
+            azure_config = getattr(self, "azure_translation_config", AZURE_DEFAULTS)
 
-            if not hasattr(self, "azure_client"):
-                self.azure_client = AzureOpenAI(
+            # The configured client may be a pool of several deployments
+            if self.translation_client is None:
+                self.translation_client = AzureOpenAI(
                     api_key=os.getenv("AZURE_OPENAI_ENDPOINT_KEY"),
-                    api_version=model_cfg["api_version"],
+                    api_version="2024-02-15-preview",
                     azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
                 )
 
@@ -488,13 +1125,9 @@ class SlideTranslator:
                 text, self.target_language, self.style_instructions
             )
 
-            response = self.azure_client.chat.completions.create(
-                model=model_cfg["engine"],
-                messages=[{"role": "user", "content": prompt}],
-                temperature=model_cfg["temperature"],
-                frequency_penalty=model_cfg["frequency_penalty"],
-                presence_penalty=model_cfg["presence_penalty"],
-                max_tokens=model_cfg["max_tokens_out"],
+            # Hedged, coalesced, recorded and counted like the other backends
+            response = self.use_translation_OpenAIclient(
+                prompt, azure_config["temperature"]
             )
 
             if not response:
@@ -526,12 +1159,25 @@ class SlideTranslator:
             return {}
 
 
-    def _create_mapping_map(
-        self, original_text_elements: set, translated_text: str, translation_map: dict
+    def _request_segment_mapping(
+        self, original_text_elements: set, translated_text: str
     ) -> dict:
-        """Create a mapping between original text and their translations."""
+        """Ask the mapping model which part of the translation belongs to each run.
+
+        Returns the parsed mapping, or an empty dict if the request or parsing failed.
+        """
+        segment_mappings = {}
         try:
-            if self.mapping_method == "OpenAI" or self.mapping_method == "Azure OpenAI":
+            if self.structured_outputs and self.mapping_method in (
+                "OpenAI",
+                "Azure OpenAI",
+                "LMStudio",
+            ):
+                segment_mappings = self._request_structured_mapping(
+                    original_text_elements, translated_text
+                )
+
+            elif self.mapping_method == "OpenAI" or self.mapping_method == "Azure OpenAI":
                 prompt = mapping_prompt_openai(
                     original_text_elements, self.original_text, translated_text
                 )
@@ -563,7 +1209,7 @@ class SlideTranslator:
                     original_text_elements, self.original_text, translated_text
                 )
                 payload = {"inputs": formatted_prompt}
-                response = requests.post(
+                response = self.http_session.post(
                     self.HUGGINGFACE_API_URL,
                     headers=self.huggingface_headers,
                     json=payload,
@@ -584,7 +1230,7 @@ class SlideTranslator:
                     print(f"Error parsing Hugging Face response: {e}")
                     print(f"Raw response: {response.text}")
                     # Return empty mapping as fallback
-                    return {}
+                    segment_mappings = {}
 
             elif self.mapping_method == "LMStudio":
                 # Use existing LMStudio implementation
@@ -621,7 +1267,7 @@ class SlideTranslator:
                         "temperature": 0.3,
                     }
 
-                    response = requests.post(
+                    response = self.http_session.post(
                         self.mapping_api_url,
                         headers=self.mapping_headers,
                         json=payload,
@@ -661,20 +1307,99 @@ class SlideTranslator:
                         f"Raw response: {getattr(response, 'text', 'No response attribute') if response else 'No response'}"
                     )
                     # Return empty mapping as fallback
-                    return {}
-
-            for orig_text, trans_text in segment_mappings.items():
-                if orig_text in translation_map:
-                    translation_map[orig_text] = trans_text
+                    segment_mappings = {}
 
         except Exception as e:
             print(f"\tError matching segments for translation map: {e}")
             print("Full traceback:")
             print(traceback.format_exc())
+            segment_mappings = {}
+        if not isinstance(segment_mappings, dict):
+            return {}
+        return segment_mappings
+
+    def _request_structured_mapping(
+        self, original_text_elements: set, translated_text: str
+    ) -> dict:
+        """Request a schema-constrained mapping and parse it strictly."""
+        prompt = mapping_prompt_structured(
+            original_text_elements, self.original_text, translated_text
+        )
+        response = self.use_mapping_OpenAIclient(
+            prompt, 0.3, segment_mapping_schema(original_text_elements)
+        )
+        if not response:
+            return {}
+        content = re.sub(
+            r"<think>.*?</think>",
+            "",
+            response.choices[0].message.content,
+            flags=re.DOTALL,
+        )
+        try:
+            segments = json.loads(content)["segments"]
+            return {
+                item["original"]: item["translation"]
+                for item in segments
+                if isinstance(item.get("original"), str)
+                and isinstance(item.get("translation"), str)
+            }
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            print(f"\tError parsing structured mapping response: {e}")
+            return {}
+
+    def _create_mapping_map(
+        self, original_text_elements: set, translated_text: str, translation_map: dict
+    ) -> dict:
+        """Create a mapping between original text and their translations.
+
+        Segments missing from the response are requested again on their own.
+        Segments that still fail keep their original text.
+        """
+        segments = set(original_text_elements)
+        segment_mappings = self._request_segment_mapping(segments, translated_text)
+        missing = self._unmapped_segments(segment_mappings, segments)
+
+        stats = self.mapping_stats[self.mapping_model]
+        stats["responses"] += 1
+        if missing:
+            stats["parse_failures"] += 1
+
+        for _ in range(self.mapping_retries):
+            if not missing:
+                break
+            stats["retried_segments"] += len(missing)
+            retry_mappings = self._request_segment_mapping(missing, translated_text)
+            for segment in missing:
+                if isinstance(retry_mappings.get(segment), str):
+                    segment_mappings[segment] = retry_mappings[segment]
+            missing = self._unmapped_segments(segment_mappings, segments)
+
+        if missing:
+            stats["unresolved_segments"] += len(missing)
+            print(
+                f"\tCould not map {len(missing)} segments, keeping them as is: {missing}"
+            )
+            for segment in missing:
+                segment_mappings[segment] = segment
+
+        for orig_text, trans_text in segment_mappings.items():
+            if orig_text in translation_map and isinstance(trans_text, str):
+                translation_map[orig_text] = trans_text
+
         if self.verbose:
             print(f"\tTranslation map: {translation_map}")
         return translation_map
 
+    @staticmethod
+    def _unmapped_segments(segment_mappings: dict, segments: set) -> set:
+        return {
+            segment
+            for segment in segments
+            if not isinstance(segment_mappings.get(segment), str)
+        }
+
+
     def translate_paragraph_with_markers(self, p_element: ET.Element):
         """Translate a paragraph using the marker-based strategy."""
         marked_text, run_properties_map = MarkerUtils.paragraph_to_marked_text(
@@ -683,7 +1408,14 @@ class SlideTranslator:
         
         if not marked_text.strip():
             return
-            
+
+        plain_text = re.sub(r"</?f\d+>", "", marked_text)
+        skip_category = self.pre_filter.classify(plain_text)
+        if skip_category:
+            if self.verbose:
+                print(f"\tSkipped ({skip_category}): {plain_text}")
+            return
+
         prompt = translation_prompt_with_markers(
             marked_text, self.target_language, self.style_instructions
         )
@@ -762,7 +1494,6 @@ class SlideTranslator:
     def process_slides(self, progress_callback=None, stop_check_callback=None):
         """Main function to process all slides in the presentation."""
         slide_files = self.find_slide_files()
-        selected_slides = ["slide2.xml", "slide3.xml", "slide4.xml"]
         total_slides = len(slide_files)
 
         for slide_file in sorted(slide_files):
@@ -772,7 +1503,7 @@ class SlideTranslator:
                 return False
 
             if self.reduce_slides:
-                if os.path.basename(slide_file) not in selected_slides:
+                if os.path.basename(slide_file) not in REDUCED_SLIDES:
                     continue
 
             current_slide = slide_files.index(slide_file) + 1
@@ -791,6 +1522,9 @@ class SlideTranslator:
             tree = ET.parse(slide_file)
             root = tree.getroot()
 
+            if not self.translate_slide(root, stop_check_callback):
+                return False
+
             # Extract namespaces from the root element
             namespaces = {}
             for key, value in root.attrib.items():
@@ -798,83 +1532,6 @@ class SlideTranslator:
                     prefix = key.split(":")[1]
                     namespaces[prefix] = value
 
-            if self.translation_strategy == "marker-based":
-                if self.verbose:
-                    print(f"\tUsing marker-based translation strategy")
-                for p_element in root.findall(".//a:p", self.namespaces):
-                    # Check for stop request
-                    if stop_check_callback and stop_check_callback():
-                        print("\nProcessing stopped by user")
-                        return False
-                    self.translate_paragraph_with_markers(p_element)
-            else:
-                if self.verbose:
-                    print(f"\tUsing classic translation strategy")
-                # Extract and create translation mapping
-                text_elements, original_text_elements = self.extract_text_runs(slide_file)
-                translation_map = self.create_translation_map(
-                    text_elements, original_text_elements
-                )
-
-                # Update text while preserving XML structure and whitespace
-                for original_text, translation in translation_map.items():
-                    # Check for stop request during translation updates
-                    if stop_check_callback and stop_check_callback():
-                        print("\nProcessing stopped by user")
-                        return False
-
-                    if translation == None:  # Skip empty translations
-                        continue
-                    # Update Text
-                    for element in root.findall(".//a:t", self.namespaces):
-                        if element.text and element.text.strip() == original_text:
-                            if translation.strip():  # If we have a valid translation
-                                # Preserve any leading/trailing whitespace from the original
-                                leading_space = ""
-                                trailing_space = ""
-                                if element.text.startswith(" "):
-                                    leading_space = " "
-                                if element.text.endswith(" "):
-                                    trailing_space = " "
-                                # Update text
-                                element.text = (
-                                    leading_space + translation.strip() + trailing_space
-                                )
-
-                            else:
-                                # Find the parent run ('a:r') element and remove it
-                                parent_run = element.getparent()
-                                if parent_run is not None:
-                                    parent_paragraph = parent_run.getparent()
-                                    if parent_paragraph is not None:
-                                        parent_paragraph.remove(parent_run)
-
-                if self.update_language:
-                    # Check for stop request during language updates
-                    if stop_check_callback and stop_check_callback():
-                        print("\nProcessing stopped by user")
-                        return False
-
-                    # Detect and update language
-                    for run in root.findall(".//a:r", self.namespaces):
-                        text_elem = run.find("a:t", self.namespaces)
-                        if text_elem is not None and text_elem.text is not None:
-                            try:
-                                detected_lang = self.detect_pptx_language(
-                                    text_elem.text.strip()
-                                )
-                                # Find and update the language attribute in the corresponding rPr element
-                                # parent_run = text_elem.getparent()
-                                rPr = run.find("a:rPr", self.namespaces)
-                                if rPr is not None:
-                                    rPr.set("lang", detected_lang)
-                                    if self.verbose:
-                                        print(
-                                            f"\tUpdated language for '{translation.strip()}' to {detected_lang}"
-                                        )
-                            except Exception:
-                                continue
-
             # Register extracted namespaces
             for prefix, uri in namespaces.items():
                 ET.register_namespace(prefix, uri)
@@ -887,4 +1544,413 @@ class SlideTranslator:
             with open(slide_file, "wb") as f:
                 tree.write(f, encoding="UTF-8", xml_declaration=True)
 
+        self.finish_run()
+        return True
+
+    def finish_run(self):
+        """Print the run summary and persist the translation memory and latencies."""
+        self.report_pre_filter()
+        self.report_hedging()
+        self.report_coalescing()
+        self.report_fuzzy_matches()
+        self.report_routing()
+        self.report_endpoints()
+        self.report_mapping_stats()
+        self.token_usage.report()
+        self.report_recording()
+        self.flush_translation_memory()
+        if self.latency_history is not None:
+            self.latency_history.flush()
+
+    def report_mapping_stats(self):
+        for model, stats in self.mapping_stats.items():
+            if not stats["parse_failures"]:
+                continue
+            rate = stats["parse_failures"] / stats["responses"] * 100
+            print(
+                f"Mapping parse failures ({model}): {stats['parse_failures']} of "
+                f"{stats['responses']} responses ({rate:.1f}%), "
+                f"{stats['retried_segments']} segments retried, "
+                f"{stats['unresolved_segments']} kept untranslated"
+            )
+
+    def report_endpoints(self):
+        for name, client in (
+            ("translation", self.translation_client),
+            ("mapping", self.mapping_client),
+        ):
+            if isinstance(client, RecordingClient):
+                client = client.client
+            if isinstance(client, EndpointPool):
+                for endpoint, stats in client.summary().items():
+                    print(
+                        f"{name.capitalize()} endpoint {endpoint}: "
+                        f"{stats['requests']} requests, {stats['failures']} failures"
+                    )
+
+    def report_recording(self):
+        if self.exchange_recorder is None:
+            return
+        stats = self.exchange_recorder.summary()
+        print(
+            f"Recorder ({stats['mode']}): {stats['recorded']} exchanges recorded, "
+            f"{stats['replayed']} replayed, {stats['misses']} not found"
+        )
+
+    def report_routing(self):
+        if not self.router:
+            return
+        for name, stats in self.router.summary().items():
+            print(
+                f"Route '{name}' ({stats['backend']}): {stats['requests']} requests, "
+                f"{stats['errors']} errors, avg {stats['avg_latency_s']}s, "
+                f"p95 {stats['p95_latency_s']}s"
+            )
+        if self.router.fallbacks:
+            print(f"Route fallbacks: {self.router.fallbacks}")
+
+    def report_hedging(self):
+        if not self.hedge_requests:
+            return
+        for name, hedger in (
+            ("translation", self.translation_hedger),
+            ("mapping", self.mapping_hedger),
+        ):
+            current = hedger.summary()
+            start = self.hedge_start[name]
+            calls = current["calls"] - start["calls"]
+            if calls:
+                print(
+                    f"Hedged {name} requests: "
+                    f"{current['hedged'] - start['hedged']} of {calls} "
+                    f"({current['hedges_won'] - start['hedges_won']} won by the duplicate)"
+                )
+
+    def report_fuzzy_matches(self):
+        if self.fuzzy_stats:
+            print(
+                f"Fuzzy memory matches: {self.fuzzy_stats['reused']} reused, "
+                f"{self.fuzzy_stats['reused_translation']} reused with a new run "
+                f"mapping, {self.fuzzy_stats['referenced']} translated with a reference"
+            )
+
+    def report_coalescing(self):
+        for stage, stats in self.coalesce_stats.items():
+            if stats["hits"]:
+                print(
+                    f"Coalesced {stage} requests: {stats['hits']} of "
+                    f"{stats['requests']} shared an identical call in flight"
+                )
+
+    def report_pre_filter(self):
+        skipped = self.pre_filter.summary()
+        if skipped:
+            print(
+                f"Pre-filter skipped {sum(skipped.values())} texts without API call: {skipped}"
+            )
+
+    def translate_slide(self, root: ET.Element, stop_check_callback=None) -> bool:
+        """Translate a parsed slide in place. Returns False if stopped by the user."""
+        if self.translation_strategy == "marker-based":
+            if self.verbose:
+                print(f"\tUsing marker-based translation strategy")
+            for p_element in root.findall(".//a:p", self.namespaces):
+                # Check for stop request
+                if stop_check_callback and stop_check_callback():
+                    print("\nProcessing stopped by user")
+                    return False
+                self.translate_paragraph_with_markers(p_element)
+            return True
+
+        if self.verbose:
+            print(f"\tUsing classic translation strategy")
+        # Extract and create translation mapping from the already parsed slide
+        segments, original_text_elements = self.extract_text_runs(root)
+        translation_map = self.create_translation_map(
+            segments, original_text_elements, stop_check_callback
+        )
+        return self.apply_translation_map(
+            segments, translation_map, stop_check_callback
+        )
+
+    def apply_translation_map(
+        self, segments: list[TextSegment], translation_map: dict, stop_check_callback=None
+    ) -> bool:
+        """Write the translated runs back into their nodes.
+
+        Paragraphs use their own translations if they have been processed and
+        the slide-wide mapping otherwise.
+        """
+        for segment in segments:
+            # Check for stop request during translation updates
+            if stop_check_callback and stop_check_callback():
+                print("\nProcessing stopped by user")
+                return False
+            if segment.translations is not None:
+                segment.apply(segment.translations)
+            else:
+                segment.apply(translation_map)
+
+        if self.update_language:
+            # Check for stop request during language updates
+            if stop_check_callback and stop_check_callback():
+                print("\nProcessing stopped by user")
+                return False
+
+            # Detect and update language of the runs that are still in place
+            for text_elem in (node for segment in segments for node in segment.nodes):
+                run = text_elem.getparent()
+                if run.getparent() is None:
+                    continue
+                if text_elem.text is not None:
+                    try:
+                        detected_lang = self.detect_pptx_language(
+                            text_elem.text.strip()
+                        )
+                        # Find and update the language attribute in the corresponding rPr element
+                        rPr = run.find("a:rPr", self.namespaces)
+                        if rPr is not None:
+                            rPr.set("lang", detected_lang)
+                            if self.verbose:
+                                print(
+                                    f"\tUpdated language for '{text_elem.text.strip()}' to {detected_lang}"
+                                )
+                    except Exception:
+                        continue
         return True
+
+    def estimate_slides(self, document: PresentationDocument) -> RunEstimate:
+        """Estimate the requests, tokens, cost and time of translating a deck.
+
+        No request is sent: paragraphs go through the pre-filter, translation
+        memory and fuzzy matching as in create_translation_map and the prompts
+        of the requests they would need are counted. Paragraphs repeated in
+        the deck are memory hits when the translation memory is enabled.
+        Requests are spread over estimate_concurrency().
+        """
+        estimate = RunEstimate(
+            self.model_pricing, self.latency_history, self.estimate_concurrency()
+        )
+        seen_keys = set()
+        for slide_name in document.slide_names():
+            if self.reduce_slides:
+                if os.path.basename(slide_name) not in REDUCED_SLIDES:
+                    continue
+            self.estimate_slide(document.get_root(slide_name), estimate, seen_keys)
+        return estimate
+
+    def estimate_concurrency(self) -> int:
+        """Return the number of translation requests a run has in flight.
+
+        Up to slide_workers slides are translated at once, limited by the
+        concurrency of the default route and the endpoints of the pool.
+        """
+        concurrency = max(1, self.slide_workers)
+        if self.router:
+            concurrency = min(concurrency, self.router.routes[-1].max_concurrency)
+        client = self.translation_client
+        if isinstance(client, RecordingClient):
+            client = client.client
+        if isinstance(client, EndpointPool):
+            concurrency = min(concurrency, len(client.endpoints))
+        return concurrency
+
+    def estimate_slide(self, root: ET.Element, estimate: RunEstimate, seen_keys: set):
+        """Count the requests translating a parsed slide would send.
+
+        Translations are projected to be as long as their source and every
+        mapping to succeed without retries.
+        """
+        if self.translation_strategy == "marker-based":
+            for p_element in root.findall(".//a:p", self.namespaces):
+                marked_text, _ = MarkerUtils.paragraph_to_marked_text(
+                    p_element, self.namespaces
+                )
+                if not marked_text.strip():
+                    continue
+                if self.pre_filter.category(re.sub(r"</?f\d+>", "", marked_text)):
+                    estimate.count_paragraph("pre_filter")
+                    continue
+                estimate.count_paragraph("sent")
+                self._estimate_translation_request(
+                    estimate,
+                    translation_prompt_with_markers(
+                        marked_text, self.target_language, self.style_instructions
+                    ),
+                    f"<translation>{marked_text}</translation>",
+                )
+            return
+
+        segments, _ = self.extract_text_runs(root)
+        for segment in segments:
+            self.original_text = segment.text
+            local_candidates = set(segment.run_texts)
+            if not local_candidates:
+                continue
+            if self.pre_filter.category(self.original_text):
+                estimate.count_paragraph("pre_filter")
+                continue
+
+            memory_key = None
+            if self.translation_memory is not None:
+                memory_key = self._memory_key(local_candidates)
+                entry = self.translation_memory.get_entry(memory_key)
+                if memory_key in seen_keys or (
+                    entry and isinstance(entry.get("segments"), dict)
+                ):
+                    estimate.count_paragraph("memory")
+                    continue
+                seen_keys.add(memory_key)
+
+            translated_text = None
+            reference = None
+            match = self._find_similar_paragraph() if memory_key else None
+            if match:
+                similarity, entry = match
+                if self._can_reuse(similarity, entry["source"]):
+                    if self._is_valid_segment_mapping(
+                        entry.get("segments"), local_candidates
+                    ):
+                        estimate.count_paragraph("fuzzy_reused")
+                        continue
+                    translated_text = entry["translation"]
+                else:
+                    reference = (entry["source"], entry["translation"])
+
+            estimate.count_paragraph("sent")
+            backend = self._backend_for(self.original_text)
+            if translated_text is None and self._use_single_call(self.original_text):
+                backend._estimate_translation_request(
+                    estimate,
+                    translate_and_align_prompt(
+                        local_candidates,
+                        self.original_text,
+                        self.target_language,
+                        self.style_instructions,
+                        reference,
+                    ),
+                    json.dumps(
+                        {
+                            "translation": self.original_text,
+                            "segments": {text: text for text in segment.run_texts},
+                        },
+                        ensure_ascii=False,
+                    ),
+                )
+                continue
+            if translated_text is None and reference and self._use_reference(
+                self.original_text
+            ):
+                backend._estimate_translation_request(
+                    estimate,
+                    translation_prompt_with_reference(
+                        self.original_text,
+                        self.target_language,
+                        self.style_instructions,
+                        *reference,
+                    ),
+                    f"<translation>{self.original_text}</translation>",
+                )
+            elif translated_text is None:
+                backend._estimate_paragraph(estimate, self.original_text)
+            backend._estimate_mapping(
+                estimate, local_candidates, translated_text or self.original_text
+            )
+
+    def _estimate_translation_request(
+        self, estimate: RunEstimate, prompt: str, completion: str
+    ):
+        estimate.add_request(
+            "translation",
+            self.translation_method,
+            self.translation_model,
+            [
+                {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            completion,
+        )
+
+    def _estimate_paragraph(self, estimate: RunEstimate, text: str):
+        """Count the request of translate_paragraph with the prompt of its backend."""
+        backend = self
+        if self.router:
+            backend = self.route_backends[self.router.select(text).name]
+        method = backend.translation_method
+        model_type = getattr(backend, "translation_model_type", "unknown")
+        if method == "OpenAI":
+            prompt = translation_prompt_openai_0(
+                text, self.target_language, self.style_instructions
+            )
+        elif method == "Azure OpenAI":
+            prompt = translation_prompt_openai_1(
+                text, self.target_language, self.style_instructions
+            )
+        elif method == "DeepSeek" or (method == "LMStudio" and model_type == "deepseek"):
+            prompt = translation_prompt_deepseek_0(
+                text, self.target_language, self.style_instructions
+            )
+        elif method == "HuggingFace" or (method == "LMStudio" and model_type == "llama"):
+            prompt = translation_prompt_llama2_0(
+                text, self.target_language, self.style_instructions
+            )
+        elif method == "Google":
+            prompt = text
+        else:
+            # Unknown LMStudio models are not sent
+            return
+
+        messages = [{"role": "user", "content": prompt}]
+        if method not in ("Google", "Azure OpenAI", "HuggingFace"):
+            messages.insert(0, {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT})
+        estimate.add_request(
+            "translation",
+            method,
+            backend.translation_model,
+            messages,
+            f"<translation>{text}</translation>",
+        )
+
+    def _estimate_mapping(
+        self, estimate: RunEstimate, original_segments: set, translated_text: str
+    ):
+        """Count the request of _request_segment_mapping with the prompt it would use."""
+        completion = json.dumps(
+            {text: text for text in original_segments}, ensure_ascii=False
+        )
+        prompt_args = (original_segments, self.original_text, translated_text)
+        model_type = getattr(self, "mapping_model_type", "unknown")
+        if self.structured_outputs and self.mapping_method in (
+            "OpenAI",
+            "Azure OpenAI",
+            "LMStudio",
+        ):
+            prompt = mapping_prompt_structured(*prompt_args)
+            completion = json.dumps(
+                {
+                    "segments": [
+                        {"original": text, "translation": text}
+                        for text in original_segments
+                    ]
+                },
+                ensure_ascii=False,
+            )
+        elif self.mapping_method in ("OpenAI", "Azure OpenAI"):
+            prompt = mapping_prompt_openai(*prompt_args)
+        elif self.mapping_method == "DeepSeek" or (
+            self.mapping_method == "LMStudio" and model_type == "deepseek"
+        ):
+            prompt = mapping_prompt_deepseek(*prompt_args)
+        elif self.mapping_method == "HuggingFace" or (
+            self.mapping_method == "LMStudio" and model_type == "llama"
+        ):
+            prompt = mapping_prompt_llama2(*prompt_args)
+        else:
+            return
+
+        messages = [{"role": "user", "content": prompt}]
+        if self.mapping_method != "HuggingFace":
+            messages.insert(0, {"role": "system", "content": MAPPING_SYSTEM_PROMPT})
+        estimate.add_request(
+            "mapping", self.mapping_method, self.mapping_model, messages, completion
+        )
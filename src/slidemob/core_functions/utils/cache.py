@@ -1,13 +1,22 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
+import hashlib
 import json
 import os
+import threading
+
+from .fuzzy_index import FuzzyIndex
 
 
 class TranslationCache:
-    def __init__(self, cache_file: str, ttl_days: int = 7):
+    def __init__(self, cache_file: str, ttl_days: int = 7, autosave: bool = True):
         self.cache_file = cache_file
         self.ttl = timedelta(days=ttl_days)
+        self.autosave = autosave
+        self.lock = threading.Lock()
+        self.dirty = False
         self.cache = self._load_cache()
+        self.fuzzy_indexes: dict[tuple[str, float], FuzzyIndex] = {}
 
     def _load_cache(self) -> dict:
         if os.path.exists(self.cache_file):
@@ -19,19 +28,106 @@ class TranslationCache:
         return {}
 
     def _save_cache(self):
-        with open(self.cache_file, "w") as f:
+        # Write to a temporary file first so a crash never leaves a broken cache
+        temp_file = f"{self.cache_file}.tmp"
+        cache_dir = os.path.dirname(self.cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(temp_file, "w") as f:
             json.dump(self.cache, f)
+        os.replace(temp_file, self.cache_file)
+        self.dirty = False
 
     def get(self, key: str) -> str | None:
-        if key in self.cache:
-            timestamp = datetime.fromisoformat(self.cache[key]["timestamp"])
+        entry = self.get_entry(key)
+        return entry["translation"] if entry else None
+
+    def get_entry(self, key: str) -> dict | None:
+        """Return the whole cache entry including the segment mapping."""
+        entry = self.cache.get(key)
+        if entry:
+            timestamp = datetime.fromisoformat(entry["timestamp"])
             if datetime.now() - timestamp < self.ttl:
-                return self.cache[key]["translation"]
+                return entry
         return None
 
-    def set(self, key: str, translation: str):
-        self.cache[key] = {
+    def set(
+        self,
+        key: str,
+        translation: str,
+        segments: dict | None = None,
+        source: str | None = None,
+        context: str | None = None,
+    ):
+        """Store a translation.
+
+        Entries with their source text and a context key (e.g. target language
+        and style) can be found again by find_similar.
+        """
+        entry = {
             "translation": translation,
             "timestamp": datetime.now().isoformat(),
         }
-        self._save_cache()
+        if segments is not None:
+            entry["segments"] = segments
+        if source is not None and context is not None:
+            entry["source"] = source
+            entry["context"] = context
+        with self.lock:
+            self.cache[key] = entry
+            self.dirty = True
+            if self.autosave:
+                self._save_cache()
+            if "source" in entry:
+                for (index_context, _), index in self.fuzzy_indexes.items():
+                    if index_context == context:
+                        index.add(source, key)
+
+    def find_similar(
+        self, context: str, text: str, min_similarity: float
+    ) -> tuple[float, dict] | None:
+        """Return the similarity and entry of the most similar source text.
+
+        The character n-gram index of a context is built on first use and
+        kept up to date by set().
+        """
+        with self.lock:
+            index = self.fuzzy_indexes.get((context, min_similarity))
+            if index is None:
+                index = FuzzyIndex.build(
+                    (
+                        (entry["source"], key)
+                        for key, entry in self.cache.items()
+                        if entry.get("context") == context and "source" in entry
+                    ),
+                    min_similarity,
+                )
+                self.fuzzy_indexes[(context, min_similarity)] = index
+        match = index.best_match(text, min_similarity)
+        if match is None:
+            return None
+        similarity, _, key = match
+        entry = self.get_entry(key)
+        return (similarity, entry) if entry else None
+
+    def flush(self):
+        """Write pending entries to disk in one go."""
+        with self.lock:
+            if self.dirty:
+                self._save_cache()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Fingerprint the parts that determine a translation."""
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_translation_memory(cache_file: str, ttl_days: int = 365) -> TranslationCache:
+    """Load a translation memory once per process and keep it resident.
+
+    Entries are written in batches with flush() instead of after every set.
+    """
+    return TranslationCache(cache_file, ttl_days=ttl_days, autosave=False)
@@ -0,0 +1,154 @@
+from array import array
+from collections import Counter
+import math
+import re
+import threading
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case and whitespace insensitive form of a segment."""
+    return WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def char_ngrams(text: str, n: int = 3) -> set[str]:
+    """Character n-grams of a normalized text, padded so short words count."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+def min_overlap(size: int, threshold: float) -> int:
+    """N-grams a set shares with any set it has a Jaccard index >= threshold with."""
+    return max(1, math.ceil(threshold * size - 1e-9))
+
+
+def prefix_length(size: int, threshold: float, shared: int = 1) -> int:
+    """Number of rarest n-grams in which two similar sets share at least shared n-grams.
+
+    Sets with a Jaccard index >= threshold have at least min_overlap n-grams in
+    common, so the first shared of them are among the size - min_overlap +
+    shared rarest n-grams of each set.
+    """
+    return min(size, size - min_overlap(size, threshold) + shared)
+
+
+class FuzzyIndex:
+    """Index of segments for character n-gram similarity lookups.
+
+    Similarity is the Jaccard index of the n-gram sets. N-grams are ordered
+    from rare to common by their frequency when the index is built, and every
+    segment is only indexed under its rarest n-grams, among which any match
+    above min_similarity shares at least PREFIX_HITS (prefix filtering).
+    Lookups count the hits of the rarest n-grams of the query and only verify
+    the few segments with enough hits, so they stay fast for hundreds of
+    thousands of segments.
+    """
+
+    PREFIX_HITS = 5
+
+    def __init__(self, min_similarity: float = 0.75, n: int = 3, frequencies=None):
+        self.min_similarity = min_similarity
+        self.n = n
+        # Frozen n-gram order, n-grams seen later count as the rarest
+        self.frequencies = frequencies or {}
+        self.lock = threading.Lock()
+        self.texts: list[str] = []
+        self.values: list = []
+        self.sizes = array("I")
+        self.ids: dict[str, int] = {}
+        self.postings: dict[str, array] = {}
+
+    @classmethod
+    def build(
+        cls, items, min_similarity: float = 0.75, n: int = 3
+    ) -> "FuzzyIndex":
+        """Index (text, value) pairs, ordering n-grams by their frequency in them."""
+        items = [(normalize_text(text), value) for text, value in items]
+        frequencies = Counter()
+        for text, _ in dict(items).items():
+            frequencies.update(char_ngrams(text, n))
+        index = cls(min_similarity, n, frequencies)
+        for text, value in items:
+            index.add(text, value)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _rarest(self, grams: set[str], count: int) -> list[str]:
+        frequencies = self.frequencies
+        return sorted(grams, key=lambda gram: (frequencies.get(gram, 0), gram))[:count]
+
+    def add(self, text: str, value):
+        """Index a segment, replacing the value of an already indexed text."""
+        normalized = normalize_text(text)
+        if not normalized:
+            return
+        with self.lock:
+            segment_id = self.ids.get(normalized)
+            if segment_id is not None:
+                self.values[segment_id] = value
+                return
+            segment_id = len(self.texts)
+            grams = char_ngrams(normalized, self.n)
+            self.ids[normalized] = segment_id
+            self.texts.append(normalized)
+            self.values.append(value)
+            self.sizes.append(len(grams))
+            for gram in self._rarest(
+                grams,
+                prefix_length(len(grams), self.min_similarity, self.PREFIX_HITS),
+            ):
+                postings = self.postings.get(gram)
+                if postings is None:
+                    postings = self.postings[gram] = array("I")
+                postings.append(segment_id)
+
+    def best_match(
+        self, text: str, threshold: float | None = None
+    ) -> tuple[float, str, object] | None:
+        """Return (similarity, indexed text, value) of the most similar segment.
+
+        Returns None if no segment reaches the threshold, which cannot be
+        lower than min_similarity.
+        """
+        threshold = max(threshold or 0, self.min_similarity)
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+        grams = char_ngrams(normalized, self.n)
+        size = len(grams)
+        with self.lock:
+            segment_id = self.ids.get(normalized)
+            if segment_id is not None:
+                return 1.0, self.texts[segment_id], self.values[segment_id]
+
+            hits = Counter()
+            for gram in self._rarest(
+                grams, prefix_length(size, threshold, self.PREFIX_HITS)
+            ):
+                postings = self.postings.get(gram)
+                if postings:
+                    hits.update(postings)
+            required = min(self.PREFIX_HITS, min_overlap(size, threshold))
+            candidates = [
+                candidate for candidate, count in hits.items() if count >= required
+            ]
+
+            best = None
+            min_size = threshold * size
+            max_size = size / threshold
+            for candidate in candidates:
+                candidate_size = self.sizes[candidate]
+                if candidate_size < min_size or candidate_size > max_size:
+                    continue
+                shared = len(grams & char_ngrams(self.texts[candidate], self.n))
+                similarity = shared / (size + candidate_size - shared)
+                if similarity >= threshold and (best is None or similarity > best[0]):
+                    best = (similarity, candidate)
+            if best is None:
+                return None
+            return best[0], self.texts[best[1]], self.values[best[1]]
@@ -1,6 +1,8 @@
 import json
 import logging
 import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import traceback
@@ -8,9 +10,7 @@ import traceback
 from ttkthemes import ThemedStyle
 
 from ..core_functions.base_class import PowerpointPipeline
-from ..pipelines.polisher_pipeline import PowerPointPolisher
-from ..pipelines.run_merger_pipeline import PowerPointRunMerger
-from ..pipelines.translator_pipeline import PowerPointTranslator
+from ..pipelines.presentation_pipeline import PresentationPipeline
 from ..utils.config import create_config
 from ..utils.errorhandler import setup_error_logging
 from ..utils.config import create_config
@@ -157,6 +157,14 @@ class SlideMobGUI(PowerpointPipeline):
         self.processing = False
         self.stop_requested = False
 
+        # Processing runs on a worker thread, results come back through a queue
+        # that is polled on the Tk thread
+        self.job_queue = queue.Queue()
+        self.ui_queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.worker = None
+        self.poll_interval_ms = 100
+
         self.create_widgets()
 
     def _update_pptx_path(self, *args):
@@ -421,128 +429,157 @@ class SlideMobGUI(PowerpointPipeline):
     def update_translation_progress(self, slide_name, current, total):
         """Update the status text with current translation progress"""
         self.status_var.set(f"Translating slide {current} of {total} ({slide_name})")
-        self.root.update()
+
+    def update_status(self, text):
+        """Update the status text with the current processing stage"""
+        self.status_var.set(text)
 
     def process_presentation(self):
+        """Queue the selected deck and start the background worker if idle"""
         if not self.gui_pptx_path.get() or not self.gui_output_path.get():
             messagebox.showerror(
                 "Error", "Please select both input file and output location"
             )
             return
 
-        # Set processing state
-        self.processing = True
-        self.stop_requested = False
-        self.process_button.configure(state="disabled")
-        self.stop_button.configure(state="normal")
-        self.root.update()
-
-        try:
-            # Save GUI config as soon as process button is clicked
-            self.save_gui_config()
+        # Save GUI config as soon as process button is clicked
+        self.save_gui_config()
+
+        # Read all Tk variables here, the worker thread must not touch them
+        job = {
+            "pptx_path": self.gui_pptx_path.get(),
+            "output_path": self.gui_output_path.get(),
+            "overwrite": self.overwrite_file.get(),
+            "target_language": self.gui_target_language.get(),
+            "extract": self.extract_var.get(),
+            "merge_runs": self.merge_runs_var.get(),
+            "polish": self.polish_var.get(),
+            "translate": self.translate_var.get(),
+            "style_instructions": self.gui_style_instructions.get(),
+        }
 
-            path_manager = PathManager(
-                self.gui_pptx_path.get(), 
-                self.gui_output_path.get(),
-                overwrite=self.overwrite_file.get()
-            )
-            config = create_config(
-                path_manager=path_manager,
-                target_language=self.gui_target_language.get(),
+        self.job_queue.put(job)
+        if not self.processing:
+            # Set processing state, the poll loop starts the worker
+            self.processing = True
+            self.stop_requested = False
+            self.stop_event.clear()
+            self.stop_button.configure(state="normal")
+            self._poll_worker()
+        else:
+            self.status_var.set(
+                f"Queued {os.path.basename(job['pptx_path'])} "
+                f"({self.job_queue.qsize()} waiting)"
             )
 
-            # Check for stop request between each major step
-            if self.stop_requested:
-                raise Exception("Processing stopped by user")
-
-            # Extract
-            if self.extract_var.get():
-                self.status_var.set("Extracting PPTX...")
-                self.root.update()
-
-                success = self.extract_pptx()
-                if not success:
-                    raise Exception("Extraction failed")
-
-            if self.stop_requested:
-                raise Exception("Processing stopped by user")
-
-            # Polish
-            if self.polish_var.get():
-                self.status_var.set("Polishing content...")
-                self.root.update()
+    def _process_jobs(self):
+        """Worker thread: process queued decks until the queue is empty"""
+        while not self.stop_event.is_set():
+            try:
+                job = self.job_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                output_file, output_folder = self._process_job(job)
+                self.ui_queue.put(("done", output_file, output_folder))
+            except Exception as e:
+                logging.exception("Error in process_presentation")
+                self.ui_queue.put(("error", str(e)))
+
+    def _process_job(self, job):
+        """Run the processing pipeline for one deck on the worker thread"""
+        post = self.ui_queue.put
+        post(("status", f"Processing {os.path.basename(job['pptx_path'])}..."))
+
+        path_manager = PathManager(
+            job["pptx_path"],
+            job["output_path"],
+            overwrite=job["overwrite"],
+        )
+        config = create_config(
+            path_manager=path_manager,
+            target_language=job["target_language"],
+        )
 
-                polisher = PowerPointPolisher(
-                    Further_StyleInstructions=self.gui_style_instructions.get(),
-                    fresh_extract=not self.extract_var.get(),
-                    pipeline_config=config,
-                )
-                success = polisher.polish_presentation()
-                if not success:
-                    raise Exception("Polishing failed")
-
-            if self.stop_requested:
-                raise Exception("Processing stopped by user")
-
-            # Translate
-            if self.translate_var.get():
-                self.status_var.set("Starting translation...")
-                self.root.update()
-
-                translator = PowerPointTranslator(
-                    progress_callback=self.update_translation_progress,
-                    stop_check_callback=lambda: self.stop_requested,
-                    pipeline_config=config,
+        # Check for stop request between each major step
+        if self.stop_event.is_set():
+            raise Exception("Processing stopped by user")
+
+        # Merge, polish and translate share one in-memory copy of the deck
+        # which is written to the output PPTX only once
+        if job["merge_runs"] or job["polish"] or job["translate"]:
+            post(("status", "Loading PPTX..."))
+
+            pipeline = PresentationPipeline(
+                merge_runs=job["merge_runs"],
+                polish=job["polish"],
+                translate=job["translate"],
+                fresh_extract=job["extract"],
+                Further_StyleInstructions=job["style_instructions"],
+                progress_callback=lambda *args: post(("progress", *args)),
+                status_callback=lambda text: post(("status", text)),
+                stop_check_callback=self.stop_event.is_set,
+                pipeline_config=config,
+            )
+            success = pipeline.run()
+
+            if not success:
+                if self.stop_event.is_set():
+                    raise Exception("Processing stopped by user")
+                raise Exception("Processing failed")
+        elif job["extract"]:
+            post(("status", "Extracting PPTX..."))
+            PowerpointPipeline(pipeline_config=config).extract_pptx()
+
+        return path_manager.output_pptx, path_manager.output_dir
+
+    def _poll_worker(self):
+        """Apply messages from the worker thread on the Tk thread
+
+        Workers are only started here, one at a time, so a deck queued while
+        a worker shuts down is picked up once that worker has exited.
+        """
+        # Checked before draining, a finished worker has posted all its messages
+        worker_alive = self.worker is not None and self.worker.is_alive()
+        while True:
+            try:
+                message = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = message[0]
+            if kind == "progress":
+                self.update_translation_progress(*message[1:])
+            elif kind == "status":
+                self.update_status(message[1])
+            elif kind == "done":
+                output_file, output_folder = message[1:]
+                self.status_var.set("Processing complete!")
+                success_msg = (
+                    f"PowerPoint processing completed successfully!\n\n"
+                    f"Filename: {os.path.basename(output_file)}\n"
+                    f"Folder: {output_folder}"
                 )
-                success = translator.translate_presentation()
-
-                if not success:
-                    if self.stop_requested:
-                        raise Exception("Processing stopped by user")
-                    print("Full traceback:")
-                    print(traceback.format_exc())
-                    raise Exception("Translation failed")
-
-            if self.stop_requested:
-                raise Exception("Processing stopped by user")
-
-            # Add run merging step
-            if self.merge_runs_var.get():
-                self.status_var.set("Merging similar runs...")
-                self.root.update()
-
-                merger = PowerPointRunMerger(
-                    fresh_extract=not (
-                        self.extract_var.get()
-                        or self.polish_var.get()
-                        or self.translate_var.get()
-                    ),
-                    pipeline_config=config,
+                messagebox.showinfo("Success", success_msg)
+            elif kind == "error":
+                self.status_var.set(f"Error occurred: {message[1]}")
+                messagebox.showerror(
+                    "Error",
+                    f"An error occurred: {message[1]}\nCheck error_logs folder for details.",
                 )
-                success = merger.merge_runs_in_presentation()
-                if not success:
-                    raise Exception("Run merging failed")
-
-            self.status_var.set("Processing complete!")
-            
-            output_file = path_manager.output_pptx
-            output_folder = path_manager.output_dir
-            
-            success_msg = (
-                f"PowerPoint processing completed successfully!\n\n"
-                f"Filename: {os.path.basename(output_file)}\n"
-                f"Folder: {output_folder}"
-            )
-            messagebox.showinfo("Success", success_msg)
 
-        except Exception as e:
-            self.status_var.set(f"Error occurred: {e!s}")
-            messagebox.showerror(
-                "Error",
-                f"An error occurred: {e!s}\nCheck error_logs folder for details.",
-            )
-            logging.exception("Error in process_presentation")
-            raise e
+        if worker_alive:
+            self.root.after(self.poll_interval_ms, self._poll_worker)
+        elif not self.job_queue.empty():
+            # Decks are waiting, also when they were queued after a stop
+            self.stop_requested = False
+            self.stop_event.clear()
+            self.worker = threading.Thread(target=self._process_jobs, daemon=True)
+            self.worker.start()
+            self.root.after(self.poll_interval_ms, self._poll_worker)
+        else:
+            self.processing = False
+            self.stop_button.configure(state="disabled")
 
     def show_help(self, help_key):
         messagebox.showinfo("Processing Options Help", self.help_texts[help_key])
@@ -646,8 +683,14 @@ class SlideMobGUI(PowerpointPipeline):
     def stop_processing(self):
         if self.processing:
             self.stop_requested = True
+            self.stop_event.set()
+            # Drop decks that are still waiting in the queue
+            while True:
+                try:
+                    self.job_queue.get_nowait()
+                except queue.Empty:
+                    break
             self.status_var.set("Stopping...")
-            self.root.update()
 
     def get_config_value(self, key, default=""):
         """Get a value from the config file"""
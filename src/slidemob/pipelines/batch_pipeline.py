@@ -0,0 +1,92 @@
+## Pipeline - Offline bulk translation through a batch API
+import os
+import traceback
+
+from ..core_functions.base_class import PowerpointPipeline
+from ..core_functions.compression import resolve_compression_threads
+from ..core_functions.batch import (
+    BatchTranslator,
+    LocalBatchEndpoint,
+    OpenAIBatchEndpoint,
+)
+from ..core_functions.document import PresentationDocument
+from ..core_functions.translator import SlideTranslator
+from ..utils.config import create_config
+from ..utils.model_settings import ModelSettings
+from ..utils.path_manager import PathManager
+
+
+class BatchTranslationPipeline(PowerpointPipeline):
+    """Translate one or more decks through a provider batch API.
+
+    All requests of all decks are written as JSONL, submitted as one batch,
+    polled until completion and applied to the slides. Cheaper and with higher
+    throughput than interactive calls, but results may take hours.
+    """
+
+    def __init__(
+        self,
+        pptx_paths: list[str],
+        target_language: str = "English",
+        output_folder: str | None = None,
+        endpoint=None,
+        local_batch_folder: str | None = None,
+        poll_interval: float = 30,
+        stop_check_callback=None,
+        model_settings: ModelSettings | None = None,
+    ):
+        self.path_managers = [PathManager(path, output_folder) for path in pptx_paths]
+        super().__init__(
+            pipeline_config=create_config(self.path_managers[0], target_language),
+            model_settings=model_settings,
+        )
+        self.poll_interval = poll_interval
+        self.stop_check_callback = stop_check_callback
+        self.endpoint = endpoint
+        self.local_batch_folder = local_batch_folder
+        self.work_folder = os.path.join(
+            self.path_managers[0].working_dir, "slidemob_batch"
+        )
+
+    def _create_endpoint(self):
+        if self.local_batch_folder:
+            return LocalBatchEndpoint(self.local_batch_folder)
+        return OpenAIBatchEndpoint(self.translation_client, url=self.batch_url or None)
+
+    def run(self) -> bool:
+        if self.endpoint is None:
+            try:
+                self.endpoint = self._create_endpoint()
+            except ValueError as e:
+                print(f"Error in batch translation: {e}")
+                return False
+
+        try:
+            documents = [
+                PresentationDocument.from_pptx(path_manager.input_file)
+                for path_manager in self.path_managers
+            ]
+            translator = SlideTranslator(pipeline_settings=self)
+            batch_translator = BatchTranslator(
+                translator, self.endpoint, self.work_folder, self.poll_interval
+            )
+            if not batch_translator.translate_documents(
+                documents, self.stop_check_callback
+            ):
+                return False
+            translator.finish_run()
+
+            for document, path_manager in zip(documents, self.path_managers):
+                document.save(
+                    path_manager.output_pptx,
+                    self.compression_level,
+                    resolve_compression_threads(self.compression_threads),
+                )
+                print(f"Saved {path_manager.output_pptx}")
+            return True
+
+        except Exception as e:
+            print(f"Error in batch translation: {e}")
+            print("Full traceback:")
+            print(traceback.format_exc())
+            return False
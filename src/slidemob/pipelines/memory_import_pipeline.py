@@ -0,0 +1,98 @@
+## Pipeline - Seed the translation memory from translated deck pairs
+import os
+import traceback
+
+from ..core_functions.base_class import PowerpointPipeline
+from ..core_functions.document import PresentationDocument
+from ..core_functions.memory_import import align_documents, run_mapping
+from ..core_functions.translator import SlideTranslator
+from ..core_functions.utils.cache import get_translation_memory
+from ..utils.config import create_config
+from ..utils.path_manager import PathManager
+
+
+def find_deck_pairs(paths: list[str]) -> list[tuple[str, str]]:
+    """Turn a list of source, translation paths into pairs of decks.
+
+    A pair of folders pairs the PPTX files with the same relative path.
+    """
+    if len(paths) % 2:
+        raise ValueError("Expected pairs of source and translated decks")
+    pairs = []
+    for source, translated in zip(paths[::2], paths[1::2]):
+        if not os.path.isdir(source):
+            pairs.append((source, translated))
+            continue
+        for root, _, files in os.walk(source):
+            for file in sorted(files):
+                if not file.lower().endswith(".pptx") or file.startswith("~$"):
+                    continue
+                relative_path = os.path.relpath(os.path.join(root, file), source)
+                if os.path.isfile(os.path.join(translated, relative_path)):
+                    pairs.append(
+                        (
+                            os.path.join(source, relative_path),
+                            os.path.join(translated, relative_path),
+                        )
+                    )
+    return pairs
+
+
+class MemoryImportPipeline(PowerpointPipeline):
+    """Load the paragraphs of already translated decks into the translation memory.
+
+    Every source deck is aligned with its translation by slide, shape id and
+    paragraph index. The entries are keyed like translations made with the
+    current settings (target language, method, model and style instructions),
+    so later runs find them without any API call.
+    """
+
+    def __init__(self, deck_pairs: list[tuple[str, str]], target_language: str):
+        self.deck_pairs = deck_pairs
+        super().__init__(
+            pipeline_config=create_config(PathManager(deck_pairs[0][0]), target_language)
+        )
+        if self.translation_memory is None:
+            # Imported entries are kept for when the memory is enabled
+            self.translation_memory = get_translation_memory(
+                self.model_settings.translation_memory_path
+            )
+            print("Note: translation_memory is disabled in the settings")
+
+    def run(self) -> bool:
+        try:
+            translator = SlideTranslator(pipeline_settings=self)
+            context = translator._memory_context()
+            paragraphs = 0
+            for source_path, translated_path in self.deck_pairs:
+                pairs = align_documents(
+                    PresentationDocument.from_pptx(source_path),
+                    PresentationDocument.from_pptx(translated_path),
+                    self.namespaces,
+                )
+                for source, translation in pairs:
+                    translator.original_text = source.text
+                    self.translation_memory.set(
+                        translator._memory_key(set(source.run_texts)),
+                        translation.text,
+                        run_mapping(source, translation),
+                        source=source.text,
+                        context=context,
+                    )
+                paragraphs += len(pairs)
+                print(
+                    f"Aligned {len(pairs)} paragraphs of "
+                    f"{os.path.basename(source_path)}"
+                )
+            translator.flush_translation_memory()
+            print(
+                f"Imported {paragraphs} paragraphs of {len(self.deck_pairs)} decks "
+                f"into {self.translation_memory.cache_file}"
+            )
+            return True
+
+        except Exception as e:
+            print(f"Error importing translation memory: {e}")
+            print("Full traceback:")
+            print(traceback.format_exc())
+            return False
@@ -2,22 +2,39 @@
 import traceback
 
 from ..core_functions.base_class import PowerpointPipeline
+from ..core_functions.document import PresentationDocument
 from ..core_functions.polisher import SlidePolisher
 
 
 class PowerPointPolisher(PowerpointPipeline):
     def __init__(
-        self, Further_StyleInstructions: str = "None", fresh_extract: bool = True, pipeline_config: dict = None
+        self,
+        Further_StyleInstructions: str = "None",
+        fresh_extract: bool = True,
+        pipeline_config: dict = None,
+        dry_run: bool = False,
     ):
         super().__init__(pipeline_config=pipeline_config)
 
         self.fresh_extract = fresh_extract
+        # Only estimate requests, tokens, cost and time without any API call
+        self.dry_run = dry_run
+        self.estimate = None
         # Initialize transformer and translator
-        self.polisher = SlidePolisher(Further_StyleInstructions)
+        self.polisher = SlidePolisher(
+            Further_StyleInstructions, pipeline_config=pipeline_config
+        )
 
     def polish_presentation(self):
         """Main method to handle the full translation process"""
         try:
+            if self.dry_run:
+                self.estimate = self.polisher.estimate_slides(
+                    PresentationDocument.from_pptx(self.pptx_path)
+                )
+                self.estimate.report()
+                return True
+
             # Extract PPTX
             if self.fresh_extract:
                 self.extract_pptx()
@@ -0,0 +1,288 @@
+## Pipeline - Shared in-memory document for all stages
+import os
+import traceback
+
+from ..core_functions.base_class import PowerpointPipeline
+from ..core_functions.compression import resolve_compression_threads
+from ..core_functions.document import (
+    PresentationDocument,
+    StreamingPresentation,
+    peak_rss_mb,
+)
+from ..core_functions.merger import RunMerger
+from ..core_functions.parallel import (
+    map_slides,
+    merge_slide_xml,
+    resolve_cpu_workers,
+    translate_slide_xml,
+)
+from ..core_functions.polisher import SlidePolisher
+from ..core_functions.spellchecker import SlideSpellChecker
+from ..core_functions.translator import REDUCED_SLIDES, SlideTranslator
+from ..utils.model_settings import ModelSettings
+
+
+class PresentationPipeline(PowerpointPipeline):
+    """Run merge, spell check, polish and translate stages over one in-memory deck.
+
+    The deck is read and every slide parsed once, the stages transform the
+    parsed trees in place and the output PPTX is serialized and composed
+    exactly once at the end.
+
+    In streaming mode the deck is instead processed slide by slide, see
+    run_streaming().
+    """
+
+    def __init__(
+        self,
+        merge_runs: bool = False,
+        spell_check: bool = False,
+        polish: bool = False,
+        translate: bool = True,
+        fresh_extract: bool = True,
+        Further_StyleInstructions: str = "None",
+        progress_callback=None,
+        status_callback=None,
+        stop_check_callback=None,
+        pipeline_config: dict = None,
+        model_settings: ModelSettings | None = None,
+    ):
+        super().__init__(pipeline_config=pipeline_config, model_settings=model_settings)
+
+        self.merge_runs = merge_runs
+        self.spell_check = spell_check
+        self.polish = polish
+        self.translate = translate
+        self.fresh_extract = fresh_extract
+        self.Further_StyleInstructions = Further_StyleInstructions
+        self.progress_callback = progress_callback
+        self.status_callback = status_callback
+        self.stop_check_callback = stop_check_callback
+
+    def load_document(self) -> PresentationDocument:
+        """Load the deck from the PPTX or from an existing extract folder."""
+        if not self.fresh_extract and os.path.isdir(self.extract_path):
+            return PresentationDocument.from_folder(self.extract_path)
+        return PresentationDocument.from_pptx(self.pptx_path)
+
+    def _stopped(self) -> bool:
+        if self.stop_check_callback and self.stop_check_callback():
+            print("\nProcessing stopped by user")
+            return True
+        return False
+
+    def _set_status(self, text: str):
+        if self.status_callback:
+            self.status_callback(text)
+
+    def run(self) -> bool:
+        """Run all enabled stages and write the output PPTX once."""
+        if self.streaming_mode:
+            return self.run_streaming()
+        try:
+            document = self.load_document()
+            if not self.process_document(document):
+                return False
+
+            self._set_status("Writing PPTX...")
+            return document.save(
+                self.output_pptx,
+                self.compression_level,
+                resolve_compression_threads(self.compression_threads),
+            )
+
+        except Exception as e:
+            print(f"Error processing presentation: {e}")
+            print("Full traceback:")
+            print(traceback.format_exc())
+            return False
+
+    def process_document(self, document: PresentationDocument) -> bool:
+        """Run all enabled stages over the parsed slides of a document.
+
+        Nothing is read from or written to disk, the caller saves the document.
+        Returns False if processing was stopped or a slide failed.
+        """
+        slide_names = document.slide_names()
+        total_slides = len(slide_names)
+
+        if self.merge_runs:
+            self._set_status("Merging similar runs...")
+            workers = resolve_cpu_workers(self.cpu_workers)
+            if workers > 1:
+                # Slide bytes go through a process pool, no tree is parsed here
+                merged = map_slides(
+                    merge_slide_xml,
+                    {name: document.members[name] for name in slide_names},
+                    workers,
+                    namespaces=self.namespaces,
+                )
+                for slide_name, content in merged.items():
+                    document.set_member(slide_name, content)
+            else:
+                merger = RunMerger(self.namespaces)
+                for slide_name in slide_names:
+                    if self._stopped():
+                        return False
+                    merger.process_paragraphs(document.get_root(slide_name))
+
+        if self.spell_check:
+            self._set_status("Checking spelling...")
+            spell_checker = SlideSpellChecker(
+                pipeline_config=self.pipeline_config, model_settings=self.model_settings
+            )
+            # One deck-wide pass corrects every unique flagged word once
+            spell_checker.check_and_fix_deck(
+                [document.get_root(slide_name) for slide_name in slide_names]
+            )
+
+        if self.polish:
+            self._set_status("Polishing content...")
+            polisher = SlidePolisher(
+                self.Further_StyleInstructions,
+                pipeline_config=self.pipeline_config,
+                model_settings=self.model_settings,
+            )
+            for slide_name in slide_names:
+                if self._stopped():
+                    return False
+                print(f"\nPolishing {os.path.basename(slide_name)}...")
+                polisher.polish_slide(document.get_root(slide_name))
+            polisher.finish_run()
+
+        if self.translate:
+            self._set_status("Starting translation...")
+            workers = resolve_cpu_workers(self.cpu_workers)
+            if (
+                workers > 1
+                and self.exchange_recorder is not None
+                and self.exchange_recorder.mode == "replay"
+            ):
+                return self._replay_translation(document, slide_names, workers)
+            translator = SlideTranslator(pipeline_settings=self)
+            for current_slide, slide_name in enumerate(slide_names, start=1):
+                if self._stopped():
+                    return False
+                if self.reduce_slides:
+                    if os.path.basename(slide_name) not in REDUCED_SLIDES:
+                        continue
+                if self.progress_callback:
+                    self.progress_callback(
+                        os.path.basename(slide_name), current_slide, total_slides
+                    )
+                success = translator.translate_slide(
+                    document.get_root(slide_name), self.stop_check_callback
+                )
+                if not success:
+                    return False
+            translator.finish_run()
+        return True
+
+    def _replay_translation(
+        self, document: PresentationDocument, slide_names: list[str], workers: int
+    ) -> bool:
+        """Translate the slides in a process pool from recorded responses.
+
+        Replayed requests are not sent, so translating is CPU work and scales
+        with cores. Only slide bytes and plain settings go to the workers.
+        """
+        if self.reduce_slides:
+            slide_names = [
+                name for name in slide_names if os.path.basename(name) in REDUCED_SLIDES
+            ]
+        # Earlier stages changed the parsed trees, the workers need their bytes
+        document.serialize()
+        translated = map_slides(
+            translate_slide_xml,
+            {name: document.members[name] for name in slide_names},
+            workers,
+            gui_config=self.model_settings.gui_config,
+            api_keys=self.model_settings.api_key_config(),
+            pipeline_config=self.pipeline_config,
+        )
+        for slide_name, content in translated.items():
+            if content is None:
+                return False
+            document.set_member(slide_name, content)
+        if self.progress_callback and slide_names:
+            self.progress_callback(
+                os.path.basename(slide_names[-1]), len(slide_names), len(slide_names)
+            )
+        return True
+
+    def run_streaming(self) -> bool:
+        """Run all enabled stages slide by slide with bounded memory.
+
+        Each slide goes through merge, spell check, polish and translation and
+        is written to the output PPTX while the following slides are parsed
+        and translated. Up to slide_workers slides are processed at once and
+        at most max_slides_in_flight parsed slides are held in memory.
+        """
+        try:
+            stream = StreamingPresentation(
+                self.pptx_path,
+                self.max_slides_in_flight,
+                self.slide_workers,
+                self.compression_level,
+            )
+            slide_names = stream.slide_names()
+            total_slides = len(slide_names)
+            positions = {name: index for index, name in enumerate(slide_names, start=1)}
+
+            merger = RunMerger(self.namespaces) if self.merge_runs else None
+            spell_checker = (
+                SlideSpellChecker(
+                    pipeline_config=self.pipeline_config,
+                    model_settings=self.model_settings,
+                )
+                if self.spell_check
+                else None
+            )
+            polisher = (
+                SlidePolisher(
+                    self.Further_StyleInstructions,
+                    pipeline_config=self.pipeline_config,
+                    model_settings=self.model_settings,
+                )
+                if self.polish
+                else None
+            )
+            translator = SlideTranslator(pipeline_settings=self) if self.translate else None
+
+            def transform(slide_name, root) -> bool:
+                current_slide = positions[slide_name]
+                if self._stopped():
+                    return False
+                slide_file = os.path.basename(slide_name)
+                self._set_status(f"Processing {slide_file}...")
+                if merger:
+                    merger.process_paragraphs(root)
+                if spell_checker:
+                    spell_checker.check_and_fix_deck([root])
+                if polisher:
+                    print(f"\nPolishing {slide_file}...")
+                    polisher.polish_slide(root)
+                if translator:
+                    if self.reduce_slides and slide_file not in REDUCED_SLIDES:
+                        return True
+                    if self.progress_callback:
+                        self.progress_callback(slide_file, current_slide, total_slides)
+                    return translator.translate_slide(root, self.stop_check_callback)
+                return True
+
+            success = stream.process(self.output_pptx, transform)
+            if polisher:
+                polisher.finish_run()
+            if translator:
+                translator.finish_run()
+
+            peak = peak_rss_mb()
+            if peak is not None:
+                print(f"Peak memory: {peak:.1f} MB")
+            return success
+
+        except Exception as e:
+            print(f"Error processing presentation: {e}")
+            print("Full traceback:")
+            print(traceback.format_exc())
+            return False
@@ -5,6 +5,7 @@ from lxml import etree as ET
 
 from ..core_functions.base_class import PowerpointPipeline
 from ..core_functions.merger import RunMerger
+from ..core_functions.parallel import map_slides, merge_slide_xml, resolve_cpu_workers
 
 
 class PowerPointRunMerger(PowerpointPipeline):
@@ -28,17 +29,32 @@ class PowerPointRunMerger(PowerpointPipeline):
             # Process slides
             slide_files = self.find_slide_files(self.extract_path)
 
-            for slide_file in sorted(slide_files):
-                print(f"\nProcessing {os.path.basename(slide_file)}...")
-                tree = ET.parse(slide_file)
-                root = tree.getroot()
+            workers = resolve_cpu_workers(self.cpu_workers)
+            if workers > 1:
+                # Merging is pure CPU work, slides are merged in parallel processes
+                slides = {}
+                for slide_file in slide_files:
+                    with open(slide_file, "rb") as f:
+                        slides[slide_file] = f.read()
+                print(f"\nMerging {len(slides)} slides in {workers} processes...")
+                merged = map_slides(
+                    merge_slide_xml, slides, workers, namespaces=namespaces
+                )
+                for slide_file, content in merged.items():
+                    with open(slide_file, "wb") as f:
+                        f.write(content)
+            else:
+                for slide_file in slide_files:
+                    print(f"\nProcessing {os.path.basename(slide_file)}...")
+                    tree = ET.parse(slide_file)
+                    root = tree.getroot()
 
-                # Process all paragraphs in the slide
-                self.merger.process_paragraphs(root)
+                    # Process all paragraphs in the slide
+                    self.merger.process_paragraphs(root)
 
-                # Write back XML
-                with open(slide_file, "wb") as f:
-                    tree.write(f, encoding="UTF-8", xml_declaration=True)
+                    # Write back XML
+                    with open(slide_file, "wb") as f:
+                        tree.write(f, encoding="UTF-8", xml_declaration=True)
 
             # Compose final PPTX
             self.compose_pptx(self.extract_path, self.output_pptx)
@@ -1,14 +1,24 @@
 import traceback
 
 from ..core_functions.base_class import PowerpointPipeline
+from ..core_functions.document import PresentationDocument
 from ..core_functions.translator import SlideTranslator
 
 
 class PowerPointTranslator:
-    def __init__(self, progress_callback=None, stop_check_callback=None, pipeline_config: dict = None):
+    def __init__(
+        self,
+        progress_callback=None,
+        stop_check_callback=None,
+        pipeline_config: dict = None,
+        dry_run: bool = False,
+    ):
         self.progress_callback = progress_callback
         self.stop_check_callback = stop_check_callback
         self.pipeline_config = pipeline_config
+        # Only estimate requests, tokens, cost and time without any API call
+        self.dry_run = dry_run
+        self.estimate = None
 
     def translate_presentation(self):
         """Main method to handle the full translation process"""
@@ -16,6 +26,13 @@ class PowerPointTranslator:
             self.settings = PowerpointPipeline(pipeline_config=self.pipeline_config)
             self.translator = SlideTranslator(pipeline_settings=self.settings)
 
+            if self.dry_run:
+                self.estimate = self.translator.estimate_slides(
+                    PresentationDocument.from_pptx(self.settings.pptx_path)
+                )
+                self.estimate.report()
+                return True
+
             # Extract PPTX if needed
             if self.settings.fresh_extract:
                 self.settings.extract_pptx()
@@ -0,0 +1,273 @@
+"""Long-running local job service.
+
+Keeps the model settings, API clients, connection pools, translation memory
+and spellchecker dictionaries resident and runs submitted decks through a
+worker pool, so repeated jobs do not pay the start-up cost every time.
+
+Endpoints (JSON, localhost only by default):
+    POST /jobs          submit a deck, returns {"id": ...}
+    GET  /jobs/<id>     job state: queued, running, done, failed or cancelled
+    DELETE /jobs/<id>   cancel a queued job or stop a running one
+    GET  /jobs          all known jobs
+    GET  /health        worker and queue status
+    POST /reload        reload config_gui.json, .env and the clients
+"""
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import queue
+import threading
+import traceback
+import uuid
+
+from .core_functions.spellchecker import get_spellchecker
+from .pipelines.presentation_pipeline import PresentationPipeline
+from .utils.config import create_config
+from .utils.model_settings import ModelSettings, use_shared_model_settings
+from .utils.path_manager import PathManager
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 1000
+
+
+class JobService:
+    """Queue of deck jobs processed by a pool of worker threads."""
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self.jobs: OrderedDict[str, dict] = OrderedDict()
+        self.job_queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.reload()
+        # Load the default dictionary before the first job needs it
+        get_spellchecker("en")
+
+    def reload(self):
+        """Load settings and clients once and share them with all jobs."""
+        self.model_settings = ModelSettings()
+        use_shared_model_settings(self.model_settings)
+        print(
+            f"Loaded settings: {self.model_settings.translation_method} / "
+            f"{self.model_settings.translation_model}"
+        )
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"slidemob-worker-{index}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        for _ in self.threads:
+            self.job_queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        use_shared_model_settings(None)
+
+    def submit(self, request: dict) -> dict:
+        """Validate a job request and queue it."""
+        input_file = request.get("input")
+        if not input_file or not os.path.isfile(input_file):
+            raise ValueError(f"Input file not found: {input_file}")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "state": "queued",
+            "input": os.path.abspath(input_file),
+            "output_folder": request.get("output_folder"),
+            "overwrite": bool(request.get("overwrite", False)),
+            "target_language": request.get("target_language", "English"),
+            "merge_runs": bool(request.get("merge_runs", False)),
+            "spell_check": bool(request.get("spell_check", False)),
+            "polish": bool(request.get("polish", False)),
+            "translate": bool(request.get("translate", True)),
+            "style_instructions": request.get("style_instructions", "None"),
+            "output": None,
+            "error": None,
+            "cancel_requested": False,
+            "submitted": datetime.now().isoformat(),
+            "started": None,
+            "finished": None,
+        }
+        with self.lock:
+            self.jobs[job["id"]] = job
+            self._prune_jobs()
+        self.job_queue.put(job["id"])
+        return self._public(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return self._public(job) if job else None
+
+    def cancel(self, job_id: str) -> dict | None:
+        """Cancel a queued job, a running job stops before its next slide."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job["state"] == "queued":
+                job.update(state="cancelled", finished=datetime.now().isoformat())
+            elif job["state"] == "running":
+                job["cancel_requested"] = True
+            return self._public(job)
+
+    def list(self) -> list[dict]:
+        with self.lock:
+            return [self._public(job) for job in self.jobs.values()]
+
+    def health(self) -> dict:
+        with self.lock:
+            running = sum(job["state"] == "running" for job in self.jobs.values())
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "running": running,
+            "queued": self.job_queue.qsize(),
+        }
+
+    def _work(self):
+        while True:
+            job_id = self.job_queue.get()
+            if job_id is None:
+                break
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None or job["state"] != "queued":
+                    continue
+                job["state"] = "running"
+                job["started"] = datetime.now().isoformat()
+            try:
+                output = self._run_job(job)
+                state, error = "done", None
+            except Exception as e:
+                if job["cancel_requested"]:
+                    output, state, error = None, "cancelled", None
+                else:
+                    print(f"Error processing {job['input']}: {e}")
+                    print(traceback.format_exc())
+                    output, state, error = None, "failed", str(e)
+            with self.lock:
+                job.update(
+                    state=state,
+                    output=output,
+                    error=error,
+                    finished=datetime.now().isoformat(),
+                )
+
+    def _run_job(self, job: dict) -> str:
+        path_manager = PathManager(
+            job["input"], job["output_folder"], overwrite=job["overwrite"]
+        )
+        config = create_config(
+            path_manager=path_manager, target_language=job["target_language"]
+        )
+        pipeline = PresentationPipeline(
+            merge_runs=job["merge_runs"],
+            spell_check=job["spell_check"],
+            polish=job["polish"],
+            translate=job["translate"],
+            fresh_extract=True,
+            Further_StyleInstructions=job["style_instructions"],
+            stop_check_callback=lambda: job["cancel_requested"],
+            pipeline_config=config,
+        )
+        if not pipeline.run():
+            raise Exception("Processing failed")
+        return path_manager.output_pptx
+
+    def _prune_jobs(self):
+        finished = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job["state"] in ("done", "failed", "cancelled")
+        ]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    @staticmethod
+    def _public(job: dict) -> dict:
+        return dict(job)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    service: JobService = None
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        elif self.path == "/jobs":
+            self._send(200, {"jobs": self.service.list()})
+        elif self.path.startswith("/jobs/"):
+            job = self.service.get(self.path[len("/jobs/") :])
+            if job:
+                self._send(200, job)
+            else:
+                self._send(404, {"error": "Unknown job"})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path == "/jobs":
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                self._send(202, self.service.submit(request))
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send(400, {"error": str(e)})
+        elif self.path == "/reload":
+            self.service.reload()
+            self._send(200, {"status": "reloaded"})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_DELETE(self):
+        if self.path.startswith("/jobs/"):
+            job = self.service.cancel(self.path[len("/jobs/") :])
+            if job:
+                self._send(200, job)
+            else:
+                self._send(404, {"error": "Unknown job"})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"[service] {self.address_string()} {format % args}")
+
+
+def create_server(
+    host: str = "127.0.0.1", port: int = 8765, workers: int = 2
+) -> tuple[ThreadingHTTPServer, JobService]:
+    """Create the HTTP server and its job service without starting them."""
+    service = JobService(workers=workers)
+    handler = type("BoundServiceRequestHandler", (ServiceRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    return server, service
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 2):
+    """Run the job service until interrupted."""
+    server, service = create_server(host, port, workers)
+    service.start()
+    print(f"SlideMob service listening on http://{host}:{port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down SlideMob service")
+    finally:
+        server.server_close()
+        service.stop()
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from openai import APIConnectionError, AzureOpenAI, OpenAI
+
+
+class Endpoint:
+    """One deployment or host of a backend with its request counters."""
+
+    def __init__(self, name: str, client, model: str | None = None):
+        self.name = name
+        self.client = client
+        self.model = model
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+
+class EndpointPool:
+    """OpenAI-compatible client that spreads requests over several endpoints.
+
+    Each request goes to the endpoint with the fewest outstanding requests.
+    Endpoints answering 429, 5xx or not reachable are ejected for
+    eject_seconds (or the Retry-After time) and the request is retried on the
+    next endpoint. Use it like an OpenAI client: pool.chat.completions.create().
+    """
+
+    def __init__(self, endpoints: list[Endpoint], eject_seconds: float = 30.0):
+        if not endpoints:
+            raise ValueError("An endpoint pool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.eject_seconds = eject_seconds
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @classmethod
+    def from_config(
+        cls,
+        endpoints_config: list[dict],
+        default_api_key: str | None = None,
+        eject_seconds: float = 30.0,
+    ) -> "EndpointPool":
+        """Build a pool from the endpoint list of config_gui.json.
+
+        Every entry has a base_url (or azure_endpoint and api_version for Azure),
+        an api_key or api_key_env and optionally the model or deployment name
+        to use on that endpoint.
+        """
+        endpoints = []
+        for index, config in enumerate(endpoints_config):
+            api_key = config.get("api_key")
+            if not api_key and config.get("api_key_env"):
+                api_key = os.getenv(config["api_key_env"])
+            if config.get("azure_endpoint"):
+                client = AzureOpenAI(
+                    api_key=api_key,
+                    azure_endpoint=config["azure_endpoint"],
+                    api_version=config.get("api_version", "2024-02-15-preview"),
+                )
+                name = config["azure_endpoint"]
+            else:
+                client = OpenAI(
+                    api_key=api_key or default_api_key or "lm-studio",
+                    base_url=config.get("base_url"),
+                )
+                name = config.get("base_url") or "default"
+            endpoints.append(
+                Endpoint(
+                    config.get("name", f"{index}:{name}"), client, config.get("model")
+                )
+            )
+        return cls(endpoints, eject_seconds=eject_seconds)
+
+    def create(self, **kwargs):
+        """Send a chat completion to the least busy healthy endpoint."""
+        tried = []
+        last_error = None
+        while len(tried) < len(self.endpoints):
+            endpoint = self._acquire(tried)
+            tried.append(endpoint)
+            request = dict(kwargs)
+            if endpoint.model:
+                request["model"] = endpoint.model
+            try:
+                return endpoint.client.chat.completions.create(**request)
+            except Exception as e:
+                if not self._is_retryable(e):
+                    raise
+                self._eject(endpoint, e)
+                last_error = e
+            finally:
+                with self.lock:
+                    endpoint.outstanding -= 1
+        raise last_error
+
+    def _acquire(self, tried: list[Endpoint]) -> Endpoint:
+        with self.lock:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in tried]
+            healthy = [e for e in candidates if e.ejected_until <= now]
+            if healthy:
+                endpoint = min(healthy, key=lambda e: (e.outstanding, e.requests))
+            else:
+                # All remaining endpoints are ejected, use the one that recovers first
+                endpoint = min(candidates, key=lambda e: e.ejected_until)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _eject(self, endpoint: Endpoint, error: Exception):
+        seconds = self.eject_seconds
+        response = getattr(error, "response", None)
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                pass
+        with self.lock:
+            endpoint.failures += 1
+            endpoint.ejected_until = time.monotonic() + seconds
+        print(f"\tEndpoint {endpoint.name} ejected for {seconds:.0f}s: {error}")
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, APIConnectionError):
+            return True
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and (status_code == 429 or status_code >= 500)
+
+    def summary(self) -> dict:
+        """Return requests and failures per endpoint."""
+        with self.lock:
+            return {
+                endpoint.name: {
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                }
+                for endpoint in self.endpoints
+            }
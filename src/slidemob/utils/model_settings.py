@@ -4,8 +4,10 @@ import os
 from typing import Any
 
 from dotenv import load_dotenv
-from openai import OpenAI
-from .path_manager import get_user_config_path, get_user_env_path
+from openai import AzureOpenAI, OpenAI
+from .endpoint_pool import EndpointPool
+from .path_manager import get_user_config_path, get_user_data_path, get_user_env_path
+from .recorder import RecordingClient, get_exchange_recorder
 
 # Only load local .env if it exists (for dev), otherwise we will rely on user home dir
 load_dotenv() 
@@ -20,20 +22,38 @@ class ModelSettings:
     mapping_client: str = None
     translation_client: str = None
     azure_config: dict[str, Any] = field(default_factory=dict)
+    # Explicit settings and keys, nothing is read from disk when both are given
+    gui_config: dict[str, Any] | None = None
+    api_keys: dict[str, str] | None = None
 
     def __post_init__(self):
-        # Force reload environment variables from user's writable .env
-        env_path = get_user_env_path()
-        load_dotenv(env_path, override=True)
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.huggingface_api_key = os.getenv("HUGGINGFACE")
-        self.deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
-        self.azure_openai_key = os.getenv("AZURE_OPENAI_ENDPOINT_KEY")
-        self.azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self._load_gui_config()
+        if self.api_keys is None:
+            # Force reload environment variables from user's writable .env
+            env_path = get_user_env_path()
+            load_dotenv(env_path, override=True)
+            api_keys = os.environ
+        else:
+            api_keys = self.api_keys
+        self.openai_api_key = api_keys.get("OPENAI_API_KEY")
+        self.huggingface_api_key = api_keys.get("HUGGINGFACE")
+        self.deepseek_api_key = api_keys.get("DEEPSEEK_API_KEY")
+        self.azure_openai_key = api_keys.get("AZURE_OPENAI_ENDPOINT_KEY")
+        self.azure_endpoint = api_keys.get("AZURE_OPENAI_ENDPOINT")
+        if self.gui_config is None:
+            self._load_gui_config()
         self._update_model_settings()
         self._setup_clients()
 
+    def api_key_config(self) -> dict[str, str | None]:
+        """Return the API keys in use, e.g. to build the same settings in a worker process."""
+        return {
+            "OPENAI_API_KEY": self.openai_api_key,
+            "HUGGINGFACE": self.huggingface_api_key,
+            "DEEPSEEK_API_KEY": self.deepseek_api_key,
+            "AZURE_OPENAI_ENDPOINT_KEY": self.azure_openai_key,
+            "AZURE_OPENAI_ENDPOINT": self.azure_endpoint,
+        }
+
     def _update_model_settings(self) -> None:
         """Update model settings based on GUI config"""
         self.translation_method = self.gui_config.get("translation_method", "OpenAI")
@@ -51,11 +71,73 @@ class ModelSettings:
         self.update_language = self.gui_config.get("update_language", False)
         self.fresh_extract = self.gui_config.get("fresh_extract", False)
         self.translation_strategy = self.gui_config.get("translation_strategy", "classic")
+        self.glossary = self.gui_config.get("glossary", [])
+        self.single_call_translation = self.gui_config.get(
+            "single_call_translation", False
+        )
+        self.polish_concurrency = self.gui_config.get("polish_concurrency", 4)
+        self.polish_min_length = self.gui_config.get("polish_min_length", 20)
+        self.streaming_mode = self.gui_config.get("streaming_mode", False)
+        self.max_slides_in_flight = self.gui_config.get("max_slides_in_flight", 4)
+        self.slide_workers = self.gui_config.get("slide_workers", 1)
+        self.cpu_workers = self.gui_config.get("cpu_workers", 1)
+        self.compression_level = self.gui_config.get("compression_level", 6)
+        self.compression_threads = self.gui_config.get("compression_threads", 1)
+        self.translation_memory = self.gui_config.get("translation_memory", False)
+        self.fuzzy_matching = self.gui_config.get("fuzzy_matching", False)
+        self.fuzzy_reuse_threshold = self.gui_config.get("fuzzy_reuse_threshold", 0.95)
+        self.fuzzy_reference_threshold = self.gui_config.get(
+            "fuzzy_reference_threshold", 0.75
+        )
+        self.translation_memory_path = self.gui_config.get(
+            "translation_memory_path", get_user_data_path("translation_memory.json")
+        )
+        self.coalesce_requests = self.gui_config.get("coalesce_requests", True)
+        self.latency_history = self.gui_config.get("latency_history", False)
+        self.latency_history_path = self.gui_config.get(
+            "latency_history_path", get_user_data_path("latency_history.json")
+        )
+        self.model_pricing = self.gui_config.get("model_pricing", {})
+        self.hedge_requests = self.gui_config.get("hedge_requests", False)
+        self.hedge_percentile = self.gui_config.get("hedge_percentile", 95)
+        self.hedge_budget = self.gui_config.get("hedge_budget", 0.1)
+        self.hedge_backend = self.gui_config.get("hedge_backend", "same")
+        self.structured_outputs = self.gui_config.get("structured_outputs", False)
+        self.mapping_retries = self.gui_config.get("mapping_retries", 1)
+        self.reasoning_effort = self.gui_config.get("reasoning_effort", {})
+        self.reasoning_max_tokens = self.gui_config.get("reasoning_max_tokens", {})
+        self.reasoning_fallback_model = self.gui_config.get(
+            "reasoning_fallback_model", ""
+        )
+        self.reasoning_min_length = self.gui_config.get("reasoning_min_length", 80)
+        self.translation_endpoints = self.gui_config.get("translation_endpoints", [])
+        self.mapping_endpoints = self.gui_config.get("mapping_endpoints", [])
+        self.endpoint_eject_seconds = self.gui_config.get("endpoint_eject_seconds", 30)
+        self.batch_url = self.gui_config.get("batch_url", "")
+        self.record_mode = self.gui_config.get("record_mode", "off")
+        self.record_folder = self.gui_config.get(
+            "record_folder", get_user_data_path("recordings")
+        )
+        self.routing = self.gui_config.get("routing", False)
+        self.route_short_method = self.gui_config.get("route_short_method", "Google")
+        self.route_short_model = self.gui_config.get("route_short_model", "")
+        self.route_short_api_url = self.gui_config.get(
+            "route_short_api_url", "http://localhost:1234"
+        )
+        self.route_short_max_length = self.gui_config.get("route_short_max_length", 40)
+        self.route_concurrency = {
+            "short": 8,
+            "default": 4,
+            **self.gui_config.get("route_concurrency", {}),
+        }
 
     def _setup_clients(self) -> None:
         """Setup translation and mapping clients based on configuration"""
         self._setup_translation_client()
         self._setup_mapping_client()
+        self._setup_route_client()
+        self._setup_endpoint_pools()
+        self._setup_recorder()
 
     def _setup_translation_client(self) -> Any | None:
         """Setup and return translation client based on configuration"""
@@ -87,6 +169,13 @@ class ModelSettings:
                 )
                 self.translation_headers = {"Content-Type": "application/json"}
 
+            elif self.translation_method == "Azure OpenAI":
+                self.translation_client = AzureOpenAI(
+                    api_key=self.azure_openai_key,
+                    api_version="2024-02-15-preview",
+                    azure_endpoint=self.azure_endpoint,
+                )
+
         except Exception as e:
             print(f"model_settings.py: Error setting up translation client: {e}")
             return None
@@ -118,10 +207,83 @@ class ModelSettings:
                 )
                 self.mapping_headers = {"Content-Type": "application/json"}
 
+            elif self.mapping_method == "Azure OpenAI":
+                self.mapping_client = AzureOpenAI(
+                    api_key=self.azure_openai_key,
+                    api_version="2024-02-15-preview",
+                    azure_endpoint=self.azure_endpoint,
+                )
+
         except Exception as e:
             print(f"model_settings.py: Error setting up mapping client: {e}")
             return None
 
+    def _setup_endpoint_pools(self) -> None:
+        """Replace a single client by a pool if several endpoints are configured"""
+        default_keys = {
+            "OpenAI": self.openai_api_key,
+            "DeepSeek": self.deepseek_api_key,
+            "Azure OpenAI": self.azure_openai_key,
+        }
+        try:
+            if self.translation_endpoints:
+                self.translation_client = EndpointPool.from_config(
+                    self.translation_endpoints,
+                    default_api_key=default_keys.get(self.translation_method),
+                    eject_seconds=self.endpoint_eject_seconds,
+                )
+            if self.mapping_endpoints:
+                self.mapping_client = EndpointPool.from_config(
+                    self.mapping_endpoints,
+                    default_api_key=default_keys.get(self.mapping_method),
+                    eject_seconds=self.endpoint_eject_seconds,
+                )
+        except Exception as e:
+            print(f"model_settings.py: Error setting up endpoint pools: {e}")
+
+    def _setup_recorder(self) -> None:
+        """Send all model requests through the exchange recorder if enabled"""
+        self.exchange_recorder = None
+        if self.record_mode == "off":
+            return
+        try:
+            self.exchange_recorder = get_exchange_recorder(
+                self.record_folder, self.record_mode
+            )
+        except Exception as e:
+            print(f"model_settings.py: Error setting up exchange recorder: {e}")
+            return
+        for name in ("translation_client", "mapping_client", "route_short_client"):
+            client = getattr(self, name)
+            if client is not None:
+                setattr(self, name, RecordingClient(client, self.exchange_recorder))
+        print(f"Recorder: {self.record_mode} exchanges in {self.record_folder}")
+
+    def _setup_route_client(self) -> Any | None:
+        """Setup the client of the short text route when routing is enabled"""
+        self.route_short_client = None
+        if not self.routing:
+            return None
+        try:
+            if self.route_short_method == "OpenAI":
+                self.route_short_client = OpenAI(api_key=self.openai_api_key)
+
+            elif self.route_short_method == "DeepSeek":
+                self.route_short_client = OpenAI(
+                    api_key=self.deepseek_api_key, base_url="https://api.deepseek.com"
+                )
+
+            elif self.route_short_method == "LMStudio":
+                base_url = self.route_short_api_url
+                if not base_url.endswith("/v1") and "/v1/" not in base_url:
+                    base_url = f"{base_url.rstrip('/')}/v1"
+                self.route_short_client = OpenAI(base_url=base_url, api_key="lm-studio")
+                self.route_short_api_url = f"{base_url.rstrip('/')}/chat/completions"
+
+        except Exception as e:
+            print(f"model_settings.py: Error setting up route client: {e}")
+            return None
+
     def _load_gui_config(self) -> None:
         """Load configuration from config_gui.json"""
         try:
@@ -131,3 +293,23 @@ class ModelSettings:
         except Exception as e:
             print(f"Error loading GUI config: {e}")
             self.gui_config = {}
+
+
+# Settings shared by all pipelines of a long-running process (see service.py)
+_shared_model_settings: ModelSettings | None = None
+
+
+def use_shared_model_settings(settings: ModelSettings | None) -> None:
+    """Reuse one ModelSettings instance, its clients and their connection pools.
+
+    Passing None restores loading fresh settings for every pipeline.
+    """
+    global _shared_model_settings
+    _shared_model_settings = settings
+
+
+def get_model_settings() -> ModelSettings:
+    """Return the shared settings if set, otherwise load them from disk."""
+    if _shared_model_settings is not None:
+        return _shared_model_settings
+    return ModelSettings()
@@ -24,6 +24,10 @@ def get_user_config_path():
     os.makedirs(user_dir, exist_ok=True)
     return os.path.join(user_dir, "config_gui.json")
 
+def get_user_data_path(name: str) -> str:
+    """Get path to a file in the user's .slidemob folder without creating it"""
+    return os.path.join(os.path.expanduser("~"), ".slidemob", name)
+
 def get_user_env_path():
     """Get path to user's writable .env file"""
     user_dir = os.path.join(os.path.expanduser("~"), ".slidemob")
@@ -132,7 +132,7 @@ Format your response as:
 
 def mapping_prompt_openai(original_segments, original_text, translated_text):
     return f"""Match each original text segment with its corresponding part from the translation.
-    Original segments: {[text for text in original_segments]}
+    Original segments: {sorted(original_segments)}
     Full original text: {original_text}
     Full translation: {translated_text}
     
@@ -140,6 +140,17 @@ def mapping_prompt_openai(original_segments, original_text, translated_text):
     Only include segments that appear in the original text."""
 
 
+def mapping_prompt_structured(original_segments, original_text, translated_text):
+    return f"""Match each original text segment with its corresponding part from the translation.
+    Original segments: {sorted(original_segments)}
+    Full original text: {original_text}
+    Full translation: {translated_text}
+    
+    Return a JSON object with a "segments" list that contains one object per original segment,
+    with the original segment in "original" and its corresponding translation in "translation".
+    Use an empty translation for a segment whose meaning is fully covered by another segment."""
+
+
 def mapping_prompt_llama2(original_segments, original_text, translated_text):
     system_prompt = """You are a professional text alignment expert, editor and translator.
     Your task is to return a JSON object mapping original text segments to their translations.
@@ -149,7 +160,7 @@ def mapping_prompt_llama2(original_segments, original_text, translated_text):
     {system_prompt}
     <</SYS>>
     
-    Original segments: {[text for text in original_segments]}
+    Original segments: {sorted(original_segments)}
     Full original text: {original_text}
     Full translation: {translated_text}
     
@@ -205,7 +216,7 @@ def mapping_prompt_deepseek(original_segments, original_text, translated_text):
     return f"""You are a text alignment specialist. Map each original segment to its corresponding translation.
 
 Input:
-Original segments: {[text for text in original_segments]}
+Original segments: {sorted(original_segments)}
 
 Context:
 Original text: {original_text}
@@ -228,6 +239,47 @@ Return a valid JSON object with this structure:
 }}
 
 Important: Provide ONLY the JSON output, no explanations."""
+
+
+def translate_and_align_prompt(
+    original_segments, text, target_language, Further_StyleInstructions, reference=None
+):
+    reference_section = ""
+    if reference:
+        reference_section = f"""
+A similar text was translated before, reuse its wording and terminology and only change what differs:
+Similar text: {reference[0]}
+Its translation: {reference[1]}
+"""
+    return f"""You are a professional translator and text alignment expert. Translate the paragraph to {target_language} and map each of its original segments to the matching part of your translation.
+
+Full original text:
+{text}
+{reference_section}
+Original segments: {sorted(original_segments)}
+
+Translation Guidelines:
+1. Translate the text strictly into {target_language}.
+2. Maintain a similar total character length to the original text.
+3. Preserve technical terms, company roles (e.g., Lead, Senior, DataScientist), company names (e.g., Apple, Microsoft) and product names (e.g., iPhone, Windows, LegalAI).
+4. Make the translation sharp, concise and business-like.
+5. Style guidelines: {Further_StyleInstructions}
+
+Alignment Guidelines:
+1. Every original segment must appear as a key in "segments".
+2. The translated segments, joined in order, must form the full translation.
+3. Use an empty string for a segment whose meaning is fully covered by another segment.
+
+Return ONLY a valid JSON object with this structure:
+{{
+    "translation": "full translated text",
+    "segments": {{
+        "original_segment_1": "translated_segment_1",
+        "original_segment_2": "translated_segment_2"
+    }}
+}}"""
+
+
 def translation_prompt_with_markers(text, target_language, Further_StyleInstructions):
     return f"""You are a professional translator. Your task is to translate the following text while preserving special markers that indicate formatting.
 
@@ -250,3 +302,53 @@ Return ONLY the translated text with the markers. Do not include any explanation
 
 <translation>
 """
+
+
+def translation_prompt_with_reference(
+    text, target_language, Further_StyleInstructions, reference_text, reference_translation
+):
+    return f"""Translate the text to {target_language}. A similar text was translated before: reuse its wording and terminology and only change what differs.
+
+Similar text: {reference_text}
+Its translation: {reference_translation}
+
+Style instructions: {Further_StyleInstructions}
+
+<text_to_translate>
+{text}
+</text_to_translate>
+
+Return only the translation within <translation> tags."""
+
+
+def polish_prompt(text, Further_StyleInstructions):
+    return f"""Polish and improve the text strictly following this instructions: 
+        IMPORTANT: If the text is already good, just return it as is.
+        IMPORTANT: If the text is to short, just return it as is.
+        IMPORTANT: For the new text you must not return any other text than the pure polished text.
+        Maintain similar total character length and preserve any special formatting or technical terms. 
+        Keep technical terms. 
+        IMPORTANT: Keep company role- and position names in the translation (e.g., Lead, Senior, DataScientist, CEO, etc.).
+        Keep names of companies in the translation (e.g., Apple, Microsoft, etc.).
+        Keep names of products in the translation (e.g., iPhone, Windows, LegalAI, etc.).
+        Make the text sharp, concise and business-like.
+        {Further_StyleInstructions}
+        IMPORTANT: For the new polished text you must not return any other text than the pure polished text. Rather than mentioning that you could not improve the text, just return the text as is.
+        IMPORTANT: Use the -> format_polished_text tool to return the polished text and the original text for the final response.
+        Here is the text to improve:
+        {text}
+        """
+
+
+# Appended to the polish prompt of models answering with a JSON object
+POLISH_JSON_INSTRUCTION = "Respond with a JSON object containing only a 'polished_text' field with the polished version of this text"
+
+
+def polish_mapping_prompt(original_segments, original_text, polished_text):
+    return f"""Match each original text segment with its corresponding part from the polished text.
+        Original segments: {sorted(original_segments)}
+        Full original text: {original_text}
+        Full polished text: {polished_text}
+
+        Return a JSON object where keys are the original segments and values are their corresponding polished text.
+        Only include segments that appear in the original text."""
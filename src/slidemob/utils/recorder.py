@@ -0,0 +1,173 @@
+from functools import lru_cache
+import hashlib
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+from openai.types.chat import ChatCompletion
+import requests
+from requests.structures import CaseInsensitiveDict
+
+RECORD_MODES = ("off", "record", "replay")
+
+
+class ReplayMissError(LookupError):
+    """A request has no recorded response in replay mode."""
+
+
+class ExchangeRecorder:
+    """Record raw model exchanges and replay them without network access.
+
+    Every exchange is stored as <folder>/<fingerprint>.json, where the
+    fingerprint is a hash of the request (model, messages, sampling options,
+    URL and payload, never the API keys). In record mode requests are sent
+    and their responses stored, in replay mode only the store is read and a
+    missing response raises ReplayMissError.
+    """
+
+    def __init__(self, folder: str, mode: str = "record"):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Unknown record mode: {mode}")
+        self.folder = folder
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(kind: str, request: dict) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [kind, request], ensure_ascii=False, sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def exchange(self, kind: str, request: dict, send, encode, decode):
+        """Send a request or replay its stored response.
+
+        send performs the request, encode turns its response into JSON data
+        and decode restores a response object from that data.
+        """
+        if self.mode == "off":
+            return send()
+        path = os.path.join(self.folder, f"{self.fingerprint(kind, request)}.json")
+
+        if self.mode == "replay":
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                with self.lock:
+                    self.misses += 1
+                raise ReplayMissError(f"No recorded {kind} response for this request")
+            with self.lock:
+                self.replayed += 1
+            return decode(entry["response"])
+
+        response = send()
+        data = encode(response)
+        if data is not None:
+            # Write to a temporary file first so a crash never leaves a broken entry
+            temp_file = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"kind": kind, "request": request, "response": data},
+                    f,
+                    ensure_ascii=False,
+                    default=str,
+                )
+            os.replace(temp_file, path)
+            with self.lock:
+                self.recorded += 1
+        return response
+
+    def chat_completion(self, client, **request):
+        return self.exchange(
+            "chat",
+            request,
+            lambda: client.chat.completions.create(**request),
+            _encode_chat_completion,
+            ChatCompletion.model_validate,
+        )
+
+    def post(self, session, url: str, headers=None, json=None, **kwargs):
+        return self.exchange(
+            "http",
+            {"url": url, "json": json},
+            lambda: session.post(url, headers=headers, json=json, **kwargs),
+            _encode_http_response,
+            _decode_http_response,
+        )
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+class RecordingClient:
+    """OpenAI-compatible client that sends chat completions through a recorder.
+
+    Everything else (files, batches, ...) is forwarded to the wrapped client.
+    """
+
+    def __init__(self, client, recorder: ExchangeRecorder):
+        self.client = client
+        self.recorder = recorder
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        return self.recorder.chat_completion(self.client, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class RecordingSession:
+    """requests session whose POST requests go through a recorder."""
+
+    def __init__(self, session: requests.Session, recorder: ExchangeRecorder):
+        self.session = session
+        self.recorder = recorder
+
+    def post(self, url: str, headers=None, json=None, **kwargs):
+        return self.recorder.post(self.session, url, headers, json, **kwargs)
+
+
+def _encode_chat_completion(response) -> dict | None:
+    # Only real API responses can be restored, anything else is not stored
+    if isinstance(response, ChatCompletion):
+        return response.model_dump(mode="json")
+    return None
+
+
+def _encode_http_response(response) -> dict:
+    return {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "text": response.text,
+        "url": response.url,
+    }
+
+
+def _decode_http_response(data: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = data["status_code"]
+    response.headers = CaseInsensitiveDict(data["headers"])
+    response._content = data["text"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = data["url"]
+    return response
+
+
+@lru_cache(maxsize=None)
+def get_exchange_recorder(folder: str, mode: str) -> ExchangeRecorder:
+    """Return the recorder of a folder, shared by all pipelines of the process."""
+    return ExchangeRecorder(folder, mode)
@@ -1,8 +1,77 @@
 import os
 import tempfile
+import threading
+import time
+from types import SimpleNamespace
 
+from openai.types.chat import ChatCompletion
 import pytest
 
+from slidemob.core_functions.base_class import PowerpointPipeline
+from slidemob.utils.model_settings import ModelSettings
+
+# Keys of a pipeline config, all unset when no folder or file is used
+PIPELINE_KEYS = (
+    "root_folder",
+    "pptx_folder",
+    "pptx_name",
+    "extract_folder",
+    "output_folder",
+    "output_pptx",
+    "target_language",
+)
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions and answers with respond(prompt).
+
+    The arguments of every request are kept and requests in flight are
+    counted. If respond returns None, the backend is not reachable.
+    """
+
+    def __init__(self, respond, delay: float = 0, usage: dict | None = None):
+        self.respond = respond
+        self.delay = delay
+        self.usage = usage
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def prompts(self) -> list[str]:
+        return [request["messages"][-1]["content"] for request in self.requests]
+
+    def create(self, model, messages, **kwargs):
+        with self.lock:
+            self.requests.append({"model": model, "messages": messages, **kwargs})
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            content = self.respond(messages[-1]["content"])
+        finally:
+            with self.lock:
+                self.active -= 1
+        if content is None:
+            raise ConnectionError("backend down")
+        return ChatCompletion.model_validate(
+            {
+                "id": "test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": content},
+                    }
+                ],
+                "usage": self.usage,
+            }
+        )
+
 
 @pytest.fixture()
 def temp_test_dir():
@@ -15,3 +84,40 @@ def temp_test_dir():
 def sample_pptx_path(temp_test_dir):
     """Create a dummy PPTX file path"""
     return os.path.join(temp_test_dir, "test.pptx")
+
+
+@pytest.fixture()
+def fake_client():
+    """Build OpenAI-style clients whose completions answer with respond(prompt)"""
+
+    def fake_client(respond, **options):
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=FakeCompletions(respond, **options))
+        )
+
+    return fake_client
+
+
+@pytest.fixture()
+def make_pipeline():
+    """Build pipelines from explicit settings, no config or file is read from disk.
+
+    gui_config keys are passed as keyword arguments. The client is used for
+    translation and mapping requests, the target language is German.
+    """
+
+    def make_pipeline(
+        pipeline_class=PowerpointPipeline, client=None, api_keys=None, **gui_config
+    ):
+        settings = ModelSettings(
+            gui_config=gui_config, api_keys=api_keys or {"OPENAI_API_KEY": "test"}
+        )
+        if client is not None:
+            settings.translation_client = settings.mapping_client = client
+        pipeline = pipeline_class(
+            pipeline_config=dict.fromkeys(PIPELINE_KEYS), model_settings=settings
+        )
+        pipeline.target_language = "German"
+        return pipeline
+
+    return make_pipeline
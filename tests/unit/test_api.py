@@ -0,0 +1,36 @@
+import io
+import os
+import zipfile
+
+from slidemob.api import process_pptx
+from slidemob.utils.model_settings import ModelSettings
+
+SLIDE_XML = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b"<p:cSld><p:spTree><p:sp><p:txBody><a:p>"
+    b'<a:r><a:rPr lang="en-GB"/><a:t>Hello </a:t></a:r>'
+    b'<a:r><a:rPr lang="en-GB"/><a:t>world</a:t></a:r>'
+    b"</a:p></p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def test_process_pptx_bytes_in_bytes_out(temp_test_dir, monkeypatch):
+    """Decks are processed in memory without touching the user folder"""
+    home = os.path.join(temp_test_dir, "home")
+    os.makedirs(home)
+    monkeypatch.setenv("HOME", home)
+    source = io.BytesIO()
+    with zipfile.ZipFile(source, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        zf.writestr("ppt/slides/slide1.xml", SLIDE_XML)
+    settings = ModelSettings(gui_config={}, api_keys={})
+
+    output = process_pptx(
+        source.getvalue(), settings, merge_runs=True, translate=False
+    )
+
+    with zipfile.ZipFile(io.BytesIO(output)) as zf:
+        assert b"<a:t>Hello world</a:t>" in zf.read("ppt/slides/slide1.xml")
+    assert os.listdir(home) == []
@@ -0,0 +1,197 @@
+import json
+import os
+from types import SimpleNamespace
+import zipfile
+
+from openai import AzureOpenAI
+import pytest
+
+from slidemob.core_functions.batch import (
+    AZURE_BATCH_URL,
+    OPENAI_BATCH_URL,
+    BatchTranslator,
+    LocalBatchEndpoint,
+    OpenAIBatchEndpoint,
+)
+from slidemob.core_functions.document import PresentationDocument
+from slidemob.core_functions.translator import SlideTranslator
+from slidemob.pipelines.batch_pipeline import BatchTranslationPipeline
+from slidemob.utils.endpoint_pool import Endpoint, EndpointPool
+from slidemob.utils.model_settings import ModelSettings
+
+NAMESPACES = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+def test_local_batch_endpoint_round_trip(temp_test_dir):
+    """The file-based endpoint answers every request of a JSONL file"""
+    requests_file = os.path.join(temp_test_dir, "requests.jsonl")
+    with open(requests_file, "w") as f:
+        for custom_id, text in (("p0", "Hello"), ("p1", "World")):
+            body = {"messages": [{"role": "user", "content": text}]}
+            f.write(json.dumps({"custom_id": custom_id, "body": body}) + "\n")
+
+    pending = LocalBatchEndpoint(os.path.join(temp_test_dir, "pending"))
+    assert pending.status(pending.submit(requests_file)) == "in_progress"
+
+    endpoint = LocalBatchEndpoint(
+        os.path.join(temp_test_dir, "stub"),
+        responder=lambda body: body["messages"][0]["content"].upper(),
+    )
+    batch_id = endpoint.submit(requests_file)
+
+    assert endpoint.status(batch_id) == "completed"
+    assert endpoint.results(batch_id) == {"p0": "HELLO", "p1": "WORLD"}
+
+
+def test_openai_batch_endpoint_rejects_endpoint_pools():
+    """A pool of endpoints has no files and batches API to submit to"""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=None))
+    pool = EndpointPool([Endpoint("east", client), Endpoint("west", client)])
+
+    with pytest.raises(ValueError, match="translation_endpoints"):
+        OpenAIBatchEndpoint(pool)
+
+
+def test_batch_pipeline_reports_unsupported_client(temp_test_dir, capsys):
+    """A client without a batch API fails the run with a message, not a traceback"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+    settings = ModelSettings(gui_config={}, api_keys={"OPENAI_API_KEY": "test"})
+    client = SimpleNamespace(chat=SimpleNamespace(completions=None))
+    settings.translation_client = EndpointPool([Endpoint("east", client)])
+    pipeline = BatchTranslationPipeline(
+        [pptx_path],
+        target_language="German",
+        output_folder=os.path.join(temp_test_dir, "out"),
+        model_settings=settings,
+    )
+
+    assert not pipeline.run()
+    output = capsys.readouterr().out
+    assert "Error in batch translation: " in output
+    assert "translation_endpoints" in output
+    assert "Traceback" not in output
+
+
+def test_openai_batch_endpoint_url_follows_client():
+    """Azure deployments take batch requests without the /v1 prefix"""
+    azure = AzureOpenAI(
+        api_key="test",
+        azure_endpoint="https://example.openai.azure.com",
+        api_version="2024-10-21",
+    )
+    client = SimpleNamespace(files=None, batches=None)
+
+    assert OpenAIBatchEndpoint(azure).url == AZURE_BATCH_URL
+    assert OpenAIBatchEndpoint(client).url == OPENAI_BATCH_URL
+    assert OpenAIBatchEndpoint(client, url="/custom/chat").url == "/custom/chat"
+
+
+class _PollingEndpoint(LocalBatchEndpoint):
+    """Reports every batch as in progress on the first poll."""
+
+    def __init__(self, folder, responder):
+        super().__init__(folder, responder)
+        self.polls = {}
+
+    def status(self, batch_id):
+        self.polls[batch_id] = self.polls.get(batch_id, 0) + 1
+        if self.polls[batch_id] == 1:
+            return "in_progress"
+        return super().status(batch_id)
+
+
+def _paragraph(*runs):
+    return "<a:p>" + "".join(f"<a:r><a:t>{run}</a:t></a:r>" for run in runs) + "</a:p>"
+
+
+def _respond(body):
+    prompt = body["messages"][-1]["content"]
+    if body["messages"][0]["content"] == "You are a professional translator.":
+        if "Hello" in prompt:
+            # Valid segments, written back without a mapping request
+            return json.dumps(
+                {
+                    "translation": "Hallo Welt",
+                    "segments": {"Hello": "Hallo", "world": "Welt"},
+                }
+            )
+        if "Good morning" in prompt:
+            return json.dumps({"translation": "Guten Morgen", "segments": {}})
+        if "Thank you" in prompt:
+            return json.dumps({"translation": "Danke", "segments": {"Thank you": None}})
+        # The request for "Fails here" fails
+        return None
+    # Mapping requests
+    if "Good morning" in prompt:
+        return json.dumps({"Good morning": "Guten Morgen"})
+    return json.dumps({"Thank you": 5})
+
+
+def test_batch_translator_translates_documents(make_pipeline, temp_test_dir):
+    """Batches are submitted and polled, failed items keep their original text"""
+    slide = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+        "<p:cSld><p:spTree><p:sp><p:txBody>"
+        + _paragraph("Hello ", "world")
+        + _paragraph("Good morning")
+        + _paragraph("Thank you")
+        + _paragraph("Fails here")
+        + "</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+    )
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        zf.writestr("ppt/slides/slide1.xml", slide.encode())
+    pipeline = make_pipeline()
+    endpoint = _PollingEndpoint(os.path.join(temp_test_dir, "batches"), _respond)
+    batch_translator = BatchTranslator(
+        SlideTranslator(pipeline_settings=pipeline),
+        endpoint,
+        os.path.join(temp_test_dir, "work"),
+        poll_interval=0,
+    )
+    document = PresentationDocument.from_pptx(pptx_path)
+
+    assert batch_translator.translate_documents([document])
+
+    # One translation and one mapping batch, each polled until completed
+    assert list(endpoint.polls.values()) == [2, 2]
+    with open(os.path.join(temp_test_dir, "work", "translate_requests.jsonl")) as f:
+        assert {json.loads(line)["url"] for line in f} == {OPENAI_BATCH_URL}
+    root = document.get_root("ppt/slides/slide1.xml")
+    assert [node.text for node in root.iterfind(".//a:t", NAMESPACES)] == [
+        "Hallo ",
+        "Welt",
+        "Guten Morgen",
+        "Thank you",
+        "Fails here",
+    ]
+
+
+def test_batch_requests_use_the_reasoning_budget(make_pipeline):
+    """Batch bodies are built like online requests, without a temperature for o-series models"""
+    pipeline = make_pipeline(
+        translation_model="o3-mini",
+        mapping_model="gpt-4o",
+        reasoning_effort={"translation": "low"},
+        reasoning_max_tokens={"translation": 4000, "mapping": 500},
+    )
+    batch_translator = BatchTranslator(
+        SlideTranslator(pipeline_settings=pipeline), None, "unused"
+    )
+    paragraph = {"text": "Hello world", "candidates": {"Hello world"}}
+
+    translation = batch_translator._translation_request(paragraph)
+    mapping = batch_translator._mapping_request({**paragraph, "translation": "Hallo"})
+
+    assert translation["model"] == "o3-mini"
+    assert "temperature" not in translation
+    assert translation["reasoning_effort"] == "low"
+    assert translation["max_completion_tokens"] == 4000
+    assert translation["response_format"] == {"type": "json_object"}
+    assert mapping["model"] == "gpt-4o"
+    assert mapping["temperature"] == 0.3
+    assert mapping["max_tokens"] == 500
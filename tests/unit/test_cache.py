@@ -0,0 +1,37 @@
+import os
+
+from slidemob.core_functions.utils.cache import TranslationCache
+
+
+def test_translation_cache_flushes_in_batches(temp_test_dir):
+    """Entries are only written to disk on flush when autosave is off"""
+    cache_file = os.path.join(temp_test_dir, "memory.json")
+    cache = TranslationCache(cache_file, autosave=False)
+    key = TranslationCache.make_key("German", "Hello world", ["Hello", "world"])
+
+    cache.set(key, "Hallo Welt", {"Hello": "Hallo", "world": "Welt"})
+    assert cache.get(key) == "Hallo Welt"
+    assert not os.path.exists(cache_file)
+
+    cache.flush()
+    reloaded = TranslationCache(cache_file)
+    assert reloaded.get_entry(key)["segments"] == {"Hello": "Hallo", "world": "Welt"}
+
+
+def test_translation_cache_finds_similar_sources(temp_test_dir):
+    """Entries with a source are found by similarity within their context"""
+    cache = TranslationCache(os.path.join(temp_test_dir, "memory.json"), autosave=False)
+    cache.set("a", "Ergebnisse Q3 2024", source="Q3 2024 results", context="German")
+    cache.set("b", "Résultats T3 2024", source="Q3 2024 results", context="French")
+
+    similarity, entry = cache.find_similar("German", "Q4 2024 results", 0.6)
+    assert entry["translation"] == "Ergebnisse Q3 2024"
+    assert 0.6 <= similarity < 1
+
+    # Entries added after the index was built are found as well
+    cache.set("c", "Ergebnisse Q4 2024", source="Q4 2024 results", context="German")
+    assert cache.find_similar("German", "Q4 2024 results", 0.6) == (
+        1.0,
+        cache.get_entry("c"),
+    )
+    assert cache.find_similar("Spanish", "Q4 2024 results", 0.6) is None
@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from slidemob.core_functions.coalescing import SingleFlight
+
+
+def test_single_flight_shares_in_flight_call():
+    """Concurrent callers of one key share a single call and its result"""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return "Hallo"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", call)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while flight.summary()["hits"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("Hallo", False)] + [("Hallo", True)] * 3
+    assert flight.summary() == {"calls": 1, "hits": 3}
+    # The key is released once the call is done
+    assert flight.do("key", lambda: "Hi") == ("Hi", False)
+
+
+def test_single_flight_releases_key_on_error():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("API down")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "ok") == ("ok", False)
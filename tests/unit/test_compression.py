@@ -0,0 +1,65 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from slidemob.core_functions.compression import write_members
+
+
+def test_parallel_compression_round_trip(temp_test_dir):
+    """Members deflated in threads are readable and keep their order"""
+    members = [(f"ppt/slides/slide{n}.xml", b"<p:sld>%d</p:sld>" % n * 500) for n in range(20)]
+    media_path = os.path.join(temp_test_dir, "image.png")
+    with open(media_path, "wb") as f:
+        f.write(os.urandom(10000))
+    members.append(("ppt/media/image1.png", media_path))
+
+    output_path = os.path.join(temp_test_dir, "deck.pptx")
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        write_members(zf, members, level=9, threads=4)
+
+    with zipfile.ZipFile(output_path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [name for name, _ in members]
+        assert zf.read("ppt/slides/slide3.xml") == members[3][1]
+        assert zf.getinfo("ppt/slides/slide3.xml").compress_size < len(members[3][1])
+        with open(media_path, "rb") as f:
+            assert zf.read("ppt/media/image1.png") == f.read()
+
+
+class _Unseekable(io.RawIOBase):
+    """A write-only stream without seek or tell, like a pipe or a socket."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+@pytest.mark.parametrize("threads", [1, 4])
+def test_compression_round_trip_to_file_object(seekable, threads):
+    """Archives written to seekable and unseekable targets pass testzip"""
+    members = [(f"ppt/slides/slide{n}.xml", b"<p:sld>%d</p:sld>" % n * 200) for n in range(12)]
+    target = io.BytesIO() if seekable else _Unseekable()
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        write_members(zf, members, level=6, threads=threads)
+        zf.writestr("docProps/app.xml", b"<Properties/>")
+
+    data = target.getvalue() if seekable else bytes(target.buffer)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == (
+            ["[Content_Types].xml"] + [name for name, _ in members] + ["docProps/app.xml"]
+        )
+        for name, content in members:
+            assert zf.read(name) == content
+        assert zf.read("docProps/app.xml") == b"<Properties/>"
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import zipfile
+
+from slidemob.core_functions.document import PresentationDocument, StreamingPresentation
+
+SLIDE_XML = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b"<p:cSld><p:spTree><p:sp><p:txBody><a:p><a:r><a:t>Hello</a:t></a:r></a:p>"
+    b"</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def _write_pptx(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        zf.writestr("ppt/slides/slide10.xml", SLIDE_XML)
+        zf.writestr("ppt/slides/slide2.xml", SLIDE_XML)
+        zf.writestr("ppt/media/image1.png", b"\x89PNG")
+
+
+def test_document_orders_slides_numerically(temp_test_dir):
+    """Slides are returned in slide number order"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    _write_pptx(pptx_path)
+
+    document = PresentationDocument.from_pptx(pptx_path)
+
+    assert document.slide_names() == [
+        "ppt/slides/slide2.xml",
+        "ppt/slides/slide10.xml",
+    ]
+
+
+def test_document_saves_modified_slides_once(temp_test_dir):
+    """Changes to the parsed trees end up in the composed PPTX"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    output_path = os.path.join(temp_test_dir, "out", "deck_out.pptx")
+    _write_pptx(pptx_path)
+
+    document = PresentationDocument.from_pptx(pptx_path)
+    root = document.get_root("ppt/slides/slide2.xml")
+    root.find(
+        ".//a:t", {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+    ).text = "Hallo"
+    assert document.get_root("ppt/slides/slide2.xml") is root
+    document.save(output_path)
+
+    with zipfile.ZipFile(output_path) as zf:
+        assert zf.namelist()[0] == "[Content_Types].xml"
+        assert b"<a:t>Hallo</a:t>" in zf.read("ppt/slides/slide2.xml")
+        assert b"standalone='yes'" in zf.read("ppt/slides/slide2.xml")
+        assert zf.read("ppt/slides/slide10.xml") == SLIDE_XML
+        assert zf.read("ppt/media/image1.png") == b"\x89PNG"
+
+
+def test_streaming_processes_slides_in_order(temp_test_dir):
+    """Streaming writes every slide and removes the output when aborted"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    output_path = os.path.join(temp_test_dir, "out", "deck_out.pptx")
+    _write_pptx(pptx_path)
+    namespaces = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+    seen = []
+
+    def translate(name, root):
+        seen.append(name)
+        root.find(".//a:t", namespaces).text = "Hallo"
+
+    stream = StreamingPresentation(pptx_path, max_slides_in_flight=2)
+    assert stream.process(output_path, translate)
+
+    assert seen == ["ppt/slides/slide2.xml", "ppt/slides/slide10.xml"]
+    with zipfile.ZipFile(output_path) as zf:
+        assert zf.namelist()[0] == "[Content_Types].xml"
+        assert b"<a:t>Hallo</a:t>" in zf.read("ppt/slides/slide10.xml")
+        assert zf.read("ppt/media/image1.png") == b"\x89PNG"
+
+    assert not stream.process(output_path, lambda name, root: False)
+    assert not os.path.exists(output_path)
+
+
+def test_streaming_overlaps_slides_within_the_cap(temp_test_dir):
+    """Slides are transformed concurrently and still written in slide order"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    output_path = os.path.join(temp_test_dir, "deck_out.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        for number in range(1, 9):
+            zf.writestr(f"ppt/slides/slide{number}.xml", SLIDE_XML)
+    lock = threading.Lock()
+    active = []
+    overlap = []
+
+    def translate(name, root):
+        with lock:
+            active.append(name)
+            overlap.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(name)
+
+    stream = StreamingPresentation(pptx_path, max_slides_in_flight=3, workers=3)
+    assert stream.process(output_path, translate)
+
+    assert 1 < max(overlap) <= 3
+    with zipfile.ZipFile(output_path) as zf:
+        assert zf.namelist()[1:] == [f"ppt/slides/slide{n}.xml" for n in range(1, 9)]
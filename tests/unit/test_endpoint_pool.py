@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from slidemob.utils.endpoint_pool import Endpoint, EndpointPool
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = None
+
+
+def _client(name, calls, fail=False):
+    def create(**kwargs):
+        calls.append((name, kwargs["model"]))
+        if fail:
+            raise RateLimited("Too many requests")
+        return name
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_endpoint_pool_ejects_rate_limited_endpoint():
+    """A 429 ejects the endpoint and the request is retried on the next one"""
+    calls = []
+    pool = EndpointPool(
+        [
+            Endpoint("east", _client("east", calls, fail=True), model="gpt-4o-east"),
+            Endpoint("west", _client("west", calls)),
+        ]
+    )
+
+    assert pool.chat.completions.create(model="gpt-4o", messages=[]) == "west"
+    assert pool.chat.completions.create(model="gpt-4o", messages=[]) == "west"
+    assert calls == [("east", "gpt-4o-east"), ("west", "gpt-4o"), ("west", "gpt-4o")]
+    assert pool.summary()["east"] == {"requests": 1, "failures": 1}
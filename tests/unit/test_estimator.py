@@ -0,0 +1,126 @@
+from lxml import etree as ET
+
+from slidemob.core_functions.estimator import (
+    LatencyHistory,
+    RunEstimate,
+    count_message_tokens,
+    count_tokens,
+)
+from slidemob.core_functions.translator import SlideTranslator
+
+PRICING = {"gpt-4o": {"input": 2.5, "output": 10.0}}
+
+SLIDE_XML = (
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b"<p:cSld><p:spTree><p:sp><p:txBody>"
+    b"<a:p><a:r><a:t>Agenda</a:t></a:r></a:p>"
+    b"<a:p><a:r><a:t>Revenue grew in every region</a:t></a:r></a:p>"
+    b"<a:p><a:r><a:t>31.03.2024</a:t></a:r></a:p>"
+    b"</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def test_latency_history_persists_recent_latencies(tmp_path):
+    history_file = str(tmp_path / "latency_history.json")
+    history = LatencyHistory(history_file, window=5)
+    for seconds in (1, 2, 3, 4):
+        history.record("translation", "gpt-4o", seconds)
+    # Too few samples for an estimate
+    assert history.median("translation", "gpt-4o") is None
+
+    for seconds in (5, 6, 7):
+        history.record("translation", "gpt-4o", seconds)
+    history.flush()
+
+    reloaded = LatencyHistory(history_file)
+    assert reloaded.samples == {"translation:gpt-4o": [3, 4, 5, 6, 7]}
+    assert reloaded.median("translation", "gpt-4o") == 5
+
+
+def test_run_estimate_counts_tokens_cost_and_time(tmp_path):
+    history = LatencyHistory(str(tmp_path / "latency_history.json"))
+    for _ in range(5):
+        history.record("translation", "gpt-4o", 2.0)
+    estimate = RunEstimate(PRICING, history, concurrency=2)
+    messages = [{"role": "user", "content": "Translate: Hello world"}]
+
+    for _ in range(3):
+        estimate.add_request("translation", "OpenAI", "gpt-4o", messages, "Hallo Welt")
+    estimate.add_request("mapping", "OpenAI", "local-model", messages, "{}")
+    estimate.add_request("translation", "Google", "", messages, "Hallo Welt")
+    estimate.count_paragraph("sent")
+
+    summary = estimate.summary()
+    prompt_tokens = count_message_tokens(messages, "gpt-4o")
+    completion_tokens = count_tokens("Hallo Welt", "gpt-4o")
+    assert summary["requests"] == 5
+    assert summary["stages"][("translation", "OpenAI", "gpt-4o")] == {
+        "requests": 3,
+        "prompt_tokens": 3 * prompt_tokens,
+        "completion_tokens": 3 * completion_tokens,
+    }
+    # Google translations are free and use no tokens
+    assert summary["stages"][("translation", "Google", "")]["prompt_tokens"] == 0
+    assert summary["cost"] == (
+        3 * prompt_tokens * 2.5 + 3 * completion_tokens * 10.0
+    ) / 1_000_000
+    assert summary["unpriced_models"] == ["local-model"]
+    assert summary["paragraphs"] == {"sent": 1}
+    # Three requests of 2 s from the history and two without history, two at a time
+    without_history = 0.5 + count_tokens("{}", "local-model") / 50 + 0.5
+    assert summary["wall_seconds"] == (3 * 2.0 + without_history) / 2
+
+
+def test_translation_estimate_follows_routes_without_counting_skips(make_pipeline):
+    """Estimates use the backend of each route and leave the skip counters alone"""
+    pipeline = make_pipeline(
+        translation_model="gpt-4o",
+        routing=True,
+        route_short_method="OpenAI",
+        route_short_model="gpt-4o-mini",
+        route_short_max_length=10,
+    )
+    translator = SlideTranslator(pipeline_settings=pipeline)
+    estimate = RunEstimate(PRICING)
+
+    translator.estimate_slide(ET.fromstring(SLIDE_XML), estimate, set())
+
+    summary = estimate.summary()
+    assert summary["paragraphs"] == {"sent": 2, "pre_filter": 1}
+    assert summary["stages"][("translation", "OpenAI", "gpt-4o-mini")]["requests"] == 1
+    assert summary["stages"][("translation", "OpenAI", "gpt-4o")]["requests"] == 1
+    assert not translator.pre_filter.summary()
+
+
+def test_latency_history_is_off_by_default(make_pipeline):
+    """Runs only keep latencies in the user folder when asked to"""
+    assert make_pipeline().latency_history is None
+
+
+def test_translation_estimate_uses_effective_concurrency(make_pipeline):
+    """Slide workers are capped by the default route and the endpoint count"""
+
+    def translator(**gui_config):
+        pipeline = make_pipeline(translation_model="gpt-4o", **gui_config)
+        return SlideTranslator(pipeline_settings=pipeline)
+
+    endpoints = [
+        {"base_url": "http://localhost:8001/v1", "api_key": "test"},
+        {"base_url": "http://localhost:8002/v1", "api_key": "test"},
+    ]
+
+    assert translator().estimate_concurrency() == 1
+    assert translator(slide_workers=6).estimate_concurrency() == 6
+    assert (
+        translator(
+            slide_workers=6, routing=True, route_concurrency={"default": 3}
+        ).estimate_concurrency()
+        == 3
+    )
+    assert (
+        translator(
+            slide_workers=6, translation_endpoints=endpoints
+        ).estimate_concurrency()
+        == 2
+    )
@@ -0,0 +1,29 @@
+from slidemob.core_functions.utils.fuzzy_index import FuzzyIndex, char_ngrams
+
+
+def _jaccard(a, b):
+    a, b = char_ngrams(a.casefold()), char_ngrams(b.casefold())
+    return len(a & b) / len(a | b)
+
+
+def test_fuzzy_index_finds_most_similar_segment():
+    """Prefix filtering returns the same best match as a full scan"""
+    texts = [
+        "Q3 2024 results",
+        "Revenue grew in every region",
+        "Revenue fell in every region",
+        "Next steps for the sales team",
+        "Agenda",
+    ]
+    index = FuzzyIndex.build(((text, n) for n, text in enumerate(texts)), 0.5)
+
+    similarity, text, value = index.best_match("Q4 2024 results", 0.5)
+    assert value == 0
+    assert similarity == _jaccard("Q4 2024 results", "Q3 2024 results")
+
+    assert index.best_match("REVENUE GREW  in every region", 0.9)[0] == 1.0
+    assert index.best_match("Revenue grew in each region", 0.5)[2] == 1
+    assert index.best_match("Completely unrelated words", 0.5) is None
+
+    index.add("Next steps for the marketing team", 5)
+    assert index.best_match("Next steps for the marketing teams", 0.8)[2] == 5
@@ -0,0 +1,20 @@
+import time
+
+from slidemob.core_functions.hedging import HedgedCaller
+
+
+def test_hedged_caller_uses_faster_duplicate():
+    """A call slower than the latency percentile is raced by a duplicate"""
+    hedger = HedgedCaller(percentile=50, max_hedge_ratio=0.5)
+    for _ in range(10):
+        hedger.tracker.record(0.01)
+    hedger.calls = 10
+
+    def slow():
+        time.sleep(0.5)
+        return "slow"
+
+    start = time.perf_counter()
+    assert hedger.call(slow, lambda: "fast") == "fast"
+    assert time.perf_counter() - start < 0.4
+    assert hedger.summary() == {"calls": 11, "hedged": 1, "hedges_won": 1}
@@ -0,0 +1,54 @@
+from slidemob.core_functions.document import PresentationDocument
+from slidemob.core_functions.memory_import import align_documents, run_mapping
+
+NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+}
+
+
+def _slide(*shapes):
+    body = "".join(
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name=""/></p:nvSpPr><p:txBody>'
+        + "".join(
+            "<a:p>" + "".join(f"<a:r><a:t>{run}</a:t></a:r>" for run in runs) + "</a:p>"
+            for runs in paragraphs
+        )
+        + "</p:txBody></p:sp>"
+        for shape_id, paragraphs in shapes
+    )
+    return (
+        f'<p:sld xmlns:a="{NAMESPACES["a"]}" xmlns:p="{NAMESPACES["p"]}">'
+        f"<p:cSld><p:spTree>{body}</p:spTree></p:cSld></p:sld>"
+    ).encode()
+
+
+def test_align_documents_by_shape_and_paragraph():
+    """Paragraphs are paired by slide, shape id and paragraph index"""
+    source = PresentationDocument(
+        {
+            "ppt/slides/slide1.xml": _slide(
+                ("2", [["Quarterly results"]]),
+                ("3", [["Revenue ", "grew"], ["Next steps"], ["12.5 %"]]),
+            )
+        }
+    )
+    # Shapes in another order, one paragraph merged into a single run
+    translated = PresentationDocument(
+        {
+            "ppt/slides/slide1.xml": _slide(
+                ("3", [["Umsatz stieg"], ["Nächste Schritte"], ["12.5 %"]]),
+                ("2", [["Quartalsergebnisse"]]),
+            )
+        }
+    )
+
+    pairs = align_documents(source, translated, NAMESPACES)
+
+    assert [(source.text, translation.text) for source, translation in pairs] == [
+        ("Quarterly results", "Quartalsergebnisse"),
+        ("Revenue grew", "Umsatz stieg"),
+        ("Next steps", "Nächste Schritte"),
+    ]
+    assert run_mapping(*pairs[0]) == {"Quarterly results": "Quartalsergebnisse"}
+    assert run_mapping(*pairs[1]) == {"Revenue": "Umsatz stieg", "grew": ""}
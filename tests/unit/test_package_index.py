@@ -0,0 +1,52 @@
+import os
+import zipfile
+
+from slidemob.core_functions.package_index import get_package_index
+
+SLIDE_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+LAYOUT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"
+)
+
+PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        f'<Override PartName="/ppt/slides/slide2.xml" ContentType="{SLIDE_TYPE}"/>'
+        f'<Override PartName="/ppt/slides/slide3.xml" ContentType="{SLIDE_TYPE}"/>'
+        f'<Override PartName="/ppt/slideLayouts/slideLayout1.xml" ContentType="{LAYOUT_TYPE}"/>'
+        "</Types>"
+    ),
+    "ppt/presentation.xml": (
+        '<p:presentation xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<p:sldIdLst><p:sldId id="256" r:id="rId3"/><p:sldId id="257" r:id="rId2"/>'
+        "</p:sldIdLst></p:presentation>"
+    ),
+    "ppt/_rels/presentation.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId2" Target="slides/slide2.xml"/>'
+        '<Relationship Id="rId3" Target="slides/slide3.xml"/>'
+        "</Relationships>"
+    ),
+    "ppt/slides/slide2.xml": '<p:sld xmlns:p="urn:p" xmlns:a="urn:a"/>',
+    "ppt/slides/slide3.xml": '<p:sld xmlns:p="urn:p" xmlns:a="urn:a" xmlns:x="urn:x"/>',
+    "ppt/media/image1.png": "",
+}
+
+
+def test_package_index_of_zip_and_folder(temp_test_dir):
+    """Slides follow the presentation order, also without a slide1"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    folder = os.path.join(temp_test_dir, "extracted")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        for name, content in PARTS.items():
+            zf.writestr(name, content)
+    with zipfile.ZipFile(pptx_path) as zf:
+        zf.extractall(folder)
+
+    for source in (pptx_path, folder):
+        index = get_package_index(source)
+        assert index.slides == ["ppt/slides/slide3.xml", "ppt/slides/slide2.xml"]
+        assert index.layouts == ["ppt/slideLayouts/slideLayout1.xml"]
+        assert index.namespaces == {"p": "urn:p", "a": "urn:a", "x": "urn:x"}
+        assert get_package_index(source) is index
@@ -0,0 +1,47 @@
+from lxml import etree as ET
+
+from slidemob.core_functions.parallel import map_slides, merge_slide_xml
+
+NAMESPACES = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+SLIDE = (
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="urn:p"><a:p>'
+    b'<a:r><a:rPr lang="en-US" b="1"/><a:t>Hello </a:t></a:r>'
+    b'<a:r><a:rPr lang="en-US" b="1"/><a:t>World</a:t></a:r>'
+    b"<a:br/>"
+    b'<a:r><a:rPr lang="en-US" b="1"/><a:t>Next</a:t></a:r>'
+    b'<a:r><a:rPr lang="en-US" b="1"><a:solidFill/></a:rPr><a:t>red</a:t></a:r>'
+    b"</a:p></p:sld>"
+)
+
+
+def test_merge_slides_in_process_pool():
+    """Similar adjacent runs are merged, breaks and different fills are kept"""
+    merged = map_slides(
+        merge_slide_xml, {"one": SLIDE, "two": SLIDE}, 2, namespaces=NAMESPACES
+    )
+
+    assert merged["one"] == merged["two"]
+    root = ET.fromstring(merged["one"])
+    texts = [node.text for node in root.iterfind(".//a:t", NAMESPACES)]
+    assert texts == ["Hello World", "Next", "red"]
+
+
+def test_merge_keeps_subscript_and_strike_runs():
+    """Runs differing in baseline or strike stay separate, proofing flags do not matter"""
+    slide = (
+        b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        b'xmlns:p="urn:p"><a:p>'
+        b'<a:r><a:rPr lang="en-US"/><a:t>H</a:t></a:r>'
+        b'<a:r><a:rPr lang="en-US" baseline="-25000"/><a:t>2</a:t></a:r>'
+        b'<a:r><a:rPr lang="en-US" strike="sngStrike"/><a:t>O</a:t></a:r>'
+        b'<a:r><a:rPr lang="en-US" err="1" dirty="0"/><a:t> water</a:t></a:r>'
+        b'<a:r><a:rPr lang="de-DE" noProof="1"/><a:t> flows</a:t></a:r>'
+        b"</a:p></p:sld>"
+    )
+
+    root = ET.fromstring(merge_slide_xml(slide, NAMESPACES))
+
+    texts = [node.text for node in root.iterfind(".//a:t", NAMESPACES)]
+    assert texts == ["H", "2", "O", " water flows"]
@@ -0,0 +1,123 @@
+import ast
+import json
+import re
+
+from lxml import etree as ET
+import pytest
+
+from slidemob.core_functions.polisher import SlidePolisher
+
+NAMESPACES = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+
+def _respond(polish, run_mapping=None):
+    """Polish paragraphs with a function and map their runs to the result.
+
+    Runs are mapped to their polished text unless a polished run text is
+    given in run_mapping.
+    """
+    run_mapping = run_mapping or {}
+
+    def respond(prompt):
+        if prompt.startswith("Match each original text segment"):
+            segments = ast.literal_eval(
+                re.search(r"Original segments: (\[.*?\])\n", prompt).group(1)
+            )
+            return json.dumps(
+                {segment: run_mapping.get(segment, polish(segment)) for segment in segments}
+            )
+        return polish(prompt.split("Here is the text to improve:")[1].strip())
+
+    return respond
+
+
+@pytest.fixture()
+def polisher(make_pipeline):
+    def polisher(client, polish_min_length=20, polish_concurrency=4):
+        return make_pipeline(
+            SlidePolisher,
+            client=client,
+            translation_model="gpt-4",
+            polish_concurrency=polish_concurrency,
+            polish_min_length=polish_min_length,
+        )
+
+    return polisher
+
+
+def _slide(*paragraphs):
+    body = "".join(
+        "<a:p>" + "".join(f"<a:r><a:t>{run}</a:t></a:r>" for run in runs) + "</a:p>"
+        for runs in paragraphs
+    )
+    return ET.fromstring(
+        '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+        f"<p:cSld><p:spTree><p:sp><p:txBody>{body}</p:txBody></p:sp>"
+        "</p:spTree></p:cSld></p:sld>"
+    )
+
+
+def _paragraph_texts(root):
+    return [
+        [node.text for node in paragraph.iterfind("a:r/a:t", NAMESPACES)]
+        for paragraph in root.iterfind(".//a:p", NAMESPACES)
+    ]
+
+
+def test_polisher_polishes_paragraphs_concurrently(polisher, fake_client):
+    """Every paragraph gets its own polished runs, short ones are not sent"""
+    client = fake_client(_respond(str.upper), delay=0.02)
+    paragraphs = [[f"Paragraph number {index} of the slide"] for index in range(8)]
+    root = _slide(*paragraphs, ["Agenda"])
+
+    polisher(client).polish_slide(root)
+
+    assert _paragraph_texts(root) == [[text.upper()] for [text] in paragraphs] + [
+        ["Agenda"]
+    ]
+    completions = client.chat.completions
+    assert not any("Agenda" in prompt for prompt in completions.prompts)
+    assert 1 < completions.max_active <= 4
+
+
+def test_polisher_removes_emptied_runs(polisher, fake_client):
+    """Runs mapped to an empty text are removed, other runs get their polished text"""
+    client = fake_client(
+        _respond(
+            lambda text: "Crucial results for the region",
+            run_mapping={
+                "Very": "",
+                "important results for the region": "Crucial results for the region",
+            },
+        )
+    )
+    root = _slide(["Very ", "important results for the region"])
+
+    polisher(client, polish_min_length=5).polish_slide(root)
+
+    assert _paragraph_texts(root) == [["Crucial results for the region"]]
+
+
+def test_polisher_keeps_paragraph_mapped_to_nothing(polisher, fake_client):
+    """A paragraph is never emptied completely"""
+    client = fake_client(
+        _respond(lambda text: "Results", run_mapping={"Quarterly results": ""})
+    )
+    root = _slide(["Quarterly results"])
+
+    polisher(client, polish_min_length=5).polish_slide(root)
+
+    assert _paragraph_texts(root) == [["Quarterly results"]]
+
+
+def test_polisher_polishes_one_at_a_time_without_concurrency(polisher, fake_client):
+    """A concurrency of 0 still polishes every paragraph"""
+    client = fake_client(_respond(str.upper))
+    paragraphs = [[f"Paragraph number {index} of the slide"] for index in range(3)]
+    root = _slide(*paragraphs)
+
+    polisher(client, polish_concurrency=0).polish_slide(root)
+
+    assert _paragraph_texts(root) == [[text.upper()] for [text] in paragraphs]
+    assert client.chat.completions.max_active == 1
@@ -0,0 +1,126 @@
+import ast
+import json
+import os
+import re
+import zipfile
+
+from slidemob.pipelines.presentation_pipeline import PresentationPipeline
+from slidemob.utils.model_settings import ModelSettings
+from slidemob.utils.recorder import RecordingClient
+
+SLIDE_XML = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b"<p:cSld><p:spTree><p:sp><p:txBody>"
+    b"<a:p><a:r><a:t>This sentence is rather long and wordy</a:t></a:r></a:p>"
+    b"</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def _polish(prompt):
+    """Polish every paragraph to a fixed text and map its runs to it."""
+    if prompt.startswith("Match each original text segment"):
+        return json.dumps({"This sentence is rather long and wordy": "A short sentence"})
+    return "A short sentence"
+
+
+def test_streaming_polishes_with_the_given_settings(temp_test_dir, fake_client):
+    """The streaming polisher uses the pipeline's settings and client"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    output_path = os.path.join(temp_test_dir, "out", "deck_out.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        zf.writestr("ppt/slides/slide1.xml", SLIDE_XML)
+    settings = ModelSettings(
+        gui_config={"streaming_mode": True, "translation_model": "gpt-4"},
+        api_keys={"OPENAI_API_KEY": "test"},
+    )
+    settings.translation_client = fake_client(_polish)
+    pipeline = PresentationPipeline(
+        polish=True,
+        translate=False,
+        pipeline_config={
+            "root_folder": temp_test_dir,
+            "pptx_folder": temp_test_dir,
+            "pptx_name": pptx_path,
+            "extract_folder": os.path.join(temp_test_dir, "extract"),
+            "output_folder": os.path.dirname(output_path),
+            "output_pptx": output_path,
+            "target_language": "German",
+        },
+        model_settings=settings,
+    )
+
+    assert pipeline.run()
+
+    with zipfile.ZipFile(output_path) as zf:
+        assert b"<a:t>A short sentence</a:t>" in zf.read("ppt/slides/slide1.xml")
+
+
+def _upper(prompt):
+    """Translate to upper case."""
+    segments = re.search(r"Original segments: (\[.*?\])\n", prompt)
+    if segments:
+        return json.dumps(
+            {segment: segment.upper() for segment in ast.literal_eval(segments.group(1))}
+        )
+    return "<translation>THIS SENTENCE IS RATHER LONG AND WORDY</translation>"
+
+
+def test_replay_translates_slides_in_process_pool(temp_test_dir, fake_client):
+    """A recorded run is replayed by worker processes without any request"""
+    pptx_path = os.path.join(temp_test_dir, "deck.pptx")
+    with zipfile.ZipFile(pptx_path, "w") as zf:
+        zf.writestr("[Content_Types].xml", b"<Types/>")
+        for number in (1, 2, 3):
+            zf.writestr(f"ppt/slides/slide{number}.xml", SLIDE_XML)
+    gui_config = {
+        "translation_model": "replay-model",
+        "mapping_model": "replay-model",
+        "coalesce_requests": False,
+        "record_folder": os.path.join(temp_test_dir, "recordings"),
+    }
+    api_keys = {"OPENAI_API_KEY": "test"}
+
+    def run(record_mode, cpu_workers, output_name):
+        settings = ModelSettings(
+            gui_config={
+                **gui_config,
+                "record_mode": record_mode,
+                "cpu_workers": cpu_workers,
+            },
+            api_keys=api_keys,
+        )
+        if record_mode == "record":
+            client = RecordingClient(upper_client, settings.exchange_recorder)
+            settings.translation_client = settings.mapping_client = client
+        output_path = os.path.join(temp_test_dir, output_name)
+        pipeline = PresentationPipeline(
+            pipeline_config={
+                "root_folder": temp_test_dir,
+                "pptx_folder": temp_test_dir,
+                "pptx_name": pptx_path,
+                "extract_folder": os.path.join(temp_test_dir, "extract"),
+                "output_folder": temp_test_dir,
+                "output_pptx": output_path,
+                "target_language": "German",
+            },
+            model_settings=settings,
+        )
+        assert pipeline.run()
+        with zipfile.ZipFile(output_path) as zf:
+            slides = [zf.read(f"ppt/slides/slide{number}.xml") for number in (1, 2, 3)]
+        return slides, settings.exchange_recorder
+
+    upper_client = fake_client(_upper)
+    recorded, _ = run("record", 1, "recorded.pptx")
+    requests = len(upper_client.chat.completions.requests)
+
+    replayed, recorder = run("replay", 2, "replayed.pptx")
+
+    assert len(upper_client.chat.completions.requests) == requests
+    # The responses were replayed by the workers, not by this process
+    assert recorder.summary()["replayed"] == 0
+    assert replayed == recorded
+    assert b"<a:t>THIS SENTENCE IS RATHER LONG AND WORDY</a:t>" in replayed[0]
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from slidemob.core_functions.reasoning import TokenUsage, completion_budget_kwargs
+from slidemob.core_functions.translator import SlideTranslator
+
+
+def test_budget_kwargs_per_backend():
+    """OpenAI reasoning models get an effort and no temperature, others max_tokens"""
+    effort = {"mapping": "minimal"}
+    limits = {"mapping": 1000}
+    assert completion_budget_kwargs("mapping", True, "OpenAI", 0.3, effort, limits) == {
+        "reasoning_effort": "minimal",
+        "max_completion_tokens": 1000,
+    }
+    assert completion_budget_kwargs("mapping", True, "LMStudio", 0.3, effort, limits) == {
+        "temperature": 0.3,
+        "max_tokens": 1000,
+    }
+    assert completion_budget_kwargs("translation", False, "OpenAI", 0.3, effort, limits) == {
+        "temperature": 0.3
+    }
+
+
+def test_token_usage_estimates_local_reasoning():
+    """Reasoning tokens are read from the usage or estimated from <think> blocks"""
+    usage = TokenUsage()
+
+    def response(content, reasoning_tokens=None):
+        details = SimpleNamespace(reasoning_tokens=reasoning_tokens)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=10, completion_tokens=20, completion_tokens_details=details
+            ),
+        )
+
+    usage.record("translation", "o3-mini", response("Hallo", reasoning_tokens=12))
+    usage.record("translation", "qwen3", response("<think>" + "x" * 40 + "</think>Hallo"))
+    summary = usage.summary()
+    assert summary[("translation", "o3-mini")]["reasoning_tokens"] == 12
+    assert summary[("translation", "qwen3")]["reasoning_tokens"] == 10
+    assert summary[("translation", "qwen3")]["estimated_reasoning_tokens"] == 10
+
+
+def test_azure_translation_goes_through_the_shared_request_path(
+    make_pipeline, fake_client
+):
+    """Azure translations use the request path and token counters of the other backends"""
+    client = fake_client(
+        lambda prompt: " Hallo Welt ",
+        usage={"prompt_tokens": 30, "completion_tokens": 5, "total_tokens": 35},
+    )
+    pipeline = make_pipeline(
+        client=client,
+        api_keys={
+            "AZURE_OPENAI_ENDPOINT_KEY": "test",
+            "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+        },
+        translation_method="Azure OpenAI",
+        translation_model="gpt-4o-deployment",
+    )
+    translator = SlideTranslator(pipeline_settings=pipeline)
+
+    assert translator.translate_text_azure_openai("Hello world") == "Hallo Welt"
+
+    [request] = client.chat.completions.requests
+    assert request["model"] == "gpt-4o-deployment"
+    assert request["messages"][0]["role"] == "system"
+    assert request["temperature"] == 0.7
+    assert request["max_tokens"] == 1000
+    assert translator.token_usage.summary()[("translation", "gpt-4o-deployment")][
+        "prompt_tokens"
+    ] == 30
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from slidemob.utils.recorder import ExchangeRecorder, RecordingClient, ReplayMissError
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return ChatCompletion.model_validate(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": kwargs["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "Hallo Welt"},
+                    }
+                ],
+            }
+        )
+
+
+def test_record_then_replay_without_network(tmp_path):
+    """Recorded responses are replayed without calling the client"""
+    request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hello"}]}
+    client = FakeClient()
+    recording = RecordingClient(client, ExchangeRecorder(str(tmp_path), "record"))
+    recording.chat.completions.create(**request)
+
+    replay = RecordingClient(client, ExchangeRecorder(str(tmp_path), "replay"))
+    response = replay.chat.completions.create(**request)
+    assert response.choices[0].message.content == "Hallo Welt"
+    assert client.calls == 1
+
+    with pytest.raises(ReplayMissError):
+        replay.chat.completions.create(model="gpt-4o", messages=[])
+    assert replay.recorder.summary()["misses"] == 1
+
+
+FINGERPRINT_SCRIPT = """
+from slidemob.utils.promts import mapping_prompt_openai, translate_and_align_prompt
+from slidemob.utils.recorder import ExchangeRecorder
+
+segments = {"Revenue ", "grew ", "in every ", "region", "Q3", "2024"}
+prompts = [
+    mapping_prompt_openai(segments, "Revenue grew", "Umsatz stieg"),
+    translate_and_align_prompt(segments, "Revenue grew", "German", ""),
+]
+print(ExchangeRecorder.fingerprint("chat", {"model": "gpt-4o", "prompts": prompts}))
+"""
+
+
+def test_prompt_fingerprints_do_not_depend_on_hash_seed():
+    """Recordings made in one process are found on replay in another"""
+    fingerprints = set()
+    for seed in ("1", "2", "3", "4"):
+        result = subprocess.run(
+            [sys.executable, "-c", FINGERPRINT_SCRIPT],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        fingerprints.add(result.stdout.strip())
+    assert len(fingerprints) == 1
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slidemob.core_functions.hedging import get_hedger
+from slidemob.core_functions.router import (
+    TranslationRoute,
+    TranslationRouter,
+    get_backend_semaphore,
+)
+from slidemob.core_functions.translator import SlideTranslator
+
+
+def test_router_selects_by_length_and_falls_back():
+    """Short text goes to the short route, failures fall back to the next route"""
+    calls = []
+
+    def short(text):
+        calls.append(("short", text))
+        return None if text == "fail" else f"short:{text}"
+
+    def default(text):
+        calls.append(("default", text))
+        return f"default:{text}"
+
+    router = TranslationRouter(
+        [
+            TranslationRoute("short", short, "test-short", max_length=10),
+            TranslationRoute("default", default, "test-default"),
+        ]
+    )
+
+    assert router.translate("Agenda") == "short:Agenda"
+    assert router.translate("A much longer paragraph") == "default:A much longer paragraph"
+    assert router.translate("fail") == "default:fail"
+    assert router.fallbacks == 1
+    assert router.summary()["short"]["errors"] == 1
+    assert router.summary()["default"]["requests"] == 2
+
+
+def test_backend_semaphores_follow_the_requested_limit():
+    """A later limit for the same backend gets its own semaphore"""
+    two = get_backend_semaphore("test-limit-backend", 2)
+
+    assert get_backend_semaphore("test-limit-backend", 2) is two
+    five = get_backend_semaphore("test-limit-backend", 5)
+    assert five is not two
+    for _ in range(5):
+        assert five.acquire(blocking=False)
+    assert not five.acquire(blocking=False)
+
+
+def test_router_counts_concurrent_requests():
+    """Counters of routes shared by slide workers are not lost"""
+    router = TranslationRouter(
+        [
+            TranslationRoute(
+                "short", lambda text: None, "test-count-short", max_length=10
+            ),
+            TranslationRoute(
+                "default", str.upper, "test-count-default", max_concurrency=8
+            ),
+        ]
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(router.translate, ["short"] * 400))
+
+    assert results == ["SHORT"] * 400
+    assert router.fallbacks == 400
+    summary = router.summary()
+    assert summary["short"]["requests"] == summary["short"]["errors"] == 400
+    assert summary["default"]["requests"] == 400
+
+
+@pytest.mark.parametrize("hedge_requests", [False, True])
+def test_failed_request_falls_back_with_hedging(
+    make_pipeline, fake_client, hedge_requests
+):
+    """Failures of requests sent on hedging threads still make the router fall back"""
+    model = f"failing-model-{hedge_requests}"
+    pipeline = make_pipeline(
+        client=fake_client(lambda prompt: None),
+        translation_model=model,
+        routing=True,
+        route_short_method="OpenAI",
+        route_short_model="short-model",
+        route_short_max_length=10,
+        hedge_requests=hedge_requests,
+    )
+    pipeline.route_short_client = fake_client(
+        lambda prompt: "<translation>SHORT</translation>"
+    )
+    # Enough latencies for the hedger to run requests on its executor threads
+    for _ in range(10):
+        get_hedger(f"translation:{model}").tracker.record(5.0)
+
+    translator = SlideTranslator(pipeline_settings=pipeline)
+
+    assert translator.translate_paragraph("A long paragraph that fails now") == "SHORT"
+    assert translator.router.fallbacks == 1
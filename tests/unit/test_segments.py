@@ -0,0 +1,28 @@
+from lxml import etree as ET
+
+from slidemob.core_functions.segments import extract_segments
+
+NAMESPACES = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+SLIDE = b"""<sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">
+<a:p><a:r><a:rPr lang="en-US"/><a:t>Revenue </a:t></a:r><a:r><a:t>grew</a:t></a:r>
+<a:fld><a:t>3</a:t></a:fld></a:p>
+<a:p><a:r><a:t>Revenue</a:t></a:r><a:r><a:t>Drop me</a:t></a:r></a:p>
+<a:p><a:r><a:t> </a:t></a:r></a:p>
+</sld>"""
+
+
+def test_segments_write_back_to_their_own_runs():
+    """Equal run texts in different paragraphs are translated independently"""
+    root = ET.fromstring(SLIDE)
+    first, second = extract_segments(root, NAMESPACES)
+
+    assert first.text == "Revenue grew 3"
+    assert first.lang == "en-US"
+    assert first.run_texts == ("Revenue", "grew")
+    assert first.offsets == ((0, 7), (8, 12))
+
+    first.apply({"Revenue": "Umsatz", "grew": "wuchs"})
+    second.apply({"Revenue": "Erlöse", "Drop me": ""})
+    texts = [node.text for node in root.iterfind(".//a:t", NAMESPACES)]
+    assert texts == ["Umsatz ", "wuchs", "3", "Erlöse", " "]
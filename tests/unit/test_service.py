@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+
+import pytest
+
+from slidemob import service as service_module
+from slidemob.service import JobService
+from slidemob.utils.model_settings import ModelSettings, get_model_settings
+
+
+class FakePipeline:
+    """Stands in for PresentationPipeline, runs until released or stopped."""
+
+    instances = []
+    release = threading.Event()
+
+    def __init__(self, stop_check_callback=None, pipeline_config=None, **kwargs):
+        self.stop_check_callback = stop_check_callback
+        self.pipeline_config = pipeline_config
+        self.options = kwargs
+        self.model_settings = get_model_settings()
+        FakePipeline.instances.append(self)
+
+    def run(self) -> bool:
+        while not FakePipeline.release.wait(0.01):
+            if self.stop_check_callback():
+                return False
+        return True
+
+
+@pytest.fixture()
+def job_service(monkeypatch):
+    FakePipeline.instances = []
+    FakePipeline.release = threading.Event()
+    monkeypatch.setattr(service_module, "PresentationPipeline", FakePipeline)
+    monkeypatch.setattr(
+        service_module,
+        "ModelSettings",
+        lambda: ModelSettings(
+            gui_config={"latency_history": False}, api_keys={"OPENAI_API_KEY": "test"}
+        ),
+    )
+    job_service = JobService(workers=1)
+    job_service.start()
+    yield job_service
+    FakePipeline.release.set()
+    job_service.stop()
+
+
+def _wait_for(job_service, job_id, states):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = job_service.get(job_id)
+        if job["state"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {states}")
+
+
+def test_job_service_rejects_missing_input(job_service, temp_test_dir):
+    with pytest.raises(ValueError, match="Input file not found"):
+        job_service.submit({"input": os.path.join(temp_test_dir, "missing.pptx")})
+    assert job_service.list() == []
+
+
+def test_job_service_runs_jobs_with_shared_settings(job_service, sample_pptx_path):
+    """Jobs run through the pipeline with the settings loaded by the service"""
+    open(sample_pptx_path, "wb").close()
+    FakePipeline.release.set()
+
+    first = job_service.submit({"input": sample_pptx_path, "target_language": "German"})
+    second = job_service.submit({"input": sample_pptx_path, "polish": True})
+    assert first["state"] == "queued"
+
+    assert _wait_for(job_service, first["id"], ("done",))["output"].endswith(".pptx")
+    _wait_for(job_service, second["id"], ("done",))
+    first_pipeline, second_pipeline = FakePipeline.instances
+    assert first_pipeline.pipeline_config["target_language"] == "German"
+    assert second_pipeline.options["polish"]
+    assert first_pipeline.model_settings is job_service.model_settings
+    assert second_pipeline.model_settings is job_service.model_settings
+    assert job_service.health()["queued"] == 0
+
+
+def test_job_service_cancels_queued_and_running_jobs(job_service, sample_pptx_path):
+    """Queued jobs never run, running jobs are stopped through the pipeline"""
+    open(sample_pptx_path, "wb").close()
+    running = job_service.submit({"input": sample_pptx_path})
+    queued = job_service.submit({"input": sample_pptx_path})
+    _wait_for(job_service, running["id"], ("running",))
+
+    assert job_service.cancel(queued["id"])["state"] == "cancelled"
+    assert job_service.cancel(running["id"])["cancel_requested"]
+    assert job_service.cancel("unknown") is None
+
+    job = _wait_for(job_service, running["id"], ("cancelled", "failed"))
+    assert job["state"] == "cancelled"
+    assert job["error"] is None
+    # The worker skips the cancelled job
+    job_service.stop()
+    assert len(FakePipeline.instances) == 1
+    assert job_service.get(queued["id"])["state"] == "cancelled"
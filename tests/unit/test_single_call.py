@@ -0,0 +1,96 @@
+import json
+
+from lxml import etree as ET
+import pytest
+
+from slidemob.core_functions.translator import SlideTranslator
+
+SLIDE_XML = (
+    b'<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    b"<p:cSld><p:spTree><p:sp><p:txBody>"
+    b"<a:p><a:r><a:t>Revenue grew</a:t></a:r><a:r><a:t>in every region</a:t></a:r></a:p>"
+    b"</p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+)
+
+
+def _respond(combined_content):
+    """Answer combined requests with a fixed content."""
+
+    def respond(prompt):
+        if "map each of its original segments" in prompt:
+            return combined_content
+        if prompt.startswith("Match each original text segment"):
+            return json.dumps(
+                {"Revenue grew": "Der Umsatz stieg", "in every region": "in jeder Region"}
+            )
+        return "<translation>Der Umsatz stieg in jeder Region</translation>"
+
+    return respond
+
+
+@pytest.fixture()
+def single_call_translator(make_pipeline, fake_client):
+    def single_call_translator(combined_content):
+        client = fake_client(_respond(combined_content))
+        pipeline = make_pipeline(
+            client=client,
+            translation_model="single-call-model",
+            mapping_model="single-call-mapping-model",
+            single_call_translation=True,
+        )
+        return SlideTranslator(pipeline_settings=pipeline), client.chat.completions
+
+    return single_call_translator
+
+
+def _translate(translator):
+    segments, original_text_elements = translator.extract_text_runs(
+        ET.fromstring(SLIDE_XML)
+    )
+    return translator.create_translation_map(segments, original_text_elements)
+
+
+def test_single_call_translates_and_aligns_in_one_request(single_call_translator):
+    """A valid combined response is used without a mapping request"""
+    translator, completions = single_call_translator(
+        json.dumps(
+            {
+                "translation": "Der Umsatz wuchs in jeder Region",
+                "segments": {
+                    "Revenue grew": "Der Umsatz wuchs",
+                    "in every region": "in jeder Region",
+                },
+            }
+        )
+    )
+
+    assert _translate(translator) == {
+        "Revenue grew": "Der Umsatz wuchs",
+        "in every region": "in jeder Region",
+    }
+    assert len(completions.prompts) == 1
+
+
+@pytest.mark.parametrize(
+    "combined_content, requests",
+    [
+        # Usable translation, the runs are mapped with a separate request
+        (
+            json.dumps({"translation": "Der Umsatz stieg", "segments": {"Revenue grew": 1}}),
+            2,
+        ),
+        # Unusable response, the paragraph is translated and mapped again
+        ("Der Umsatz stieg in jeder Region", 3),
+    ],
+)
+def test_single_call_falls_back_to_two_steps(single_call_translator, combined_content, requests):
+    """An invalid combined response falls back to translation and mapping calls"""
+    translator, completions = single_call_translator(combined_content)
+
+    assert _translate(translator) == {
+        "Revenue grew": "Der Umsatz stieg",
+        "in every region": "in jeder Region",
+    }
+    assert len(completions.prompts) == requests
+    assert completions.prompts[-1].startswith("Match each original text segment")
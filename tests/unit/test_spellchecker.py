@@ -0,0 +1,69 @@
+from lxml import etree as ET
+import pytest
+
+from slidemob.core_functions.spellchecker import SlideSpellChecker
+
+NAMESPACES = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+
+
+def _slide(*runs):
+    return ET.fromstring(
+        '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+        "<p:cSld><p:spTree><p:sp><p:txBody><a:p>"
+        + "".join(runs)
+        + "</a:p></p:txBody></p:sp></p:spTree></p:cSld></p:sld>"
+    )
+
+
+def _run(text, flagged=False, bold=False):
+    err = ' err="1"' if flagged else ""
+    b = ' b="1"' if bold else ""
+    return f'<a:r><a:rPr lang="en-US"{err}{b}/><a:t>{text}</a:t></a:r>'
+
+
+@pytest.fixture()
+def spell_checker(make_pipeline):
+    def spell_checker(glossary=()):
+        return make_pipeline(SlideSpellChecker, glossary=list(glossary))
+
+    return spell_checker
+
+
+def _texts(root):
+    return [node.text for node in root.iterfind(".//a:t", NAMESPACES)]
+
+
+def test_check_and_fix_deck_corrects_flagged_runs_once(spell_checker):
+    """Flagged words of all slides are corrected, other runs are left alone"""
+    first = _slide(_run("Teh report", flagged=True), _run(" is due", bold=True))
+    second = _slide(_run("Teh", flagged=True, bold=True), _run(" teh", bold=True))
+
+    corrections = spell_checker().check_and_fix_deck([first, second])
+
+    assert corrections == {"Teh": "The"}
+    assert _texts(first) == ["The report", " is due"]
+    # Runs with identical properties are merged after the write-back,
+    # the unflagged run keeps its spelling
+    assert _texts(second) == ["The teh"]
+    assert first.find(".//a:rPr[@err]", NAMESPACES) is None
+    assert second.find(".//a:rPr[@err]", NAMESPACES) is None
+
+
+def test_check_and_fix_deck_skips_acronyms_numbers_and_glossary(spell_checker):
+    """Acronyms, words with digits and glossary terms are not corrected"""
+    root = _slide(_run("Teh NASDQ Q3x Acmee", flagged=True))
+
+    corrections = spell_checker(glossary=["Acmee"]).check_and_fix_deck([root])
+
+    assert corrections == {"Teh": "The"}
+    assert _texts(root) == ["The NASDQ Q3x Acmee"]
+
+
+def test_check_and_fix_slide_round_trips_xml(spell_checker):
+    """A serialized slide is corrected and serialized again"""
+    xml_content = ET.tostring(_slide(_run("Teh agenda", flagged=True)), encoding="unicode")
+
+    fixed = ET.fromstring(spell_checker().check_and_fix_slide(xml_content))
+
+    assert _texts(fixed) == ["The agenda"]
@@ -0,0 +1,47 @@
+from slidemob.core_functions.text_filter import TextPreFilter
+
+
+def test_pre_filter_skips_untranslatable_text():
+    """Numbers, dates, codes and symbols need no model call"""
+    pre_filter = TextPreFilter(target_language_code="de-DE")
+
+    assert pre_filter.classify("1,234.5") == "number"
+    assert pre_filter.classify("(12.3) €") == "number"
+    assert pre_filter.classify("-4.2 %") == "percentage"
+    assert pre_filter.classify("Q3 2024") == "date"
+    assert pre_filter.classify("31.03.2024") == "date"
+    assert pre_filter.classify("https://example.com/page") == "url"
+    assert pre_filter.classify("jane.doe@example.com") == "email"
+    assert pre_filter.classify("AB-1234") == "product_code"
+    assert pre_filter.classify("X7/200") == "product_code"
+    assert pre_filter.classify("•") == "symbol"
+    assert pre_filter.summary()["date"] == 2
+    # Looking up the category alone is not counted
+    assert pre_filter.category("Q4 2024") == "date"
+    assert pre_filter.summary()["date"] == 2
+
+
+def test_pre_filter_keeps_translatable_text():
+    """Regular sentences and short labels are translated"""
+    pre_filter = TextPreFilter(target_language_code="de-DE")
+
+    assert pre_filter.classify("Revenue grew in every region") is None
+    assert pre_filter.classify("Q3 results") is None
+    assert pre_filter.classify("Next steps") is None
+    # Names and terms with a few digits are not product codes
+    assert pre_filter.classify("COVID-19") is None
+    assert pre_filter.classify("B2B") is None
+    assert pre_filter.classify("MP3") is None
+    assert pre_filter.classify("Wi-Fi 6") is None
+    assert not pre_filter.summary()
+
+
+def test_pre_filter_glossary_and_target_language():
+    """Glossary terms and text already in the target language are kept"""
+    pre_filter = TextPreFilter(target_language_code="de-DE", glossary=["LegalAI"])
+
+    assert pre_filter.classify("legalai") == "glossary"
+    assert (
+        pre_filter.classify("Der Umsatz ist in allen Regionen deutlich gestiegen")
+        == "target_language"
+    )